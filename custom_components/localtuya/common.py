@@ -17,10 +17,6 @@ from homeassistant.const import (
     STATE_UNKNOWN,
 )
 from homeassistant.core import callback
-from homeassistant.helpers.dispatcher import (
-    async_dispatcher_connect,
-    async_dispatcher_send,
-)
 from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.restore_state import RestoreEntity
 
@@ -43,6 +39,8 @@ from .const import (
 
 _LOGGER = logging.getLogger(__name__)
 
+_MISSING = object()
+
 
 def prepare_setup_entities(hass, config_entry, platform):
     """Prepare ro setup entities for a platform."""
@@ -87,18 +85,18 @@ async def async_setup_entry(
             dps_config_fields = list(get_dps_for_platform(flow_schema))
 
             for entity_config in entities_to_setup:
+                entity = entity_class(
+                    tuyainterface,
+                    dev_entry,
+                    entity_config[CONF_ID],
+                )
                 # Add DPS used by this platform to the request list
                 for dp_conf in dps_config_fields:
                     if dp_conf in entity_config:
                         tuyainterface.dps_to_request[entity_config[dp_conf]] = None
+                        entity.bind_dp(entity_config[dp_conf])
 
-                entities.append(
-                    entity_class(
-                        tuyainterface,
-                        dev_entry,
-                        entity_config[CONF_ID],
-                    )
-                )
+                entities.append(entity)
     # Once the entities have been created, add to the TuyaDevice instance
     tuyainterface.add_entities(entities)
     async_add_entities(entities)
@@ -142,10 +140,11 @@ class TuyaDevice(pytuya.TuyaListener, pytuya.ContextualLogger):
         self._dev_config_entry = config_entry.data[CONF_DEVICES][dev_id].copy()
         self._interface = None
         self._status = {}
+        self._dp_listeners = {}  # DP id -> update handlers of the entities reading it
+        self._dispatch_all = True  # next status wakes every entity (first, reconnect)
         self.dps_to_request = {}
         self._is_closing = False
         self._connect_task = None
-        self._disconnect_task = None
         self._unsub_interval = None
         self._entities = []
         self._local_key = self._dev_config_entry[CONF_LOCAL_KEY]
@@ -254,19 +253,6 @@ class TuyaDevice(pytuya.TuyaListener, pytuya.ContextualLogger):
             for entity in self._entities:
                 await entity.restore_state_when_connected()
 
-            def _new_entity_handler(entity_id):
-                self.debug(
-                    "New entity %s was added to %s",
-                    entity_id,
-                    self._dev_config_entry[CONF_HOST],
-                )
-                self._dispatch_status()
-
-            signal = f"localtuya_entity_{self._dev_config_entry[CONF_DEVICE_ID]}"
-            self._disconnect_task = async_dispatcher_connect(
-                self._hass, signal, _new_entity_handler
-            )
-
             if (
                 CONF_SCAN_INTERVAL in self._dev_config_entry
                 and int(self._dev_config_entry[CONF_SCAN_INTERVAL]) > 0
@@ -309,8 +295,6 @@ class TuyaDevice(pytuya.TuyaListener, pytuya.ContextualLogger):
             await self._connect_task
         if self._interface is not None:
             await self._interface.close()
-        if self._disconnect_task is not None:
-            self._disconnect_task()
         self.info(
             "Closed connection with device %s.",
             self._dev_config_entry[CONF_FRIENDLY_NAME],
@@ -340,21 +324,67 @@ class TuyaDevice(pytuya.TuyaListener, pytuya.ContextualLogger):
                 "Not connected to device %s", self._dev_config_entry[CONF_FRIENDLY_NAME]
             )
 
+    @callback
+    def async_add_status_listener(self, dp_ids, handler):
+        """Call handler(status) when one of the DPs dp_ids changes.
+
+        The handler gets the status of the device itself, not a copy. Returns
+        a function that removes the listener.
+        """
+        for dp_id in dp_ids:
+            self._dp_listeners.setdefault(dp_id, []).append(handler)
+        if self._interface is not None and not self._dispatch_all:
+            self._call_listener(handler, self._status)  # entity added while connected
+
+        @callback
+        def _remove_listener():
+            for dp_id in dp_ids:
+                handlers = self._dp_listeners.get(dp_id, [])
+                if handler in handlers:
+                    handlers.remove(handler)
+
+        return _remove_listener
+
     @callback
     def status_updated(self, status):
         """Device updated status."""
-        self._status.update(status)
-        self._dispatch_status()
+        current = self._status
+        changed = [
+            dp_id
+            for dp_id, value in status.items()
+            if current.get(dp_id, _MISSING) != value
+        ]
+        current.update(status)
+        if self._dispatch_all:
+            self._dispatch_all = False
+            self._dispatch_status(current)
+            return
+        handlers = {}
+        for dp_id in changed:
+            for handler in self._dp_listeners.get(dp_id, ()):
+                handlers[handler] = None
+        for handler in handlers:
+            self._call_listener(handler, current)
+
+    def _dispatch_status(self, status):
+        handlers = dict.fromkeys(
+            handler for handlers in self._dp_listeners.values() for handler in handlers
+        )
+        for handler in handlers:
+            self._call_listener(handler, status)
 
-    def _dispatch_status(self):
-        signal = f"localtuya_{self._dev_config_entry[CONF_DEVICE_ID]}"
-        async_dispatcher_send(self._hass, signal, self._status)
+    def _call_listener(self, handler, status):
+        """Call one entity handler; a failing entity must not stop the others."""
+        try:
+            handler(status)
+        except Exception:  # pylint: disable=broad-except
+            self.exception("Error in status listener %s", handler)
 
     @callback
     def disconnected(self):
         """Device disconnected."""
-        signal = f"localtuya_{self._dev_config_entry[CONF_DEVICE_ID]}"
-        async_dispatcher_send(self._hass, signal, None)
+        self._dispatch_status(None)
+        self._dispatch_all = True
         if self._unsub_interval is not None:
             self._unsub_interval()
             self._unsub_interval = None
@@ -376,6 +406,7 @@ class LocalTuyaEntity(RestoreEntity, pytuya.ContextualLogger):
         self._dev_config_entry = config_entry
         self._config = get_entity_config(config_entry, dp_id)
         self._dp_id = dp_id
+        self._dp_ids = {str(dp_id)}
         self._status = {}
         self._state = None
         self._last_state = None
@@ -403,26 +434,25 @@ class LocalTuyaEntity(RestoreEntity, pytuya.ContextualLogger):
         if state:
             self.status_restored(state)
 
+        @callback
         def _update_handler(status):
-            """Update entity state when status was updated."""
+            """Update entity state when one of its DPs was updated."""
             if status is None:
                 status = {}
-            if self._status != status:
-                self._status = status.copy()
-                if status:
-                    self.status_updated()
-
-                # Update HA
-                self.schedule_update_ha_state()
+            self._status = status
+            if status:
+                self.status_updated()
 
-        signal = f"localtuya_{self._dev_config_entry[CONF_DEVICE_ID]}"
+            # Update HA
+            self.async_write_ha_state()
 
         self.async_on_remove(
-            async_dispatcher_connect(self.hass, signal, _update_handler)
+            self._device.async_add_status_listener(self._dp_ids, _update_handler)
         )
 
-        signal = f"localtuya_entity_{self._dev_config_entry[CONF_DEVICE_ID]}"
-        async_dispatcher_send(self.hass, signal, self.entity_id)
+    def bind_dp(self, dp_id):
+        """Also update the entity when DP dp_id changes, e.g. a DP read with dps_conf."""
+        self._dp_ids.add(str(dp_id))
 
     @property
     def extra_state_attributes(self):
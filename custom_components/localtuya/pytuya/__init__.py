@@ -147,6 +147,8 @@ MESSAGE_RECV_HEADER_FMT = ">5I"  # 4*uint32: prefix, seqno, cmd, length, retcode
 MESSAGE_RETCODE_FMT = ">I"  # retcode for received messages
 MESSAGE_END_FMT = ">2I"  # 2*uint32: crc, suffix
 MESSAGE_END_FMT_HMAC = ">32sI"  # 32s:hmac, uint32:suffix
+MESSAGE_HEADER_LEN = struct.calcsize(MESSAGE_HEADER_FMT)
+MESSAGE_RECV_HEADER_LEN = struct.calcsize(MESSAGE_RECV_HEADER_FMT)
 PREFIX_VALUE = 0x000055AA
 PREFIX_BIN = b"\x00\x00U\xaa"
 SUFFIX_VALUE = 0x0000AA55
@@ -263,6 +265,24 @@ class ContextualLogger:
         return self._logger.exception(msg, *args)
 
 
+def hmac_digest(hmac_key, data):
+    """Return the HMAC-SHA256 of data.
+
+    hmac_key is either the key or a keyed HMAC object (see hmac_template), which
+    is copied instead of hashing the key again.
+    """
+    if isinstance(hmac_key, hmac.HMAC):
+        mac = hmac_key.copy()
+        mac.update(data)
+        return mac.digest()
+    return hmac.new(hmac_key, data, sha256).digest()
+
+
+def hmac_template(key):
+    """Return a keyed HMAC-SHA256 object to be passed as hmac_key."""
+    return hmac.new(key, digestmod=sha256)
+
+
 def pack_message(msg, hmac_key=None):
     """Pack a TuyaMessage into bytes."""
     end_fmt = MESSAGE_END_FMT_HMAC if hmac_key else MESSAGE_END_FMT
@@ -278,7 +298,7 @@ def pack_message(msg, hmac_key=None):
         + msg.payload
     )
     if hmac_key:
-        crc = hmac.new(hmac_key, buffer, sha256).digest()
+        crc = hmac_digest(hmac_key, buffer)
     else:
         crc = binascii.crc32(buffer) & 0xFFFFFFFF
     # Calculate CRC, add it together with suffix
@@ -286,51 +306,58 @@ def pack_message(msg, hmac_key=None):
     return buffer
 
 
-def unpack_message(data, hmac_key=None, header=None, no_retcode=False, logger=None):
-    """Unpack bytes into a TuyaMessage."""
+def unpack_message(
+    data, hmac_key=None, header=None, no_retcode=False, logger=None, offset=0
+):
+    """Unpack bytes into a TuyaMessage.
+
+    The message is read in place at offset of data (bytes, bytearray or memoryview):
+    header, CRC and suffix are unpacked from the buffer and the checksum is computed
+    over a view of it, only the payload is copied out.
+    """
     end_fmt = MESSAGE_END_FMT_HMAC if hmac_key else MESSAGE_END_FMT
     # 4-word header plus return code
-    header_len = struct.calcsize(MESSAGE_HEADER_FMT)
+    header_len = MESSAGE_HEADER_LEN
     retcode_len = 0 if no_retcode else struct.calcsize(MESSAGE_RETCODE_FMT)
     end_len = struct.calcsize(end_fmt)
     headret_len = header_len + retcode_len
+    available = len(data) - offset
 
-    if len(data) < headret_len + end_len:
+    if available < headret_len + end_len:
         logger.debug(
             "unpack_message(): not enough data to unpack header! need %d but only have %d",
             headret_len + end_len,
-            len(data),
+            available,
         )
         raise DecodeError("Not enough data to unpack header")
 
     if header is None:
-        header = parse_header(data)
+        header = parse_header(data, offset)
 
-    if len(data) < header_len + header.length:
+    if available < header_len + header.length:
         logger.debug(
             "unpack_message(): not enough data to unpack payload! need %d but only have %d",
             header_len + header.length,
-            len(data),
+            available,
         )
         raise DecodeError("Not enough data to unpack payload")
 
     retcode = (
         0
         if no_retcode
-        else struct.unpack(MESSAGE_RETCODE_FMT, data[header_len:headret_len])[0]
+        else struct.unpack_from(MESSAGE_RETCODE_FMT, data, offset + header_len)[0]
     )
-    # the retcode is technically part of the payload, but strip it as we do not want it here
-    payload = data[header_len + retcode_len : header_len + header.length]
-    crc, suffix = struct.unpack(end_fmt, payload[-end_len:])
+    end = offset + header_len + header.length - end_len
+    crc, suffix = struct.unpack_from(end_fmt, data, end)
 
-    if hmac_key:
-        have_crc = hmac.new(
-            hmac_key, data[: (header_len + header.length) - end_len], sha256
-        ).digest()
-    else:
-        have_crc = (
-            binascii.crc32(data[: (header_len + header.length) - end_len]) & 0xFFFFFFFF
-        )
+    with memoryview(data) as view:
+        # slices are not kept: a bytearray cannot be resized while a view exports it
+        if hmac_key:
+            have_crc = hmac_digest(hmac_key, view[offset:end])
+        else:
+            have_crc = binascii.crc32(view[offset:end]) & 0xFFFFFFFF
+        # the retcode is technically part of the payload, but strip it as we do not want it here
+        payload = bytes(view[offset + headret_len : end])
 
     if suffix != SUFFIX_VALUE:
         logger.debug("Suffix prefix wrong! %08X != %08X", suffix, SUFFIX_VALUE)
@@ -345,20 +372,16 @@ def unpack_message(data, hmac_key=None, header=None, no_retcode=False, logger=No
         else:
             logger.debug("CRC wrong! %08X != %08X", have_crc, crc)
 
-    return TuyaMessage(
-        header.seqno, header.cmd, retcode, payload[:-end_len], crc, crc == have_crc
-    )
-
+    return TuyaMessage(header.seqno, header.cmd, retcode, payload, crc, crc == have_crc)
 
-def parse_header(data):
-    """Unpack bytes into a TuyaHeader."""
-    header_len = struct.calcsize(MESSAGE_HEADER_FMT)
 
-    if len(data) < header_len:
+def parse_header(data, offset=0):
+    """Unpack bytes at offset into a TuyaHeader."""
+    if len(data) - offset < MESSAGE_HEADER_LEN:
         raise DecodeError("Not enough data to unpack header")
 
-    prefix, seqno, cmd, payload_len = struct.unpack(
-        MESSAGE_HEADER_FMT, data[:header_len]
+    prefix, seqno, cmd, payload_len = struct.unpack_from(
+        MESSAGE_HEADER_FMT, data, offset
     )
 
     if prefix != PREFIX_VALUE:
@@ -382,13 +405,17 @@ class AESCipher:
         """Initialize a new AESCipher."""
         self.block_size = 16
         self.cipher = Cipher(algorithms.AES(key), modes.ECB(), default_backend())
+        # ECB carries no state from one block to the next, so a single context
+        # per direction serves all messages as long as only whole blocks are fed
+        self._encryptor = self.cipher.encryptor()
+        self._decryptor = self.cipher.decryptor()
 
     def encrypt(self, raw, use_base64=True, pad=True):
         """Encrypt data to be sent to device."""
-        encryptor = self.cipher.encryptor()
         if pad:
             raw = self._pad(raw)
-        crypted_text = encryptor.update(raw) + encryptor.finalize()
+        self._check_blocks(raw)
+        crypted_text = self._encryptor.update(raw)
         return base64.b64encode(crypted_text) if use_base64 else crypted_text
 
     def decrypt(self, enc, use_base64=True, decode_text=True):
@@ -396,10 +423,17 @@ class AESCipher:
         if use_base64:
             enc = base64.b64decode(enc)
 
-        decryptor = self.cipher.decryptor()
-        raw = self._unpad(decryptor.update(enc) + decryptor.finalize())
+        self._check_blocks(enc)
+        raw = self._unpad(self._decryptor.update(enc))
         return raw.decode("utf-8") if decode_text else raw
 
+    def _check_blocks(self, data):
+        # a partial block would stay in the shared context and garble the next message
+        if len(data) % self.block_size:
+            raise ValueError(
+                "The length of the provided data is not a multiple of the block length."
+            )
+
     def _pad(self, data):
         padnum = self.block_size - len(data) % self.block_size
         return data + padnum * chr(padnum).encode()
@@ -422,13 +456,24 @@ class MessageDispatcher(ContextualLogger):
     def __init__(self, dev_id, listener, protocol_version, local_key, enable_debug):
         """Initialize a new MessageBuffer."""
         super().__init__()
-        self.buffer = b""
+        self.buffer = bytearray()
         self.listeners = {}
         self.listener = listener
         self.version = protocol_version
         self.local_key = local_key
         self.set_logger(_LOGGER, dev_id, enable_debug)
 
+    @property
+    def local_key(self):
+        """Return the key of the 3.4 HMAC."""
+        return self._local_key
+
+    @local_key.setter
+    def local_key(self, key):
+        """Set the key of the 3.4 HMAC, e.g. the negotiated session key."""
+        self._local_key = key
+        self._hmac = hmac_template(key)
+
     def abort(self):
         """Abort all waiting clients."""
         for key in self.listeners:
@@ -458,22 +503,35 @@ class MessageDispatcher(ContextualLogger):
         return self.listeners.pop(seqno)
 
     def add_data(self, data):
-        """Add new data to the buffer and try to parse messages."""
-        self.buffer += data
-        header_len = struct.calcsize(MESSAGE_RECV_HEADER_FMT)
-
-        while self.buffer:
-            # Check if enough data for measage header
-            if len(self.buffer) < header_len:
-                break
-
-            header = parse_header(self.buffer)
-            hmac_key = self.local_key if self.version == 3.4 else None
-            msg = unpack_message(
-                self.buffer, header=header, hmac_key=hmac_key, logger=self
-            )
-            self.buffer = self.buffer[header_len - 4 + header.length :]
-            self._dispatch(msg)
+        """Add new data to the buffer and try to parse messages.
+
+        Messages are parsed in place at a read position. Only an incomplete
+        message is kept in the buffer, and the data of the next read is appended
+        to it; with nothing buffered, the received bytes are parsed directly.
+        """
+        buffer = self.buffer
+        if buffer:
+            buffer += data
+            data = buffer
+        pos = 0
+        try:
+            # Check if enough data for message header
+            while len(data) - pos >= MESSAGE_RECV_HEADER_LEN:
+                header = parse_header(data, pos)
+                end = pos + MESSAGE_HEADER_LEN + header.length
+                if end > len(data):
+                    break
+                hmac_key = self._hmac if self.version == 3.4 else None
+                msg = unpack_message(
+                    data, header=header, hmac_key=hmac_key, logger=self, offset=pos
+                )
+                pos = end
+                self._dispatch(msg)
+        finally:
+            if data is buffer:
+                del buffer[:pos]
+            else:
+                buffer += data[pos:]
 
     def _dispatch(self, msg):
         """Dispatch a message to someone that is listening."""
@@ -580,7 +638,6 @@ class TuyaProtocol(asyncio.Protocol, ContextualLogger):
             # them (such as BulbDevice) make connections when called
             TuyaProtocol.set_version(self, 3.1)
 
-        self.cipher = AESCipher(self.local_key)
         self.seqno = 1
         self.transport = None
         self.listener = weakref.ref(listener)
@@ -591,6 +648,20 @@ class TuyaProtocol(asyncio.Protocol, ContextualLogger):
         self.local_nonce = b"0123456789abcdef"  # not-so-random random key
         self.remote_nonce = b""
 
+    @property
+    def local_key(self):
+        """Return the key of the traffic, the session key once negotiated (3.4)."""
+        return self._local_key
+
+    @local_key.setter
+    def local_key(self, key):
+        """Set the key of the traffic; the cipher and HMAC of the old key are dropped."""
+        if key == getattr(self, "_local_key", None):
+            return
+        self._local_key = key
+        self.cipher = AESCipher(key)
+        self.hmac = hmac_template(key)
+
     def set_version(self, protocol_version):
         """Set the device version and eventually start available DPs detection."""
         self.version = protocol_version
@@ -880,7 +951,7 @@ class TuyaProtocol(asyncio.Protocol, ContextualLogger):
             self.dps_to_request.update({str(index): None for index in dp_indicies})
 
     def _decode_payload(self, payload):
-        cipher = AESCipher(self.local_key)
+        cipher = self.cipher
 
         if self.version == 3.4:
             # 3.4 devices encrypt the version header in addition to the payload
@@ -985,9 +1056,10 @@ class TuyaProtocol(asyncio.Protocol, ContextualLogger):
             return False
 
         payload = rkey.payload
+        # the real local key is still set, see above
+        cipher = self.cipher
         try:
             # self.debug("decrypting %r using %r", payload, self.real_local_key)
-            cipher = AESCipher(self.real_local_key)
             payload = cipher.decrypt(payload, False, decode_text=False)
         except Exception as ex:
             self.debug(
@@ -1005,7 +1077,7 @@ class TuyaProtocol(asyncio.Protocol, ContextualLogger):
             return False
 
         self.remote_nonce = payload[:16]
-        hmac_check = hmac.new(self.local_key, self.local_nonce, sha256).digest()
+        hmac_check = hmac_digest(self.hmac, self.local_nonce)
 
         if hmac_check != payload[16:48]:
             self.debug(
@@ -1015,17 +1087,16 @@ class TuyaProtocol(asyncio.Protocol, ContextualLogger):
             )
 
         # self.debug("session local nonce: %r remote nonce: %r", self.local_nonce, self.remote_nonce)
-        rkey_hmac = hmac.new(self.local_key, self.remote_nonce, sha256).digest()
+        rkey_hmac = hmac_digest(self.hmac, self.remote_nonce)
         await self.exchange_quick(MessagePayload(SESS_KEY_NEG_FINISH, rkey_hmac), None)
 
-        self.local_key = bytes(
+        session_nonce = bytes(
             [a ^ b for (a, b) in zip(self.local_nonce, self.remote_nonce)]
         )
-        # self.debug("Session nonce XOR'd: %r" % self.local_key)
+        # self.debug("Session nonce XOR'd: %r" % session_nonce)
 
-        cipher = AESCipher(self.real_local_key)
         self.local_key = self.dispatcher.local_key = cipher.encrypt(
-            self.local_key, False, pad=False
+            session_nonce, False, pad=False
         )
         self.debug("Session key negotiate success! session key: %r", self.local_key)
         return True
@@ -1034,9 +1105,8 @@ class TuyaProtocol(asyncio.Protocol, ContextualLogger):
     def _encode_message(self, msg):
         hmac_key = None
         payload = msg.payload
-        self.cipher = AESCipher(self.local_key)
         if self.version == 3.4:
-            hmac_key = self.local_key
+            hmac_key = self.hmac
             if msg.cmd not in NO_PROTOCOL_HEADER_CMDS:
                 # add the 3.x header
                 payload = self.version_header + payload
@@ -1069,7 +1139,6 @@ class TuyaProtocol(asyncio.Protocol, ContextualLogger):
                 + payload
             )
 
-        self.cipher = None
         msg = TuyaMessage(self.seqno, msg.cmd, 0, payload, 0, True)
         self.seqno += 1  # increase message sequence number
         buffer = pack_message(msg, hmac_key=hmac_key)
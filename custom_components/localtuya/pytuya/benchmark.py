@@ -0,0 +1,186 @@
+"""Receive benchmark: replay of Tuya frames through MessageDispatcher and TuyaProtocol.
+
+Run from the Home Assistant config directory (homeassistant must be importable):
+
+    python -m custom_components.localtuya.pytuya.benchmark [--messages N] [--capture FILE ...]
+
+Without --capture, STATUS pushes of a metering plug are built for protocol 3.1, 3.3 and 3.4 as a
+device sends them (encrypted payload, CRC or HMAC trailer). A capture is the raw byte stream a
+device sent, as passed to data_received, replayed with --version and --key. The stream is fed in
+three ways: one frame per read, cut into TCP segments (frames split across reads) and as one burst
+of all frames (a backlog after a stall). Reported are messages per second and the peak memory of a
+replay (tracemalloc).
+
+The decode line feeds the frames to a TuyaProtocol as data_received does: the frames are verified
+(CRC or HMAC), decrypted and parsed into the DPS cache, and the status listener is called.
+"""
+
+import argparse
+import asyncio
+import json
+import struct
+import time
+import tracemalloc
+from hashlib import md5
+
+from . import (
+    PROTOCOL_33_HEADER,
+    PROTOCOL_34_HEADER,
+    PROTOCOL_VERSION_BYTES_31,
+    STATUS,
+    AESCipher,
+    MessageDispatcher,
+    TuyaListener,
+    TuyaMessage,
+    TuyaProtocol,
+    pack_message,
+)
+
+DEVICE_ID = "bf0123456789abcdefgh"
+LOCAL_KEY = "0123456789abcdef"
+SEGMENT = 1460  # TCP payload of a full Ethernet frame
+RETCODE = struct.pack(">I", 0)
+
+
+def status_payload(seqno):
+    """JSON of a STATUS push of a metering plug."""
+    dps = {"1": True, "9": 0, "18": 120 + seqno % 7, "19": 268 + seqno % 13, "20": 2301}
+    return json.dumps({"dps": dps, "t": 1700000000 + seqno}).replace(" ", "").encode()
+
+
+def build_frame(version, key, seqno):
+    """A STATUS frame as the device sends it, including the return code."""
+    cipher = AESCipher(key)
+    payload = status_payload(seqno)
+    hmac_key = None
+    if version == 3.4:
+        payload = cipher.encrypt(PROTOCOL_34_HEADER + payload, False)
+        hmac_key = key
+    elif version == 3.3:
+        payload = PROTOCOL_33_HEADER + cipher.encrypt(payload, False)
+    else:
+        payload = cipher.encrypt(payload)
+        digest = md5(
+            b"data=" + payload + b"||lpv=" + PROTOCOL_VERSION_BYTES_31 + b"||" + key
+        ).hexdigest()
+        payload = PROTOCOL_VERSION_BYTES_31 + digest[8:24].encode("latin1") + payload
+    msg = TuyaMessage(seqno, STATUS, 0, RETCODE + payload, 0, True)
+    return pack_message(msg, hmac_key=hmac_key)
+
+
+def chunks(frames, mode):
+    """Split the received stream into the reads of data_received."""
+    if mode == "frame":
+        return frames
+    stream = b"".join(frames)
+    if mode == "burst":
+        return [stream]
+    return [stream[pos : pos + SEGMENT] for pos in range(0, len(stream), SEGMENT)]
+
+
+def replay(version, key, reads):
+    """Feed the reads to a dispatcher; returns (messages, messages with a good CRC)."""
+    counts = [0, 0]
+
+    def _received(msg):
+        counts[0] += 1
+        counts[1] += msg.crc_good
+
+    dispatcher = MessageDispatcher(DEVICE_ID, _received, version, key, False)
+    for data in reads:
+        dispatcher.add_data(data)
+    if dispatcher.buffer:
+        raise ValueError(f"{len(dispatcher.buffer)} bytes left over, stream truncated?")
+    return counts[0], counts[1]
+
+
+class _StatusCounter(TuyaListener):
+    """Counts the status updates of a protocol."""
+
+    def __init__(self):
+        self.updates = 0
+
+    def status_updated(self, status):
+        self.updates += 1
+
+    def disconnected(self):
+        pass
+
+
+def bench_decode(label, version, key, frames, args):
+    """Time verify, decrypt and parse of the frames; needs a running event loop."""
+    listener = _StatusCounter()
+    future = asyncio.get_running_loop().create_future()
+    protocol = TuyaProtocol(
+        DEVICE_ID, key.decode("latin1"), str(version), False, future, listener
+    )
+    for data in frames:  # warm up and check
+        protocol.data_received(data)
+    count = listener.updates
+    if not protocol.dps_cache:
+        raise ValueError("no DPS decoded, wrong --version or --key?")
+    t0 = time.perf_counter()
+    for _ in range(args.repeat):
+        for data in frames:
+            protocol.data_received(data)
+    elapsed = time.perf_counter() - t0
+    print(
+        f"{label:>8} {'decode':>8}: {count} messages decrypted and verified | "
+        f"{count * args.repeat / elapsed:10.0f} messages/s"
+    )
+
+
+def bench(label, version, key, frames, args):
+    for mode in ("frame", "segment", "burst"):
+        reads = chunks(frames, mode)
+        count, good = replay(version, key, reads)  # warm up and check
+        t0 = time.perf_counter()
+        for _ in range(args.repeat):
+            replay(version, key, reads)
+        elapsed = time.perf_counter() - t0
+        tracemalloc.start()
+        replay(version, key, reads)
+        _current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(
+            f"{label:>8} {mode:>8}: {count} messages ({good} CRC ok) in {len(reads)} reads | "
+            f"{count * args.repeat / elapsed:10.0f} messages/s | peak {peak / 1024:.1f} KiB"
+        )
+
+
+async def run(args):
+    key = args.key.encode("latin1")
+    if args.capture:
+        for path in args.capture:
+            with open(path, "rb") as fp:
+                stream = fp.read()
+            bench(path, args.version, key, [stream], args)
+            bench_decode(path, args.version, key, [stream], args)
+        return
+    for version in (3.1, 3.3, 3.4):
+        frames = [
+            build_frame(version, key, seqno) for seqno in range(1, args.messages + 1)
+        ]
+        bench(f"v{version}", version, key, frames, args)
+        bench_decode(f"v{version}", version, key, frames, args)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument(
+        "--capture", nargs="*", help="raw streams received from a device"
+    )
+    parser.add_argument(
+        "--version", type=float, default=3.3, help="protocol of the capture"
+    )
+    parser.add_argument(
+        "--key", default=LOCAL_KEY, help="local (3.4: session) key of the capture"
+    )
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
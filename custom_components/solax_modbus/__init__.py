@@ -6,6 +6,7 @@ import asyncio
 import importlib
 import json
 import logging
+import struct
 import time as _mtime
 from dataclasses import dataclass, replace
 from datetime import timedelta
@@ -44,11 +45,33 @@ from pymodbus.exceptions import ConnectionException, ModbusException, ModbusIOEx
 from pymodbus.framer import FramerType
 from pymodbus.pdu import register_message
 
-from .pymodbus_compat import ADDR_KW, DataType, convert_from_registers, convert_to_registers, pymodbus_version_info
+from .pymodbus_compat import (
+    ADDR_KW,
+    DataType,
+    compile_block_decoder,
+    convert_from_registers,
+    convert_to_registers,
+    pymodbus_version_info,
+    registers_to_bytes,
+    request_timeout,
+)
 
 RETRIES = 1  # was 6 then 0, which worked also, but 1 is probably the safe choice
 INVALID_START = 99999
 VERBOSE_CYCLES = 20
+_UNSET = object()  # marks a missing data key in change detection
+_PREEMPTED = object()  # marks pipelined requests not sent because the bus was handed to a higher priority
+OFFLINE_INTERFACE = "offline"  # interface of a hub built with SolaXModbusHub.offline()
+
+# decode plan step kinds, see SolaXModbusHub._compile_block_plan
+STEP_STRUCT = 0  # fixed width value, unpacked directly from the block buffer
+STEP_STRUCT_SWAPPED = 1  # 32 bit value with little word order, words swapped before unpacking
+STEP_U8L = 2
+STEP_U8H = 3
+STEP_ULSB16MSB16 = 4
+STEP_LEGACY = 5  # strings, word lists and unknown units - decoded by treat_address
+_U16 = struct.Struct(">H")
+_U16X2 = struct.Struct(">HH")
 
 
 try:
@@ -63,7 +86,19 @@ except ImportError:
         pass
 
 
+from .backoff import Backoff
+from .bus import bus_key, bus_priority
+from .bus import attach as attach_bus
+from .bus import detach as detach_bus
+from .connection import enable_keepalive
+from .debug import get_debug_setting
+from .metrics import HubMetrics
+from .pack_scheduler import PackScheduler
+from .registry_index import EntityEnablementIndex
+from .riemann import RiemannIntegrator
 from .sensor import SolaXModbusSensor
+from .trace import TraceRecorder
+from .write_scheduler import WriteScheduler
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -71,6 +106,8 @@ from .const import (
     BUTTONREPEAT_FIRST,
     BUTTONREPEAT_LOOP,
     BUTTONREPEAT_POST,
+    CONF_ADAPTIVE_MAX_INTERVAL,
+    CONF_BATTERY_PACKS_PER_CYCLE,
     CONF_BAUDRATE,
     CONF_CORE_HUB,
     CONF_DEBUG_SETTINGS,
@@ -78,18 +115,24 @@ from .const import (
     CONF_INVERTER_NAME_SUFFIX,
     CONF_INVERTER_POWER_KW,
     CONF_MODBUS_ADDR,
+    CONF_PIPELINE_WINDOW,
     CONF_PLUGIN,
     CONF_READ_DCB,
     CONF_READ_EPS,
+    CONF_RIEMANN_WRITE_INTERVAL,
     CONF_SERIAL_PORT,
     CONF_TCP_TYPE,
     CONF_TIME_OUT,
+    DEFAULT_ADAPTIVE_MAX_INTERVAL,
+    DEFAULT_BATTERY_PACKS_PER_CYCLE,
+    DEFAULT_RIEMANN_WRITE_INTERVAL,
     DEFAULT_BAUDRATE,
     DEFAULT_INTERFACE,
     DEFAULT_INVERTER_NAME_SUFFIX,
     DEFAULT_INVERTER_POWER_KW,
     DEFAULT_MODBUS_ADDR,
     DEFAULT_NAME,
+    DEFAULT_PIPELINE_WINDOW,
     DEFAULT_PLUGIN,
     DEFAULT_PORT,
     DEFAULT_READ_DCB,
@@ -117,6 +160,7 @@ from .const import (
     SCAN_GROUP_MEDIUM,
     # PLUGIN_PATH,
     SLEEPMODE_LASTAWAKE,
+    STATE_HEARTBEAT,
     WRITE_MULTI_MODBUS,
     WRITE_MULTISINGLE_MODBUS,
     WRITE_SINGLE_MODBUS,
@@ -153,6 +197,7 @@ empty_hub_device_group_lambda = lambda: SimpleNamespace(
     holdingBlocks={},
     readPreparation=None,  # function to call before read group
     readFollowUp=None,  # function to call after read group
+    fresh=False,  # the last read of the group completed, including readPreparation and readFollowUp
 )
 
 
@@ -161,59 +206,30 @@ def should_register_be_loaded(hass, hub, descriptor):
     Check if an entity is enabled in the entity registry, checking across multiple platforms.
     """
     if descriptor.internal:
-        _LOGGER.debug(f"{hub.name}: should be loaded: entity with key {descriptor.key} is internal, returning True.")
         return True
     unique_id = f"{hub._name}_{descriptor.key}"
     unique_id_alt = f"{hub._name}.{descriptor.key}"  # dont knnow why
-    platforms = (Platform.SENSOR, Platform.SELECT, Platform.NUMBER, Platform.SWITCH, Platform.BUTTON)
-    registry = er.async_get(hass)
-    entity_found = False
-    # First, check if there is an existing enabled entity in the registry for this unique_id.
-    for platform in platforms:
-        entity_id = registry.async_get_entity_id(platform, DOMAIN, unique_id)
-        if entity_id:
-            _LOGGER.debug(
-                f"{hub.name}: should be loaded: entity_id for {unique_id} on platform {platform} is now {entity_id}"
-            )
-        else:
-            entity_id = registry.async_get_entity_id(platform, DOMAIN, unique_id_alt)
-            _LOGGER.debug(
-                f"{hub.name}: should be loaded: entity_id for alt {unique_id_alt} on platform {platform} is now {entity_id}"
-            )
-        if entity_id:
-            entity_found = True
-            entity_entry = registry.async_get(entity_id)
-            if entity_entry and not entity_entry.disabled:
-                _LOGGER.debug(f"{hub.name}: should be loaded: Entity {entity_id} is enabled, returning True.")
-                return True  # Found an enabled entity, no need to check further
-    # If we get here, no enabled entity was found across all platforms.
-    if entity_found:
-        # At least one entity exists for this unique_id, but all are disabled. Respect the user's choice.
-        _LOGGER.debug(
-            f"{hub.name}: should be loaded: entity with unique_id {unique_id} was found but is disabled across all relevant platforms."
-        )
-        return False
-    else:
-        # No entity exists for this unique_id on any platform. Treat it as a new entity.
-        _LOGGER.debug(
-            f"{hub.name}: should be loaded: entity with unique_id {unique_id} not found in entity registry, checking defaults "
-        )
-        if descriptor.entity_registry_enabled_default:
-            return True
-        # check the other platforms descriptors
-        d = hub.selectEntities.get(descriptor.key)
-        if d and d.entity_registry_enabled_default:
-            return True
-        d = hub.numberEntities.get(descriptor.key)
-        if d and d.entity_registry_enabled_default:
-            return True
-        d = hub.switchEntities.get(descriptor.key)
-        if d and d.entity_registry_enabled_default:
-            return True
-        _LOGGER.debug(
-            f"{hub.name}: should be loaded: entity_default with unique_id {unique_id} was found but is disabled across all relevant platforms."
-        )
-        return False
+    index = hub.enablement_index
+    if index is None:
+        index = hub.enablement_index = EntityEnablementIndex(hass, hub._name)
+    # An enabled entity on any platform wins; entities that exist but are all disabled respect the user's choice.
+    enabled = index.enabled(unique_id, unique_id_alt)
+    if enabled is not None:
+        return enabled
+    # No entity exists for this unique_id on any platform. Treat it as a new entity.
+    if descriptor.entity_registry_enabled_default:
+        return True
+    # check the other platforms descriptors
+    d = hub.selectEntities.get(descriptor.key)
+    if d and d.entity_registry_enabled_default:
+        return True
+    d = hub.numberEntities.get(descriptor.key)
+    if d and d.entity_registry_enabled_default:
+        return True
+    d = hub.switchEntities.get(descriptor.key)
+    if d and d.entity_registry_enabled_default:
+        return True
+    return False
 
 
 async def config_entry_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
@@ -449,6 +465,145 @@ class block:
     # order32: int = None # word endian for 32bit registers
     descriptions: Any = None
     regs: Any = None  # sorted list of registers used in this block
+    plan: Any = None  # list of DecodeRecord, built by SolaXModbusHub._compile_block_plan
+    decoder: Any = None  # pymodbus_compat.BlockDecoder for the fixed width fields of the plan
+    # adaptive polling: the block is read every stride-th cycle of its scan group, max_stride == 1 means always
+    max_stride: int = 1
+    stride: int = 1
+    skip: int = 0  # cycles left to skip before the next read
+    stable_reads: int = 0  # consecutive reads without any register change
+    last_regs: Any = None
+    write_generation: int = 0
+
+
+class DecodeRecord:
+    """Everything the decode loop needs about one polled register, resolved once per block plan.
+    The hot path reads these slots instead of the entity description dataclass; descr is only passed on
+    to plugin callbacks (scale functions, the validation hook) and to treat_address for legacy units."""
+
+    __slots__ = (
+        "idx",
+        "kind",
+        "codec",
+        "slot",
+        "words",
+        "key",
+        "register",
+        "factor",
+        "min_val",
+        "max_val",
+        "scale_map",
+        "scale_func",
+        "rounding",
+        "lastawake",
+        "read_scale_exceptions",
+        "descr",
+    )
+
+    def __init__(self, idx, kind, codec, words, descr, factor, min_val, max_val):
+        self.idx = idx
+        self.kind = kind
+        self.codec = codec
+        self.slot = None  # position in the block decoder output, filled in by _compile_block_plan
+        self.words = words
+        self.key = descr.key
+        self.register = descr.register
+        self.factor = factor
+        self.min_val = min_val
+        self.max_val = max_val
+        scale = descr.scale
+        self.scale_map = scale if type(scale) is dict else None
+        self.scale_func = scale if self.scale_map is None and callable(scale) else None
+        self.rounding = descr.rounding
+        self.lastawake = descr.sleepmode == SLEEPMODE_LASTAWAKE
+        self.read_scale_exceptions = bool(descr.read_scale_exceptions)
+        self.descr = descr
+
+
+# struct codecs for the fixed width register units (big endian bytes and words)
+_UNIT_STRUCTS = {
+    REGISTER_U16: struct.Struct(">H"),
+    REGISTER_S16: struct.Struct(">h"),
+    REGISTER_U32: struct.Struct(">I"),
+    REGISTER_S32: struct.Struct(">i"),
+    REGISTER_F32: struct.Struct(">f"),
+}
+_UNIT_DATATYPES = {
+    REGISTER_U16: DataType.UINT16,
+    REGISTER_S16: DataType.INT16,
+    REGISTER_U32: DataType.UINT32,
+    REGISTER_S32: DataType.INT32,
+    REGISTER_F32: DataType.FLOAT32,
+}
+
+
+class ReadCostModel:
+    """Online least squares fit of the duration of one block read: request_cost + word_cost * words.
+    The sums decay with every sample, so the fit follows changes of the link (e.g. a busier RS485 bus)."""
+
+    DECAY = 0.98
+    MIN_SAMPLES = 20  # no fit before this many reads have been seen
+
+    def __init__(self, state=None):
+        state = state or {}
+        self.samples = int(state.get("samples", 0))
+        self.n = float(state.get("n", 0.0))
+        self.sw = float(state.get("sw", 0.0))
+        self.st = float(state.get("st", 0.0))
+        self.sww = float(state.get("sww", 0.0))
+        self.swt = float(state.get("swt", 0.0))
+
+    def add(self, words, seconds):
+        d = self.DECAY
+        self.samples += 1
+        self.n = self.n * d + 1.0
+        self.sw = self.sw * d + words
+        self.st = self.st * d + seconds
+        self.sww = self.sww * d + words * words
+        self.swt = self.swt * d + words * seconds
+
+    def fit(self):
+        """Return (request_cost, word_cost) in seconds, or None while the samples do not allow a fit."""
+        if self.samples < self.MIN_SAMPLES:
+            return None
+        denom = self.n * self.sww - self.sw * self.sw
+        if denom <= 1e-9 * self.n * self.sww:  # all reads had (nearly) the same size
+            return None
+        word_cost = (self.n * self.swt - self.sw * self.st) / denom
+        request_cost = (self.st - word_cost * self.sw) / self.n
+        if word_cost <= 0 or request_cost <= 0:
+            return None
+        return request_cost, word_cost
+
+    def break_even_gap(self):
+        """Number of unused registers that cost as much to read as one extra request."""
+        costs = self.fit()
+        if costs is None:
+            return None
+        return int(costs[0] / costs[1])
+
+    def as_dict(self):
+        return {"samples": self.samples, "n": self.n, "sw": self.sw, "st": self.st, "sww": self.sww, "swt": self.swt}
+
+
+class ComputedNode:
+    """One computed sensor in the evaluation graph: its declared inputs and the result of the last evaluation."""
+
+    __slots__ = ("key", "descr", "declared", "value", "volatile")
+
+    def __init__(self, key, descr):
+        self.key = key
+        self.descr = descr
+        deps = descr.depends_on or ()
+        self.declared = frozenset((deps,) if isinstance(deps, str) else deps)
+        self.value = _UNSET  # result of the last evaluation
+        # depends_on usually lists registers that must be read, not every input of the value function: only
+        # descriptions with depends_on_complete are gated on it. Energy dashboard sums read other hubs.
+        self.volatile = (
+            not (self.declared and getattr(descr, "depends_on_complete", False))
+            or bool(getattr(descr, "_energy_dashboard_mapping", None))
+            or bool(getattr(descr, "_energy_dashboard_source_hub", None))
+        )
 
 
 class SolaXModbusHub:
@@ -459,6 +614,7 @@ class SolaXModbusHub:
         hass,
         plugin,
         entry,
+        client_factory=None,
     ):
         config = entry.options
         name = config[CONF_NAME]
@@ -489,34 +645,55 @@ class SolaXModbusHub:
         # explicit init for stop flag
         self._stopping = False
         if interface == "serial":
-            self._client = AsyncModbusSerialClient(
-                port=serial_port,
-                baudrate=baudrate,
-                parity="N",
-                stopbits=1,
-                bytesize=8,
-                timeout=time_out,
-                retries=RETRIES,
-            )
-        elif interface == "tcp":
-            if tcp_type == "rtu":
-                self._client = AsyncModbusTcpClient(
-                    host=host, port=port, timeout=time_out, framer=FramerType.RTU, retries=RETRIES
-                )
-            elif tcp_type == "ascii":
-                self._client = AsyncModbusTcpClient(
-                    host=host, port=port, timeout=time_out, framer=FramerType.ASCII, retries=RETRIES
+
+            def client_factory():
+                return AsyncModbusSerialClient(
+                    port=serial_port,
+                    baudrate=baudrate,
+                    parity="N",
+                    stopbits=1,
+                    bytesize=8,
+                    timeout=time_out,
+                    retries=RETRIES,
                 )
-            else:
-                self._client = AsyncModbusTcpClient(host=host, port=port, timeout=time_out, retries=RETRIES)
-        elif interface == "core":
-            # Core-hub variant uses Home Assistant's Modbus hub; use harmless dummy client
-            self._client = SimpleNamespace(connected=False, comm_params=SimpleNamespace(host="", port=""))
+
+        elif interface == "tcp":
+
+            def client_factory():
+                if tcp_type == "rtu":
+                    return AsyncModbusTcpClient(
+                        host=host, port=port, timeout=time_out, framer=FramerType.RTU, retries=RETRIES
+                    )
+                if tcp_type == "ascii":
+                    return AsyncModbusTcpClient(
+                        host=host, port=port, timeout=time_out, framer=FramerType.ASCII, retries=RETRIES
+                    )
+                return AsyncModbusTcpClient(host=host, port=port, timeout=time_out, retries=RETRIES)
+
+        if interface == OFFLINE_INTERFACE:
+            key = (OFFLINE_INTERFACE, name)  # a client of its own from client_factory, see offline()
+        else:
+            key = bus_key(interface, host, port, tcp_type, serial_port)
+        if key is not None:
+            # one client and one arbiter for all hubs on the same serial port or TCP gateway
+            self._lane = attach_bus(key, name, (baudrate, time_out), client_factory)
+            self._client = self._lane.bus.client
+            self._lock = self._lane
+            self.health = self._lane.bus.health
         else:
-            # Fallback dummy client for unrecognized interface types
+            # Core-hub variant uses Home Assistant's Modbus hub, other interfaces are not supported:
+            # use a harmless dummy client
+            self._lane = None
             self._client = SimpleNamespace(connected=False, comm_params=SimpleNamespace(host="", port=""))
-        self._lock = asyncio.Lock()
+            self._lock = asyncio.Lock()
+            self.health = None
         self._name = name
+        # Pipelining: several block requests of one device group in flight at once. Only plain Modbus TCP
+        # has transaction ids to match responses; RTU (serial or over TCP) and ASCII stay strictly serialized.
+        pipeline_window = int(config.get(CONF_PIPELINE_WINDOW, DEFAULT_PIPELINE_WINDOW) or 1)
+        if interface != "tcp" or tcp_type not in (None, "tcp"):
+            pipeline_window = 1
+        self.pipeline_window = max(1, pipeline_window)
         # following call will modify and extend client in case old modbus API needs to be used
         _LOGGER.debug(f"{name}: using pymodbus version {pymodbus_version_info()}")
 
@@ -533,22 +710,35 @@ class SolaXModbusHub:
         self.tmpdata = {}  # for WRITE_DATA_LOCAL entities with corresponding prevent_update number/sensor
         self.tmpdata_expiry = {}  # expiry timestamps for tempdata
         self.cyclecount = 0  # temporary - remove later
-        self.slowdown = (
-            1  # slow down factor when modbus is not responding: 1 : no slowdown, 10: ignore 9 out of 10 cycles
-        )
+        self.slowdown = 1  # 1: device answers, 10: device is not responding and polling backs off (see backoff)
+        self.backoff = Backoff()
+        self.parallel_group = None  # energy_dashboard.ParallelGroup this hub contributes to
+        # Recorder mode (debug setting record_trace): raw block responses for offline replay, see trace.py
+        self.trace = None
+        self._trace_write = None  # executor future of the last trace write
+        if get_debug_setting(name, "record_trace", config, hass, default=False):
+            self.trace = TraceRecorder(hass.config.path(f"{DOMAIN}_{name.replace(' ', '_')}_trace.bin"))
+            _LOGGER.warning(f"{name}: recording block responses to {self.trace.path}")
         self.computedSensors = {}
+        self.computed_nodes = {}  # computed sensor key -> ComputedNode
+        self.computed_order = []  # ComputedNode list, every node after the computed nodes it reads
+        self.dirty_keys = set()  # data keys changed since their entity was last considered for a state write
+        self.published = {}  # key -> (value, timestamp) of the last state write of change-gated sensors
         self.computedEntities = {}  # buttons and selects with value_function for autorepeat
         self.computedSwitches = {}
         self.sensorEntities = {}  # all sensor entities, indexed by key
         self.numberEntities = {}  # all number entities, indexed by key
         self.selectEntities = {}
         self.switchEntities = {}
+        self.enablement_index = None  # EntityEnablementIndex, built on first use
         self.entity_dependencies = {}  # Maps a sensor key to a list of data control keys that use the sensor as data source
         # self.preventSensors = {} # sensors with prevent_update = True
         self.writeLocals = {}  # key to description lookup dict for write_method = WRITE_DATA_LOCAL entities
         self.sleepzero = []  # sensors that will be set to zero in sleepmode
         self.sleepnone = []  # sensors that will be cleared in sleepmode
         self.writequeue = {}  # queue requests when inverter is in sleep mode
+        self.write_scheduler = WriteScheduler(self)  # coalesces and batches register writes
+        self.metrics = HubMetrics()  # timing histograms and counters for diagnostics
         _LOGGER.debug(f"{self.name}: ready to call plugin to determine inverter type")
         self.plugin = plugin.plugin_instance  # getPlugin(name).plugin_instance
         self.plugin_module = plugin  # Store plugin module for accessing module-level functions
@@ -573,6 +763,33 @@ class SolaXModbusHub:
         self.bad_recheck = {"holding": set(), "input": set()}
         self._did_initial_bisect = False
         self.bisect_max_depth = 10  # safety cap to avoid pathological recursion
+        # probe_cache: persisted probe result (serial, bad_regs, blocks that read fine) of the last start
+        self.probe_cache = None
+        self.probe_ok_blocks = set()  # (typ, start, end) of blocks that read fine in one piece during the probe
+        # name of the detection probe that answered at the last start, see async_run_detection_probes
+        self.detection_probe = None
+        self._detection_loaded = False
+        self._save_after_load = False
+
+        # Adaptive block layout: split blocks at register gaps that cost more to read than a separate request.
+        # max_gap None means no gap splitting (layout by newblock, block_size and bad_regs only).
+        self.read_costs = ReadCostModel()
+        self.max_gap = None
+
+        # Adaptive polling: blocks whose registers do not change are read less often, at most every
+        # adaptive_max_interval seconds. Every write restarts full speed polling of the holding blocks.
+        self.adaptive_max_interval = int(config.get(CONF_ADAPTIVE_MAX_INTERVAL, DEFAULT_ADAPTIVE_MAX_INTERVAL) or 0)
+        self.write_generation = 0
+
+        # Multiplexed device groups (battery packs) are read in turn, a few per cycle, see pack_scheduler.py
+        self.pack_scheduler = PackScheduler(
+            int(config.get(CONF_BATTERY_PACKS_PER_CYCLE, DEFAULT_BATTERY_PACKS_PER_CYCLE) or 0)
+        )
+
+        # Riemann sum sensors are integrated together once per device group fan-out, see riemann.py
+        self.riemann = RiemannIntegrator(
+            self, int(config.get(CONF_RIEMANN_WRITE_INTERVAL, DEFAULT_RIEMANN_WRITE_INTERVAL) or 0)
+        )
 
         # Gate normal polling until initial probe completes
         self._probe_ready = asyncio.Event()
@@ -583,6 +800,17 @@ class SolaXModbusHub:
 
         # _LOGGER.debug("solax modbushub done %s", self.__dict__)
 
+    @classmethod
+    def offline(cls, plugin, client, name, options=None):
+        """A hub without Home Assistant that reads through client, e.g. a trace.ReplayClient, for benchmarks
+        (tester/bench_replay.py). No entities are set up and local data is neither loaded nor saved: the
+        caller lays out the device groups and sets computedSensors."""
+        entry = SimpleNamespace(options={CONF_NAME: name, CONF_INTERFACE: OFFLINE_INTERFACE, **(options or {})})
+        hub = cls(None, plugin, entry, client_factory=lambda: client)
+        hub.localsLoaded = True
+        hub._probe_ready.set()
+        return hub
+
     async def async_init(self, *args: Any) -> None:  # noqa: D102
         import asyncio
         import time as _t
@@ -711,6 +939,11 @@ class SolaXModbusHub:
         tosave = {"_version": self.DATAFORMAT_VERSION}
         for desc in self.writeLocals:
             tosave[desc] = self.data.get(desc)
+        tosave["_block_layout"] = {"max_gap": self.max_gap, "read_costs": self.read_costs.as_dict()}
+        if self.probe_cache is not None:
+            tosave["_probe_cache"] = self.probe_cache
+        if self.detection_probe is not None:
+            tosave["_detection_probe"] = self.detection_probe
 
         with open(self._hass.config.path(f"{self.name}_data.json"), "w") as fp:
             json.dump(tosave, fp)
@@ -742,10 +975,20 @@ class SolaXModbusHub:
                         self.data[desc] = val
                     else:
                         self.data[desc] = self.writeLocals[desc].initvalue  # first time initialisation
+                layout = loaded.get("_block_layout")
+                if layout:
+                    self.read_costs = ReadCostModel(layout.get("read_costs"))
+                    if layout.get("max_gap") != self.max_gap:
+                        self.max_gap = layout.get("max_gap")
+                        self.blocks_changed = True
+                        _LOGGER.info(f"{self._name}: restored block layout, splitting at gaps > {self.max_gap}")
             else:
                 _LOGGER.warning(f"local persistent data lost - please reinitialize {self.writeLocals.keys()}")
             fp.close()
             self.localsLoaded = True
+            if self._save_after_load:  # hub state changed before the file was loaded
+                self._save_after_load = False
+                self.localsUpdated = True
             self.plugin.localDataCallback(self)
             try:
                 self._hass.loop.call_soon_threadsafe(
@@ -756,6 +999,29 @@ class SolaXModbusHub:
             except Exception as ex:
                 _LOGGER.debug(f"{self._name}: failed to fire local data event: {ex}")
 
+    def request_local_save(self):
+        """Ask for a save of the local data file with the next poll. Deferred until the file has been loaded,
+        so that persisted local entity values are never overwritten with their defaults."""
+        if self.localsLoaded:
+            self.localsUpdated = True
+        else:
+            self._save_after_load = True
+
+    def loadLocalKey(self, key):
+        """Return one entry of the local data file, or None."""
+        try:
+            with open(self._hass.config.path(f"{self.name}_data.json")) as fp:
+                loaded = json.load(fp)
+        except Exception:
+            return None
+        if loaded.get("_version") != self.DATAFORMAT_VERSION:
+            return None
+        return loaded.get(key)
+
+    def loadProbeCache(self):
+        """Return the probe result persisted in the local data file, or None."""
+        return self.loadLocalKey("_probe_cache")
+
     # end of save and load section
 
     def scan_group(self, sensor):  # seems to be called for non-sensor entities also - strange
@@ -824,9 +1090,11 @@ class SolaXModbusHub:
                 self.cyclecount += 1
                 cycle_id = self.cyclecount
                 _LOGGER.debug(f"{self._name}: [{secs}s] poll started – cycle #{cycle_id}")
+                bus_priority.set(float(secs))  # shared bus: faster scan groups go first
                 # If a previous cycle is still running, mark a catch-up and return quickly.
                 if interval_group.poll_lock.locked():
                     interval_group.pending_rerun = True
+                    self.metrics.count("overruns")
                     _LOGGER.debug(
                         f"{self._name}: [{secs}s] overrun – previous poll still running; scheduling immediate catch-up after it finishes"
                     )
@@ -840,6 +1108,7 @@ class SolaXModbusHub:
                             interval_group, _now, cycle_id=cycle_id
                         )
                     elapsed = _mtime.monotonic() - start
+                    self.metrics.time("cycle", elapsed)
                     _LOGGER.debug(
                         f"{self._name}: [{secs}s] poll finished – cycle #{cycle_id}, "
                         f"duration={int(elapsed * 1000)} ms, ok={agg_res}, "
@@ -896,6 +1165,7 @@ class SolaXModbusHub:
 
         _LOGGER.debug(f"{self._name}:remove sensor {sensor.entity_description.key} remaining:{len(grp.sensors)} ")
         grp.sensors.remove(sensor)
+        self.published.pop(sensor.entity_description.key, None)  # re-added entities start with a state write
 
         if not grp.sensors:
             _LOGGER.debug(f"removing device group {device_key}")
@@ -929,36 +1199,254 @@ class SolaXModbusHub:
         agg_res = True  # aggregate result across all device groups in this interval
         updated_sensors = 0  # how many entities were pushed this cycle
         # Use cyclecount from caller, not increment here
-        if (self.cyclecount % self.slowdown) == 0:  # only execute once every slowdown count
-            for group in list(
-                interval_group.device_groups.values()
-            ):  # not sure if this does not break things or affects performance
-                group_result = await self.async_read_modbus_data(group)
-                agg_res = agg_res and group_result
-                if group_result:
-                    if self.slowdown > 1:
-                        _LOGGER.debug(f"{self._name}: communication restored, resuming normal speed after slowdown")
-                    self.slowdown = 1  # return to full polling after successful cycle
-                    for sensor in group.sensors:
+        backoff = self.backoff
+        backoff_base = min(self.groups, default=0) or 1  # same schedule whichever scan group fails
+        started = _mtime.monotonic()
+        if backoff.offline:
+            if not backoff.due(started):
+                return agg_res, updated_sensors
+            if not await self._liveness_probe(interval_group):
+                backoff.failed(backoff_base, _mtime.monotonic(), started)
+                _LOGGER.debug(f"{self._name}: still not responding - next attempt in {backoff.delay:.0f}s")
+                return False, updated_sensors
+        any_success = False
+        # all groups of the device, but only the battery packs whose turn it is, see pack_scheduler
+        for name, group in self.pack_scheduler.due(interval_group.interval, interval_group.device_groups):
+            group_result = await self.async_read_modbus_data(group)
+            self.pack_scheduler.done(name, group)
+            agg_res = agg_res and group_result
+            if group_result:
+                any_success = True
+                now = time()
+                t0 = _mtime.perf_counter()
+                # a battery pack read in its turn: write all its states, so that their last_refresh is current
+                pack_refreshed = group.readPreparation is not None and group.fresh
+                for sensor in group.sensors:
+                    if self.should_publish(sensor, now) or pack_refreshed:
                         sensor.modbus_data_updated()
-                    updated_sensors += len(group.sensors)
-                else:
-                    if self.slowdown <= 1:
-                        _LOGGER.debug(
-                            f"{self._name}: modbus group read failed - assuming sleep mode - slowing down by factor 10"
-                        )
-                    self.slowdown = 10
-                    for i in self.sleepnone:
-                        self.data.pop(i, None)
-                    for i in self.sleepzero:
-                        self.data[i] = 0
-                    # self.data = {} # invalidate data - do we want this ??
-
-                _LOGGER.debug(f"{self._name}: device group read done")
+                        updated_sensors += 1
+                self.riemann.advance()
+                self.metrics.time("fanout", _mtime.perf_counter() - t0)
+            else:
+                for i in self.sleepnone:
+                    if self.data.pop(i, None) is not None:
+                        self.dirty_keys.add(i)
+                for i in self.sleepzero:
+                    if self.data.get(i) != 0:
+                        self.dirty_keys.add(i)
+                    self.data[i] = 0
+                # self.data = {} # invalidate data - do we want this ??
+
+            _LOGGER.debug(f"{self._name}: device group read done")
+        if any_success and self.parallel_group is not None:
+            self.parallel_group.publish(self)  # Energy Dashboard totals of a parallel system
+        if any_success:
+            if backoff.offline:
+                _LOGGER.debug(f"{self._name}: communication restored, resuming normal speed after backoff")
+            backoff.succeeded()
+            self.slowdown = 1  # return to full polling after successful cycle
+        elif not agg_res:
+            if not backoff.offline:
+                _LOGGER.debug(f"{self._name}: modbus group read failed - assuming sleep mode - backing off")
+            backoff.failed(backoff_base, _mtime.monotonic(), started)
+            self.slowdown = 10
         await self._maybe_refresh_energy_dashboard_on_primary_update()
         # Return aggregate result and updated sensor count to caller for logging
         return agg_res, updated_sensors
 
+    async def _liveness_probe(self, interval_group):
+        """Read a single register of the first block of a scan group; True if the device answered.
+        Device groups that need a read preparation (e.g. battery pack selection) are not probed."""
+        for group in interval_group.device_groups.values():
+            if group.readPreparation is not None:
+                continue
+            for typ, blocks in (("input", group.inputBlocks), ("holding", group.holdingBlocks)):
+                if not blocks:
+                    continue
+                self.metrics.count("probes")
+                try:
+                    if typ == "input":
+                        resp = await self.async_read_input_registers(
+                            unit=self._modbus_addr, address=blocks[0].start, count=1
+                        )
+                    else:
+                        resp = await self.async_read_holding_registers(
+                            unit=self._modbus_addr, address=blocks[0].start, count=1
+                        )
+                except Exception as ex:
+                    _LOGGER.debug(f"{self._name}: liveness probe failed: {ex}")
+                    return False
+                return resp is not None and not resp.isError()
+        return True  # nothing to probe, let the full read decide
+
+    DETECTION_TIMEOUT = 2.0  # seconds per detection probe; an inverter asleep must not hold up the start
+
+    async def async_run_detection_probes(self, probes):
+        """Run the detection probes of a plugin (see const.DetectionProbe) and return the decoded value of
+        the first probe in declaration order that answered, or None.
+        The probe that answered at the last start is tried alone first. Otherwise all probes are sent as one
+        set, pipelined on plain Modbus TCP and one after the other elsewhere, each with a short timeout."""
+        if not probes:
+            return None
+        if not self._detection_loaded:
+            self.detection_probe = await self._hass.async_add_executor_job(self.loadLocalKey, "_detection_probe")
+            self._detection_loaded = True
+        cached = next((probe for probe in probes if probe.name == self.detection_probe), None)
+        if cached is not None:
+            value = await self._detection_read(cached)
+            if value:
+                _LOGGER.debug(f"{self._name}: detected with the probe of the last start {cached.name}: {value}")
+                return value
+            probes = [probe for probe in probes if probe is not cached]
+        if self.pipeline_window > 1 and len(probes) > 1:
+            values = await self._detection_requests(probes)  # pipelined
+        else:
+            values = []
+            for probe in probes:
+                values.append(await self._detection_read(probe))
+                if values[-1]:
+                    break
+        for probe, value in zip(probes, values):
+            if value:
+                if probe.name != self.detection_probe:
+                    self.detection_probe = probe.name
+                    self.request_local_save()
+                return value
+        return None
+
+    def _detection_value(self, probe, resp):
+        if resp is None or resp.isError():
+            return None
+        try:
+            value = probe.decode(resp.registers)
+        except Exception as ex:
+            _LOGGER.debug(f"{self._name}: detection probe {probe.name} not decodable: {ex}")
+            return None
+        _LOGGER.info(f"{self._name}: detection probe {probe.name} at 0x{probe.register:x}: {value}")
+        return value
+
+    async def _detection_read(self, probe):
+        """Send one probe. The short DETECTION_TIMEOUT is the response timeout of the request itself (see
+        pymodbus_compat.request_timeout), so the wait for a reconnect or for a bus held by another hub does
+        not count against it."""
+        if self._lane is None:  # core hub variant: the Home Assistant modbus hub applies its own timeout
+            try:
+                if probe.register_type == REG_INPUT:
+                    resp = await self.async_read_input_registers(self._modbus_addr, probe.register, probe.count)
+                else:
+                    resp = await self.async_read_holding_registers(self._modbus_addr, probe.register, probe.count)
+            except Exception as ex:
+                _LOGGER.debug(f"{self._name}: detection probe {probe.name} at 0x{probe.register:x} failed: {ex!r}")
+                return None
+            return self._detection_value(probe, resp)
+        return (await self._detection_requests([probe]))[0]
+
+    async def _detection_requests(self, probes):
+        """Send the probes under one hold of the lock, all in flight at once if there are several (pipelined,
+        like async_read_modbus_blocks_pipelined); returns the decoded values in probe order, None for a probe
+        that failed."""
+        if not await self._check_connection():
+            return [None] * len(probes)
+        kwargs = {ADDR_KW: self._modbus_addr} if self._modbus_addr is not None else {}
+
+        async def _one(probe):
+            if probe.register_type == REG_INPUT:
+                read = self._client.read_input_registers(address=probe.register, count=probe.count, **kwargs)
+            else:
+                read = self._client.read_holding_registers(address=probe.register, count=probe.count, **kwargs)
+            try:
+                resp = await self._track_task(read)
+            except Exception as ex:  # includes the timeout
+                _LOGGER.debug(f"{self._name}: detection probe {probe.name} at 0x{probe.register:x} failed: {ex!r}")
+                return None
+            self.health.ok()
+            return self._detection_value(probe, resp)
+
+        async with self._lock:
+            if getattr(self, "_stopping", False) or not self._client.connected:
+                return [None] * len(probes)
+            with request_timeout(self._client, self.DETECTION_TIMEOUT):
+                return await asyncio.gather(*(_one(probe) for probe in probes))
+
+    def _computed_graph(self):
+        """Return the computed sensors in evaluation order. The graph is rebuilt when sensors were added or
+        removed."""
+        computed = self.computedSensors
+        nodes = self.computed_nodes
+        if len(nodes) != len(computed) or any(
+            nodes.get(key) is None or nodes[key].descr is not descr for key, descr in computed.items()
+        ):
+            self.computed_nodes = nodes = {
+                key: (nodes[key] if key in nodes and nodes[key].descr is descr else ComputedNode(key, descr))
+                for key, descr in computed.items()
+            }
+            self.computed_order = None
+        if self.computed_order is None:
+            self.computed_order = self._sort_computed(nodes)
+        return self.computed_order
+
+    @staticmethod
+    def _sort_computed(nodes):
+        """Topological order (Kahn) of the computed nodes, edges from a computed key to the nodes reading it.
+        Nodes that are part of a cycle keep their registration order at the end."""
+        readers = {key: [] for key in nodes}
+        pending = {}
+        for key, node in nodes.items():
+            deps = [dep for dep in node.declared if dep in nodes and dep != key]
+            pending[key] = len(deps)
+            for dep in deps:
+                readers[dep].append(key)
+        ready = [key for key in nodes if pending[key] == 0]
+        order = []
+        while ready:
+            key = ready.pop(0)
+            order.append(nodes[key])
+            for reader in readers[key]:
+                pending[reader] -= 1
+                if pending[reader] == 0:
+                    ready.append(reader)
+        if len(order) < len(nodes):
+            placed = {node.key for node in order}
+            order.extend(node for key, node in nodes.items() if key not in placed)
+        return order
+
+    def _computed_stale(self, node, data, changed):
+        """True if the node must be evaluated: always for volatile and never evaluated nodes, otherwise when one
+        of its declared inputs is in the dirty set or is a computed key that changed earlier in this pass. A
+        result that was overwritten elsewhere (e.g. sleep mode) is evaluated again as well."""
+        if node.volatile or node.value is _UNSET or data.get(node.key, _UNSET) is not node.value:
+            return True
+        return not (node.declared.isdisjoint(self.dirty_keys) and node.declared.isdisjoint(changed))
+
+    def should_publish(self, sensor, now):
+        """Decide whether the entity needs a state write after a poll.
+        Entities without skip_unchanged_updates (numbers, selects, Riemann sums) are always written. Others only
+        when their value changed (beyond the optional deadband of the description) or when the last write is
+        older than STATE_HEARTBEAT, so that unchanged registers do not cause state machine and recorder traffic."""
+        if not getattr(sensor, "skip_unchanged_updates", False):
+            return True
+        descr = sensor.entity_description
+        key = descr.key
+        val = self.data.get(key)
+        last = self.published.get(key)
+        if last is not None and (now - last[1]) < STATE_HEARTBEAT:
+            if key not in self.dirty_keys:
+                return False
+            self.dirty_keys.discard(key)
+            deadband = getattr(descr, "deadband", None)
+            if deadband:
+                try:
+                    if abs(val - last[0]) < deadband:
+                        return False
+                except TypeError:  # not numeric, or value just became available / unavailable
+                    pass
+            elif val == last[0]:  # changed back within the cycle, e.g. sleepzero followed by a good read
+                return False
+        else:
+            self.dirty_keys.discard(key)
+        self.published[key] = (val, now)
+        return True
+
     async def _maybe_refresh_energy_dashboard_on_primary_update(self) -> None:
         if not self._hass:
             return
@@ -1024,7 +1512,11 @@ class SolaXModbusHub:
         return self._name
 
     async def async_close(self):
-        """Disconnect client."""
+        """Disconnect client, unless other hubs still use it."""
+        if self._lane is not None and not self._lane.bus.sole_user(self._lane):
+            return
+        if self.health is not None:
+            self.health.close()  # a pending background reconnect would open the client again
         if self._client.connected:
             self._client.close()
 
@@ -1041,6 +1533,20 @@ class SolaXModbusHub:
                     pass
                 interval_group.unsub_interval_method = None
         self.groups.clear()
+        if self.parallel_group is not None:
+            self.parallel_group.leave(self._name)
+        if self.enablement_index is not None:
+            self.enablement_index.close()
+            self.enablement_index = None
+        if self.trace is not None:
+            if self._trace_write is not None:
+                await asyncio.wait([self._trace_write])  # a failure is logged by _trace_written
+                self._trace_write = None
+            self.trace.take()
+            try:
+                await self._hass.async_add_executor_job(self.trace.write)
+            except Exception as ex:
+                _LOGGER.warning(f"{self._name}: cannot write trace {self.trace.path}: {ex}")
         # 2) stop any running tasks
         for tname in ("_initial_bisect_task", "_recheck_task"):
             task = getattr(self, tname, None)
@@ -1075,9 +1581,10 @@ class SolaXModbusHub:
             self._probe_ready.set()
         except Exception:
             pass
-        # 4) close transport
+        # 4) close transport, unless other hubs still use it
         try:
-            if self._client and self._client.connected:
+            last_user = self._lane is None or detach_bus(self._lane)
+            if last_user and self._client and self._client.connected:
                 self._client.close()
         except Exception:
             pass
@@ -1097,13 +1604,12 @@ class SolaXModbusHub:
     #            await self._client.connect()
 
     async def _check_connection(self):
+        """Wait for a usable connection, reconnecting in the background if needed (see connection.py).
+        Called before taking self._lock, so a reconnect does not hold up the other users of the lock."""
         if getattr(self, "_stopping", False):
             return False
-        if not self._client.connected:
-            _LOGGER.debug(f"{self._name}: Inverter is not connected, trying to connect")
-            await self._client.connect()
-            await asyncio.sleep(1)
-        return self._client.connected
+        self.health.expect_gap(self._name, max(max(self.groups, default=0), self.backoff.delay))
+        return await self.health.ready(self._name, busy=self._lock.locked())
 
     async def is_online(self):
         return self._client.connected and (self.slowdown == 1)
@@ -1115,82 +1621,87 @@ class SolaXModbusHub:
             f"{self._name}: Trying to connect to Inverter at {self._client.comm_params.host}:{self._client.comm_params.port} connected: {self._client.connected} ",
         )
         await self._client.connect()
+        if self._client.connected:
+            self.health.keepalive = enable_keepalive(self._client)
 
     async def async_read_holding_registers(self, unit, address, count):
         """Read holding registers using high-level pymodbus API."""
-        async with self._lock:
-            if getattr(self, "_stopping", False):
-                return None
-            await self._check_connection()
-            if not self._client.connected:
-                return None
-            try:
-                # Use high-level API; unit key is provided via ADDR_KW for compatibility
-                kwargs = {ADDR_KW: unit} if unit is not None else {}
-                _LOGGER.debug(f"{self._name}: READ HOLDING {ADDR_KW}={unit} addr=0x{address:x} cnt={count}")
-                resp = await self._track_task(
-                    self._client.read_holding_registers(address=address, count=count, **kwargs)
-                )
-            except ModbusException as exception_error:
-                error = f"Error: device: {unit} address: 0x{address:x} -> {exception_error!s}"
-                _LOGGER.error(error)
-                # Flush transport: close + short pause + reconnect to clear any late/queued frames
-                _LOGGER.debug(f"{self._name}: ModbusException – flushing transport and reconnecting")
-                try:
-                    self._client.close()
-                finally:
-                    await asyncio.sleep(0.2)
-                    await self._client.connect()
-                return None
-        return resp
+        return await self._async_read_registers("holding", unit, address, count)
 
     async def async_read_input_registers(self, unit, address, count):
         """Read input registers using high-level pymodbus API."""
-        async with self._lock:
-            if getattr(self, "_stopping", False):
-                return None
-            await self._check_connection()
-            if not self._client.connected:
+        return await self._async_read_registers("input", unit, address, count)
+
+    async def _async_read_registers(self, typ, unit, address, count):
+        """Read a register range. A transport error starts a reconnect in the background; the read is then
+        retried once on the fresh connection, unless the device is known to be offline (see backoff)."""
+        attempts = 1 if self.backoff.offline else 2
+        for attempt in range(1, attempts + 1):
+            if attempt > 1:
+                self.metrics.count("read_retries")
+            if not await self._check_connection():
                 return None
-            try:
-                # Use high-level API; unit key is provided via ADDR_KW for compatibility
-                kwargs = {ADDR_KW: unit} if unit is not None else {}
-                _LOGGER.debug(f"{self._name}: READ INPUT  {ADDR_KW}={unit} addr=0x{address:x} cnt={count}")
-                resp = await self._track_task(
-                    self._client.read_input_registers(address=address, count=count, **kwargs)
-                )
-            except ModbusException as exception_error:
-                error = f"Error: device: {unit} address: 0x{address:x} -> {exception_error!s}"
+            async with self._lock:
+                if getattr(self, "_stopping", False):
+                    return None
+                if not self._client.connected:  # reconnect started by another user since _check_connection
+                    error = f"Error: device: {unit} address: 0x{address:x} -> not connected"
+                else:
+                    try:
+                        # Use high-level API; unit key is provided via ADDR_KW for compatibility
+                        kwargs = {ADDR_KW: unit} if unit is not None else {}
+                        _LOGGER.debug(
+                            f"{self._name}: READ {typ.upper():<7} {ADDR_KW}={unit} addr=0x{address:x} cnt={count}"
+                        )
+                        t0 = _mtime.monotonic()
+                        if typ == "input":
+                            request = self._client.read_input_registers(address=address, count=count, **kwargs)
+                        else:
+                            request = self._client.read_holding_registers(address=address, count=count, **kwargs)
+                        resp = await self._track_task(request)
+                    except ModbusException as exception_error:
+                        error = f"Error: device: {unit} address: 0x{address:x} -> {exception_error!s}"
+                        if self.health.lost(self._name, str(exception_error)):
+                            self.metrics.count("reconnects")
+                    else:
+                        self.health.ok()  # an exception response is an answer too
+                        if resp is not None and not resp.isError():
+                            self._record_read_cost(count, _mtime.monotonic() - t0)
+                        return resp
+            if attempt == attempts:
                 _LOGGER.error(error)
-                # Flush transport: close + short pause + reconnect to clear any late/queued frames
-                _LOGGER.debug(f"{self._name}: ModbusException – flushing transport and reconnecting")
-                try:
-                    self._client.close()
-                finally:
-                    await asyncio.sleep(0.2)
-                    await self._client.connect()
                 return None
-        return resp
+            _LOGGER.debug(f"{self._name}: {error} - retrying on a fresh connection")
+        return None
+
+    REFIT_SAMPLES = 50  # re-evaluate the block layout after this many measured reads
+
+    def _record_read_cost(self, words, seconds):
+        """Feed a measured block read into the cost model and adapt max_gap when the fit has moved enough."""
+        costs = self.read_costs
+        costs.add(words, seconds)
+        if costs.samples % self.REFIT_SAMPLES:
+            return
+        gap = costs.break_even_gap()
+        if gap is None:
+            return
+        gap = min(gap, self.plugin.block_size)  # larger gaps can never be bridged anyway
+        if self.max_gap is None or abs(gap - self.max_gap) > max(2, self.max_gap // 4):
+            request_cost, word_cost = costs.fit()
+            _LOGGER.info(
+                f"{self._name}: read cost {request_cost * 1000:.1f}ms/request + {word_cost * 1000:.2f}ms/word - "
+                f"splitting blocks at gaps > {gap} registers (was {self.max_gap})"
+            )
+            self.max_gap = gap
+            self.blocks_changed = True
+            self.request_local_save()  # persist the layout with the local data
 
     async def async_lowlevel_write_register(self, unit, address, payload):
-        kwargs = {ADDR_KW: unit} if unit is not None else {}
+        self.write_generation += 1  # adaptive polling: read holding blocks back at full speed
         regs = convert_to_registers(int(payload), DataType.INT16, self.plugin.order32)
-        async with self._lock:
-            await self._check_connection()
-            try:
-                resp = await self._track_task(self._client.write_register(address=address, value=regs[0], **kwargs))
-                # Plugin-level logging hook
-                if hasattr(self.plugin, "log_register_write"):
-                    self.plugin.log_register_write(self, address, unit, payload, result=resp)
-            except (ConnectionException, ModbusIOException) as e:
-                original_message = str(e)
-                # Plugin-level logging hook
-                if hasattr(self.plugin, "log_register_write"):
-                    self.plugin.log_register_write(
-                        self, address, unit, payload, error=(type(e).__name__, original_message)
-                    )
-                raise HomeAssistantError(f"Error writing single Modbus register: {original_message}") from e
-        return resp
+        return await self.write_scheduler.submit(
+            unit, address, regs[:1], fc16=False, payload=payload, what="single Modbus register"
+        )
 
     async def async_write_register(self, unit, address, payload):
         """Write register."""
@@ -1216,16 +1727,9 @@ class SolaXModbusHub:
 
     async def async_write_registers_single(self, unit, address, payload):  # Needs adapting for register queue
         """Write registers multi, but write only one register of type 16bit"""
+        self.write_generation += 1  # adaptive polling: read holding blocks back at full speed
         regs = convert_to_registers(int(payload), DataType.INT16, self.plugin.order32)
-        kwargs = {ADDR_KW: unit} if unit is not None else {}
-        async with self._lock:
-            await self._check_connection()
-            try:
-                resp = await self._track_task(self._client.write_registers(address=address, values=regs, **kwargs))
-            except (ConnectionException, ModbusIOException) as e:
-                original_message = str(e)
-                raise HomeAssistantError(f"Error writing single Modbus registers: {original_message}") from e
-        return resp
+        return await self.write_scheduler.submit(unit, address, regs, payload=payload, what="single Modbus registers")
 
     async def async_write_registers_multi(self, unit, address, payload):  # Needs adapting for register queue
         """Write registers multi.
@@ -1239,7 +1743,7 @@ class SolaXModbusHub:
         All register descriptions referenced in the payload must be consecutive (without leaving holes)
         32bit integers will be converted to 2 modbus register values according to the endian strategy of the plugin
         """
-        kwargs = {ADDR_KW: unit} if unit is not None else {}
+        self.write_generation += 1  # adaptive polling: read holding blocks back at full speed
         if isinstance(payload, list):
             regs_out = []
             for (
@@ -1301,15 +1805,9 @@ class SolaXModbusHub:
             online = await self.is_online()
             _LOGGER.debug(f"Ready to write multiple registers at 0x{address:02x}: {regs_out} online: {online} ")
             if online:
-                async with self._lock:
-                    try:
-                        resp = await self._track_task(
-                            self._client.write_registers(address=address, values=regs_out, **kwargs)
-                        )
-                    except (ConnectionException, ModbusIOException) as e:
-                        original_message = str(e)
-                        raise HomeAssistantError(f"Error writing multiple Modbus registers: {original_message}") from e
-                return resp
+                return await self.write_scheduler.submit(
+                    unit, address, regs_out, payload=payload, what="multiple Modbus registers"
+                )
             else:
                 return None
         else:
@@ -1331,34 +1829,18 @@ class SolaXModbusHub:
             res = False
         return res
 
-    def treat_address(self, data, regs, idx, descr, initval=0, advance=True):
-        return_value = None
-        read_scale = descr.read_scale  # read scale might still be wrong the first polling cycle
-        order32 = getattr(descr, "order32", None) or self.plugin.order32
+    def treat_address(self, data, regs, rec):
+        """Decode a STEP_LEGACY record: strings, word lists and units without a decoder. All fixed width
+        units are decoded by the block plan, see _compile_step."""
+        descr = rec.descr
+        idx = rec.idx
         val = None
         if self.cyclecount < VERBOSE_CYCLES:
             _LOGGER.debug(f"{self._name}: treating register 0x{descr.register:02x} : {descr.key}")
-        words_used = 0
         try:
-            if descr.unit == REGISTER_U16:
-                val = convert_from_registers(regs[idx : idx + 1], DataType.UINT16, self.plugin.order32)
-                words_used = 1
-            elif descr.unit == REGISTER_S16:
-                val = convert_from_registers(regs[idx : idx + 1], DataType.INT16, self.plugin.order32)
-                words_used = 1
-            elif descr.unit == REGISTER_U32:
-                val = convert_from_registers(regs[idx : idx + 2], DataType.UINT32, order32)
-                words_used = 2
-            elif descr.unit == REGISTER_F32:
-                val = convert_from_registers(regs[idx : idx + 2], DataType.FLOAT32, order32)
-                words_used = 2
-            elif descr.unit == REGISTER_S32:
-                val = convert_from_registers(regs[idx : idx + 2], DataType.INT32, order32)
-                words_used = 2
-            elif descr.unit == REGISTER_STR:
+            if descr.unit == REGISTER_STR:
                 wc = descr.wordcount or 0
                 raw = convert_from_registers(regs[idx : idx + wc], DataType.STRING, self.plugin.order32)
-                words_used = wc
                 val = raw.decode("ascii", errors="ignore") if isinstance(raw, (bytes, bytearray)) else str(raw)
             elif descr.unit == REGISTER_WORDS:
                 wc = descr.wordcount or 0
@@ -1366,32 +1848,9 @@ class SolaXModbusHub:
                     convert_from_registers(regs[idx + i : idx + i + 1], DataType.UINT16, self.plugin.order32)
                     for i in range(wc)
                 ]
-                words_used = wc
-            elif descr.unit == REGISTER_ULSB16MSB16:
-                lo = convert_from_registers(regs[idx : idx + 1], DataType.UINT16, order32)
-                hi = convert_from_registers(regs[idx + 1 : idx + 2], DataType.UINT16, order32)
-                val = (hi + lo * 65536) if order32 == "big" else (lo + hi * 65536)
-                words_used = 2
-            elif descr.unit == REGISTER_U8L:
-                if advance:
-                    base = convert_from_registers(regs[idx : idx + 1], DataType.UINT16, self.plugin.order32)
-                    words_used = 1
-                    val = base % 256
-                else:
-                    val = initval % 256
-                    words_used = 0
-            elif descr.unit == REGISTER_U8H:
-                if advance:
-                    base = convert_from_registers(regs[idx : idx + 1], DataType.UINT16, self.plugin.order32)
-                    words_used = 1
-                    val = base >> 8
-                else:
-                    val = initval >> 8
-                    words_used = 0
             else:
                 _LOGGER.warning(f"{self._name}: undefinded unit for entity {descr.key} - setting value to zero")
                 val = 0
-                words_used = 0
         except Exception as ex:
             if self.cyclecount < VERBOSE_CYCLES:
                 _LOGGER.warning(
@@ -1412,58 +1871,160 @@ class SolaXModbusHub:
                 self.tmpdata_expiry[descr.key] = 0 # update locals only once
         """
 
+        self._publish_value(data, rec, val)
+
+    def _scale_factor(self, descr):
+        """Combined numeric scale and read_scale of a descriptor, None for dict or callable scales."""
+        try:
+            return descr.scale * descr.read_scale
+        except Exception:
+            return None
+
+    def _value_bounds(self, descr):
+        """Plausibility bounds (min, max) for a decoded numeric value; None means unbounded."""
+        unit = descr.native_unit_of_measurement
+        if unit == UnitOfFrequency.HERTZ:
+            default_min, default_max = 20, 80
+        elif unit == PERCENTAGE:
+            default_min, default_max = 0, 100
+        elif unit == UnitOfTemperature.CELSIUS:
+            default_min, default_max = -100, 200
+        elif unit in (UnitOfPower.KILO_WATT, UnitOfElectricCurrent.AMPERE):
+            default_min, default_max = -self.inverterPowerKw * 2, +self.inverterPowerKw * 2
+        elif unit == UnitOfElectricPotential.VOLT:
+            default_min, default_max = 0, 2000
+        else:
+            default_min, default_max = None, None
+        return getattr(descr, "min_value", default_min), getattr(descr, "max_value", default_max)
+
+    def _publish_value(self, data, rec, val):
+        """Validate, scale and store a raw decoded value in data[rec.key]."""
+        key = rec.key
         # Plugin-level validation hook
         if self._validate_register_func is not None:
-            val = self._validate_register_func(descr, val, data)
+            val = self._validate_register_func(rec.descr, val, data)
 
         if val == None:  # E.g. if errors have occurred during readout
-            # _LOGGER.warning(f"****tmp*** treating {descr.key} failed")
             return_value = None
-        elif type(descr.scale) is dict:  # translate int to string
-            return_value = descr.scale.get(val, "Unknown")
-        elif callable(descr.scale):  # function to call ?
-            return_value = descr.scale(val, descr, data)
+        elif rec.scale_map is not None:  # translate int to string
+            return_value = rec.scale_map.get(val, "Unknown")
+        elif rec.scale_func is not None:  # function to call ?
+            return_value = rec.scale_func(val, rec.descr, data)
         else:  # apply simple numeric scaling and rounding if not a list of words
             try:
-                return_value = round(val * descr.scale * read_scale, descr.rounding)
+                return_value = round(val * rec.factor, rec.rounding)
             except:
                 return_value = val  # probably a REGISTER_WORDS instance
-            if descr.native_unit_of_measurement == UnitOfFrequency.HERTZ:
-                min_val = getattr(descr, "min_value", 20)
-                max_val = getattr(descr, "max_value", 80)
-            if descr.native_unit_of_measurement == PERCENTAGE:
-                min_val = getattr(descr, "min_value", 0)
-                max_val = getattr(descr, "max_value", 100)
-            elif descr.native_unit_of_measurement == UnitOfTemperature.CELSIUS:
-                min_val = getattr(descr, "min_value", -100)
-                max_val = getattr(descr, "max_value", 200)
-            elif descr.native_unit_of_measurement == UnitOfPower.KILO_WATT:
-                min_val = getattr(descr, "min_value", -self.inverterPowerKw * 2)
-                max_val = getattr(descr, "max_value", +self.inverterPowerKw * 2)
-            elif descr.native_unit_of_measurement == UnitOfElectricCurrent.AMPERE:
-                min_val = getattr(descr, "min_value", -self.inverterPowerKw * 2)
-                max_val = getattr(descr, "max_value", +self.inverterPowerKw * 2)
-            elif descr.native_unit_of_measurement == UnitOfElectricPotential.VOLT:
-                min_val = getattr(descr, "min_value", 0)
-                max_val = getattr(descr, "max_value", 2000)
-            else:
-                min_val = getattr(descr, "min_value", None)
-                max_val = getattr(descr, "max_value", None)
-
-            if min_val is not None and return_value < min_val:
-                raise ModbusIOException(f"Value {return_value} of '{descr.key}' lower than {min_val}")
-            if max_val is not None and return_value > max_val:
-                raise ModbusIOException(f"Value {return_value} of '{descr.key}' greater than {max_val}")
-        # if (descr.sleepmode != SLEEPMODE_LASTAWAKE) or self.awakeplugin(self.data): self.data[descr.key] = return_value
+            if rec.min_val is not None and return_value < rec.min_val:
+                raise ModbusIOException(f"Value {return_value} of '{key}' lower than {rec.min_val}")
+            if rec.max_val is not None and return_value > rec.max_val:
+                raise ModbusIOException(f"Value {return_value} of '{key}' greater than {rec.max_val}")
         if (
-            (self.tmpdata_expiry.get(descr.key, 0) == 0)
-            and ((descr.sleepmode != SLEEPMODE_LASTAWAKE) or self.plugin.isAwake(self.data))
+            (self.tmpdata_expiry.get(key, 0) == 0)
+            and (not rec.lastawake or self.plugin.isAwake(self.data))
             and (
-                self.localsLoaded or not descr.read_scale_exceptions
+                self.localsLoaded or not rec.read_scale_exceptions
             )  # ignore as long as read scale is not adapted; may delay real startup a bit
         ):
-            data[descr.key] = return_value  # case prevent_update number
-        return idx + (words_used if advance else 0)
+            if data.get(key, _UNSET) != return_value:
+                self.dirty_keys.add(key)
+            data[key] = return_value  # case prevent_update number
+
+    def _compile_step(self, idx, descr, advance=True):
+        """Resolve everything about a descriptor that does not change between polling cycles into a DecodeRecord."""
+        unit = descr.unit
+        order32 = getattr(descr, "order32", None) or self.plugin.order32
+        codec = _UNIT_STRUCTS.get(unit)
+        if codec is not None:
+            if codec.size == 4 and order32 == "little":
+                kind = STEP_STRUCT_SWAPPED
+            else:
+                kind = STEP_STRUCT
+            words_used = codec.size // 2
+        elif unit == REGISTER_U8L:
+            kind, words_used = STEP_U8L, (1 if advance else 0)
+        elif unit == REGISTER_U8H:
+            kind, words_used = STEP_U8H, (1 if advance else 0)
+        elif unit == REGISTER_ULSB16MSB16:
+            kind, codec, words_used = STEP_ULSB16MSB16, order32 == "big", 2
+        else:
+            kind = STEP_LEGACY
+            words_used = (descr.wordcount or 0) if unit in (REGISTER_STR, REGISTER_WORDS) else 0
+        return DecodeRecord(idx, kind, codec, words_used, descr, self._scale_factor(descr), *self._value_bounds(descr))
+
+    def _compile_block_plan(self, blk):
+        """Flatten a block into a list of decode steps, in the same order and at the same word offsets
+        as the register walk in async_read_modbus_block used to do it. All U16/S16/U32/S32/F32 steps
+        are collected into one bulk decoder for the block (see pymodbus_compat.BlockDecoder)."""
+        plan = []
+        idx = 0
+        for reg in blk.regs:
+            expected_idx = reg - blk.start
+            if idx < expected_idx:
+                idx = expected_idx
+            descr = blk.descriptions[reg]
+            if isinstance(descr, dict):  # REGISTER_U8L / _U8H pair sharing one 16 bit word
+                for d in descr.values():
+                    plan.append(self._compile_step(idx, d, advance=False))
+                idx += 1
+            else:
+                rec = self._compile_step(idx, descr)
+                plan.append(rec)
+                idx += rec.words
+        fields = []
+        for rec in plan:
+            if rec.kind in (STEP_STRUCT, STEP_STRUCT_SWAPPED):
+                descr = rec.descr
+                order32 = getattr(descr, "order32", None) or self.plugin.order32
+                rec.slot = len(fields)
+                fields.append((rec.idx, _UNIT_DATATYPES[descr.unit], order32))
+        blk.plan = plan
+        blk.decoder = compile_block_decoder(fields, blk.end - blk.start)
+
+    def _run_block_plan(self, data, blk, regs):
+        """Decode a block in one pass over the raw register buffer."""
+        raw = registers_to_bytes(regs)
+        verbose = self.cyclecount < VERBOSE_CYCLES
+        values = None
+        if blk.decoder is not None:
+            try:
+                values = blk.decoder.decode(regs, raw)
+            except Exception as ex:  # e.g. short response - fall back to decoding field by field
+                _LOGGER.debug(f"{self._name}: bulk decode of block 0x{blk.start:x} failed: {ex}")
+        for rec in blk.plan:
+            kind = rec.kind
+            if kind == STEP_LEGACY:
+                self.treat_address(data, regs, rec)
+                continue
+            if verbose:
+                _LOGGER.debug(f"{self._name}: treating register 0x{rec.register:02x} : {rec.key}")
+            val = None
+            slot = rec.slot
+            codec = rec.codec
+            offset = rec.idx * 2
+            try:
+                if slot is not None and values is not None:
+                    val = values[slot]
+                elif kind == STEP_STRUCT:
+                    val = codec.unpack_from(raw, offset)[0]
+                elif kind == STEP_STRUCT_SWAPPED:
+                    val = codec.unpack(raw[offset + 2 : offset + 4] + raw[offset : offset + 2])[0]
+                elif kind == STEP_U8L:
+                    val = _U16.unpack_from(raw, offset)[0] % 256
+                elif kind == STEP_U8H:
+                    val = _U16.unpack_from(raw, offset)[0] >> 8
+                else:  # STEP_ULSB16MSB16, codec holds the "big" word order flag
+                    lo, hi = _U16X2.unpack_from(raw, offset)
+                    val = (hi + lo * 65536) if codec else (lo + hi * 65536)
+            except Exception:
+                if verbose:
+                    _LOGGER.warning(
+                        f"{self._name}: read failed at 0x{rec.register:02x}: {rec.key}",
+                        exc_info=True,
+                    )
+                else:
+                    _LOGGER.warning(f"{self._name}: read failed at 0x{rec.register:02x}: {rec.key} ")
+            self._publish_value(data, rec, val)
 
     async def async_read_modbus_block(self, data, block, typ):
         errmsg = None
@@ -1471,6 +2032,7 @@ class SolaXModbusHub:
             _LOGGER.debug(
                 f"{self._name}: modbus {typ} block start: 0x{block.start:x} end: 0x{block.end:x}  len: {block.end - block.start} regs: {block.regs}"
             )
+        t0 = _mtime.monotonic()
         try:
             if typ == "input":
                 realtime_data = await self.async_read_input_registers(
@@ -1487,30 +2049,67 @@ class SolaXModbusHub:
         except Exception as ex:
             errmsg = f"exception {str(ex)} "
             _LOGGER.debug(f"{self._name}: exception reading {typ} {block.start} {errmsg}")
+            self.metrics.count("exceptions")
+            realtime_data = None
+        self.metrics.block_read(f"{typ} 0x{block.start:x}", _mtime.monotonic() - t0)
+        return self._apply_block_response(data, block, typ, realtime_data, errmsg)
+
+    ADAPTIVE_STABLE_READS = 3  # unchanged reads before the poll period of a block is doubled
+
+    def _adapt_block_rate(self, blk, regs):
+        """Stretch the poll period of a block while its registers stay the same, back to full speed on change."""
+        if regs == blk.last_regs:
+            blk.stable_reads += 1
+            if blk.stable_reads >= self.ADAPTIVE_STABLE_READS and blk.stride < blk.max_stride:
+                blk.stride = min(blk.stride * 2, blk.max_stride)
+                blk.stable_reads = 0
+                _LOGGER.debug(f"{self._name}: block 0x{blk.start:x} unchanged - reading every {blk.stride} cycles")
         else:
-            if realtime_data is None or realtime_data.isError():
-                errmsg = f"read_error "
+            blk.last_regs = regs
+            blk.stable_reads = 0
+            blk.stride = 1
+        blk.skip = blk.stride - 1
+
+    def _block_due(self, blk, typ):
+        """Return True if the block must be read in this cycle of its scan group."""
+        if typ == "holding" and blk.write_generation != self.write_generation:
+            blk.write_generation = self.write_generation  # something was written, read back at full speed
+            blk.stride = 1
+            blk.stable_reads = 0
+            blk.skip = 0
+            return True
+        if blk.skip > 0:
+            blk.skip -= 1
+            return False
+        return True
+
+    def _record_trace(self, block, typ, registers):
+        if self.trace.record(time(), typ, self._modbus_addr, block.start, block.end - block.start, registers):
+            self.trace.take()
+            self._trace_write = self._hass.async_add_executor_job(self.trace.write)
+            self._trace_write.add_done_callback(self._trace_written)
+
+    def _trace_written(self, future):
+        if not future.cancelled() and future.exception() is not None:
+            _LOGGER.warning(f"{self._name}: cannot write trace {self.trace.path}: {future.exception()}")
+
+    def _apply_block_response(self, data, block, typ, realtime_data, errmsg=None):
+        """Decode a block read response into data, or handle the failed read of that block."""
+        if errmsg is None and (realtime_data is None or realtime_data.isError()):
+            errmsg = f"read_error "
+        if self.trace is not None:
+            self._record_trace(block, typ, realtime_data.registers if errmsg is None else None)
         if errmsg == None:
-            regs = realtime_data.registers
-            idx = 0
-            for reg in block.regs:
-                expected_idx = reg - block.start
-                if idx < expected_idx:
-                    if self.cyclecount < 5 and expected_idx > idx:
-                        _LOGGER.debug(f"skipping bytes {(expected_idx - idx) * 2}")
-                    idx = expected_idx
-
-                descr = block.descriptions[reg]
-
-                if isinstance(descr, dict):
-                    base16 = convert_from_registers(regs[idx : idx + 1], DataType.UINT16, self.plugin.order32)
-                    for k in descr:
-                        self.treat_address(data, regs, idx, descr[k], initval=base16, advance=False)
-                    idx += 1
-                else:
-                    idx = self.treat_address(data, regs, idx, descr, initval=0, advance=True)
+            if block.max_stride > 1:
+                self._adapt_block_rate(block, realtime_data.registers)
+            if block.plan is None:
+                self._compile_block_plan(block)
+            t0 = _mtime.perf_counter()
+            self._run_block_plan(data, block, realtime_data.registers)
+            self.metrics.time("decode", _mtime.perf_counter() - t0)
             return True
         else:  # block read failure
+            self.metrics.count("read_errors")
             firstdescr = block.descriptions[block.start]  # check only first item in block
             _LOGGER.debug(
                 f"{self._name}: failed {typ} block {errmsg} start 0x{block.start:x} {firstdescr.key} ignore_readerror: {firstdescr.ignore_readerror}"
@@ -1531,10 +2130,14 @@ class SolaXModbusHub:
                         d_ignore = d.ignore_readerror
                         if (d_ignore is not True) and (d_ignore is not False):
                             _LOGGER.debug(f"{self._name}: returning static {k} = {d_ignore}")
+                            if data.get(k, _UNSET) != d_ignore:
+                                self.dirty_keys.add(k)
                             data[k] = d_ignore  # return something static
                         else:
                             if d_ignore is False:  # remove potentially faulty data
                                 popped = data.pop(k, None)  # added 20250716
+                                if popped is not None:
+                                    self.dirty_keys.add(k)
                                 _LOGGER.debug(f"{self._name}: popping {k} = {popped}")
                             else:
                                 _LOGGER.debug(f"{self._name}: not touching {k} ")
@@ -1547,7 +2150,117 @@ class SolaXModbusHub:
                     )
                 return False
 
+    async def async_read_modbus_blocks_pipelined(self, data, blocks):
+        """Read the blocks of one device group with up to pipeline_window requests in flight.
+        The hub lock is held during the burst, so writes and other groups still see one user of the
+        transport. Responses are applied strictly in block order; as in the serial loop, the first
+        failing block ends the group read and the remaining requests are cancelled. A transport error
+        starts a reconnect in the background; the failed block and the ones after it are then read
+        again one by one on the fresh connection.
+        When a request of higher priority waits for the bus (e.g. the fast scan group while a slow group
+        reads its settings), no further requests are sent: the ones in flight are applied, the lock is
+        given up and the remaining blocks are read in a new burst."""
+        if not await self._check_connection():
+            return False
+        retry_from = None
+        resume_from = None
+        yielding = False
+        preempted = getattr(self._lock, "preempted", None)  # only the bus lane knows about priorities
+        async with self._lock:
+            if getattr(self, "_stopping", False):
+                return False
+            if not self._client.connected:
+                return False
+            window = asyncio.Semaphore(self.pipeline_window)
+            kwargs = {ADDR_KW: self._modbus_addr} if self._modbus_addr is not None else {}
+            last_done = 0.0  # monotonic time of the last response of the burst
+
+            async def _fetch(block, typ):
+                nonlocal last_done
+                async with window:
+                    if yielding:
+                        return _PREEMPTED
+                    t0 = _mtime.monotonic()
+                    try:
+                        resp = await _request(block, typ)
+                    finally:
+                        t1 = _mtime.monotonic()
+                        self.metrics.block_read(f"{typ} 0x{block.start:x}", t1 - t0)
+                    if resp is not None and not resp.isError():
+                        # the device answers one request at a time: the cost of this one is the time since it
+                        # was sent or since the previous answer, whichever is later
+                        self._record_read_cost(block.end - block.start, t1 - max(t0, last_done))
+                    last_done = t1
+                    return resp
+
+            async def _request(block, typ):
+                _LOGGER.debug(
+                    f"{self._name}: READ {typ.upper()} (pipelined) {ADDR_KW}={self._modbus_addr} addr=0x{block.start:x} cnt={block.end - block.start}"
+                )
+                if typ == "input":
+                    return await self._client.read_input_registers(
+                        address=block.start, count=block.end - block.start, **kwargs
+                    )
+                return await self._client.read_holding_registers(
+                    address=block.start, count=block.end - block.start, **kwargs
+                )
+
+            tasks = [self._track_task(_fetch(block, typ)) for block, typ in blocks]
+            res = True
+            try:
+                for pos, (task, (block, typ)) in enumerate(zip(tasks, blocks)):
+                    errmsg = None
+                    realtime_data = None
+                    try:
+                        realtime_data = await task
+                        if realtime_data is _PREEMPTED:
+                            resume_from = pos
+                            break
+                    except ModbusException as ex:
+                        self.metrics.count("exceptions")
+                        if self.health.lost(self._name, str(ex)):
+                            self.metrics.count("reconnects")
+                        if not self.backoff.offline:
+                            _LOGGER.debug(
+                                f"{self._name}: Error: device: {self._modbus_addr} address: 0x{block.start:x} -> {ex!s} - retrying on a fresh connection"
+                            )
+                            retry_from = pos
+                            break
+                        errmsg = f"exception {str(ex)} "
+                        _LOGGER.error(f"Error: device: {self._modbus_addr} address: 0x{block.start:x} -> {ex!s}")
+                    except Exception as ex:
+                        errmsg = f"exception {str(ex)} "
+                        _LOGGER.debug(f"{self._name}: exception reading {typ} {block.start} {errmsg}")
+                        self.metrics.count("exceptions")
+                    res = self._apply_block_response(data, block, typ, realtime_data, errmsg)
+                    _LOGGER.debug(f"{self._name}: {typ} block 0x{block.start:x} read done (pipelined); new res: {res}")
+                    if not res:
+                        break
+                    if preempted is not None and not yielding and pos + 1 < len(blocks) and preempted():
+                        yielding = True  # requests not yet sent return _PREEMPTED
+                        self.metrics.count("preemptions")
+            finally:
+                for task in tasks:
+                    if not task.done():
+                        task.cancel()
+                    elif not task.cancelled():
+                        task.exception()  # retrieved, so unawaited failures are not logged as lost
+        if retry_from is not None:  # outside the lock: the reconnect runs in the background meanwhile
+            self.metrics.count("read_retries")
+            for block, typ in blocks[retry_from:]:
+                res = await self.async_read_modbus_block(data, block, typ)
+                if not res:
+                    break
+        elif resume_from is not None:  # the waiting request of higher priority got the bus meanwhile
+            _LOGGER.debug(f"{self._name}: pipelined read preempted, {len(blocks) - resume_from} blocks left")
+            if len(blocks) - resume_from > 1:
+                return await self.async_read_modbus_blocks_pipelined(data, blocks[resume_from:])
+            block, typ = blocks[resume_from]
+            return await self.async_read_modbus_block(data, block, typ)
+        return res
+
     async def async_read_modbus_registers_all(self, group):
+        group.fresh = False
         if group.readPreparation is not None:
             if not await group.readPreparation(self.data):
                 _LOGGER.info(f"{self._name}: device group read cancel")
@@ -1558,35 +2271,55 @@ class SolaXModbusHub:
         # data = {"_repeatUntil": self.data["_repeatUntil"]} # remove for issue #1440 but then does not recognize comm errors
         data = self.data  # is an alias, not a copy (issue #1440)
         res = True
-        for block in group.holdingBlocks:
-            _LOGGER.debug(f"{self._name}: ** trying to read holding block 0x{block.start:x} previous res:{res}")
-            res = res and await self.async_read_modbus_block(data, block, "holding")
-            _LOGGER.debug(f"{self._name}: holding block 0x{block.start:x} read done; new res: {res}")
-        for block in group.inputBlocks:
-            _LOGGER.debug(f"{self._name}: ** trying to read input block 0x{block.start:x} previous res: {res}")
-            res = res and await self.async_read_modbus_block(data, block, "input")
-            _LOGGER.debug(f"{self._name}: input block 0x{block.start:x} read done; new res: {res}")
-
-        if self.localsUpdated:
-            await self._hass.async_add_executor_job(self.saveLocalData)
-            self.plugin.localDataCallback(self)
-        if not self.localsLoaded:
-            await self._hass.async_add_executor_job(self.loadLocalData)
-        for key, descr in self.computedSensors.items():
+        holdingBlocks = [block for block in group.holdingBlocks if self._block_due(block, "holding")]
+        inputBlocks = [block for block in group.inputBlocks if self._block_due(block, "input")]
+        if self.pipeline_window > 1 and (len(holdingBlocks) + len(inputBlocks)) > 1:
+            res = await self.async_read_modbus_blocks_pipelined(
+                data,
+                [(block, "holding") for block in holdingBlocks] + [(block, "input") for block in inputBlocks],
+            )
+        else:
+            for block in holdingBlocks:
+                _LOGGER.debug(f"{self._name}: ** trying to read holding block 0x{block.start:x} previous res:{res}")
+                res = res and await self.async_read_modbus_block(data, block, "holding")
+                _LOGGER.debug(f"{self._name}: holding block 0x{block.start:x} read done; new res: {res}")
+            for block in inputBlocks:
+                _LOGGER.debug(f"{self._name}: ** trying to read input block 0x{block.start:x} previous res: {res}")
+                res = res and await self.async_read_modbus_block(data, block, "input")
+                _LOGGER.debug(f"{self._name}: input block 0x{block.start:x} read done; new res: {res}")
+
+        if self._hass is not None:  # None for an offline hub, see offline()
+            if self.localsUpdated:
+                await self._hass.async_add_executor_job(self.saveLocalData)
+                self.plugin.localDataCallback(self)
+            if not self.localsLoaded:
+                await self._hass.async_add_executor_job(self.loadLocalData)
+        now = time()
+        changed = set()  # computed keys whose value changed in this pass; publishing clears them from dirty_keys
+        for node in self._computed_graph():
+            key, descr = node.key, node.descr
+            if not self._computed_stale(node, data, changed):
+                continue
             # Do NOT call modbus_data_updated() from here Race Condition:it calls hub.rebuild_blocks() before async_add_entities is called.
-            data[key] = descr.value_function(0, descr, data)
+            val = node.value = descr.value_function(0, descr, data)
+            if data.get(key, _UNSET) != val:
+                self.dirty_keys.add(key)
+                changed.add(key)
+            data[key] = val
             sens = self.sensorEntities[key]
-            _LOGGER.debug(f"{self._name}: quickly updating state for computed sensor {sens} {key} {data[descr.key]} ")
-            if sens and (not descr.internal):
+            if sens and (not descr.internal) and self.should_publish(sens, now):
+                _LOGGER.debug(f"{self._name}: quickly updating state for computed sensor {sens} {key} {val} ")
                 try:
                     sens.modbus_data_updated()  # publish state to GUI and automations faster - assuming enabled, otherwise exception
                 except Exception:
+                    self.published.pop(key, None)  # not written, retry with the group fan-out
                     _LOGGER.debug(f"{self._name}: cannot send update for {key} - probably disabled ")
 
         if group.readFollowUp is not None:
             if not await group.readFollowUp(self.data, data):
                 _LOGGER.warning(f"device group check not success")
                 return True
+        group.fresh = res
 
         # for key, value in data.items(): # remove for issue #1440, but then does not recognize communication errors anymore
         #    self.data[key] = value # remove for issue #1440, but then comm errors are not detected
@@ -1678,6 +2411,7 @@ class SolaXModbusHub:
         end = 0
         blocks = []
         block_size = self.plugin.block_size
+        max_gap = self.max_gap
         auto_block_ignore_readerror = self.plugin.auto_block_ignore_readerror
         curblockregs = []
         for reg, descr in descriptions.items():
@@ -1715,7 +2449,8 @@ class SolaXModbusHub:
                 d_regtype = descr.register_type  # HOLDING or INPUT
 
             if d_enabled:
-                if d_newblock or ((reg - start) > block_size):
+                gap_split = max_gap is not None and end > start and (reg - end) > max_gap
+                if d_newblock or ((reg - start) > block_size) or gap_split:
                     if (end - start) > 0:
                         _LOGGER.debug(f"{self._name}: Starting new block at 0x{reg:x} ")
                         if (
@@ -1807,12 +2542,17 @@ class SolaXModbusHub:
                 hub_device_group.readFollowUp = device_group.readFollowUp
                 hub_device_group.holdingBlocks = self.splitInBlocks(holdingRegs)
                 hub_device_group.inputBlocks = self.splitInBlocks(inputRegs)
+                max_stride = max(1, self.adaptive_max_interval // interval) if interval > 0 else 1
                 # self.computedSensors = computedRegs # moved outside the loops
                 for i in hub_device_group.holdingBlocks:
+                    self._compile_block_plan(i)
+                    i.max_stride = max_stride
                     _LOGGER.debug(
                         f"{self._name} - interval {interval}s: adding holding block: {', '.join('0x{:x}'.format(num) for num in i.regs)}"
                     )
                 for i in hub_device_group.inputBlocks:
+                    self._compile_block_plan(i)
+                    i.max_stride = max_stride
                     _LOGGER.debug(
                         f"{self._name} - interval {interval}s: adding input block: {', '.join('0x{:x}'.format(num) for num in i.regs)}"
                     )
@@ -1832,14 +2572,36 @@ class SolaXModbusHub:
     async def _run_initial_bisect_for_all_groups(self):
         """Run a one-time bisect over all current blocks to discover unreadable entity bases.
         The result updates self.bad_recheck and schedules a delayed revalidation.
+        If the local data file holds a probe result for the same serial,
+        its bad_regs are applied and polling starts right away; only blocks that did not read fine in
+        that earlier probe are bisected before polling, the others are re-verified in the background.
         """
         import asyncio
         import time as _t
 
         bisect_start_time = _t.monotonic()
         bisect_timeout = 30.0  # Maximum 30 seconds for bisect to complete
+        deferred = []  # blocks known good from the probe cache, re-verified after polling has started
 
         try:
+            cache = await self._hass.async_add_executor_job(self.loadProbeCache)
+            if self._probe_cache_valid(cache):
+                self.probe_cache = cache
+                for typ in ("holding", "input"):
+                    cached_bad = set(cache["bad_regs"].get(typ, []))
+                    if cached_bad - self.bad_regs[typ]:
+                        self.bad_regs[typ] |= cached_bad
+                        self.blocks_changed = True
+                    self.bad_recheck[typ] |= cached_bad  # re-verified by _recheck_bad_after
+                if self.blocks_changed:  # leave the cached bad registers out before probing
+                    self.rebuild_blocks(self.initial_groups)
+                known_ok = {tuple(b) for b in cache.get("blocks", [])}
+                _LOGGER.info(
+                    f"{self._name}: using probe result of serial {cache['serial']} - bad registers {cache['bad_regs']}"
+                )
+            else:
+                known_ok = set()
+
             # If not online, postpone once to avoid mislabeling during startup flaps
             if not await self.is_online():
                 _LOGGER.debug(f"{self._name}: initial bisect postponed (offline)")
@@ -1850,28 +2612,21 @@ class SolaXModbusHub:
                     return
 
             # Walk through all currently built groups/blocks
-            for interval_group in self.groups.values():
-                # Check timeout periodically
-                if (_t.monotonic() - bisect_start_time) > bisect_timeout:
-                    _LOGGER.warning(
-                        f"{self._name}: initial bisect timeout after {bisect_timeout}s – enabling polling anyway"
-                    )
-                    self._probe_ready.set()
-                    return
-
-            for dev_group in list(interval_group.device_groups.values()):
-                # Check timeout before each block
-                if (_t.monotonic() - bisect_start_time) > bisect_timeout:
-                    _LOGGER.warning(
-                        f"{self._name}: initial bisect timeout after {bisect_timeout}s – enabling polling anyway"
-                    )
-                    self._probe_ready.set()
-                    return
-
-                for blk in getattr(dev_group, "holdingBlocks", []):
-                    await self._initial_bisect_block(blk, "holding")
-                for blk in getattr(dev_group, "inputBlocks", []):
-                    await self._initial_bisect_block(blk, "input")
+            for interval_group in list(self.groups.values()):
+                for dev_group in list(interval_group.device_groups.values()):
+                    for typ in ("holding", "input"):
+                        for blk in list(getattr(dev_group, f"{typ}Blocks", [])):
+                            if (typ, blk.start, blk.end) in known_ok:
+                                deferred.append((blk, typ))
+                                continue
+                            # Check timeout before each block
+                            if (_t.monotonic() - bisect_start_time) > bisect_timeout:
+                                _LOGGER.warning(
+                                    f"{self._name}: initial bisect timeout after {bisect_timeout}s – enabling polling anyway"
+                                )
+                                self._probe_ready.set()
+                                return
+                            await self._initial_bisect_block(blk, typ)
 
             # If no suspects were identified by the initial bisect, log that explicitly
             if not (self.bad_recheck["holding"] or self.bad_recheck["input"]):
@@ -1884,9 +2639,33 @@ class SolaXModbusHub:
             # Always set probe_ready on exception to avoid permanent blocking
             self._probe_ready.set()
 
+        if deferred:
+            _LOGGER.debug(f"{self._name}: re-verifying {len(deferred)} cached good blocks in the background")
+            for blk, typ in deferred:
+                if getattr(self, "_stopping", False):
+                    return
+                await self._initial_bisect_block(blk, typ)
+
         # Re-validate candidates after a short grace period
         self._recheck_task = self._hass.loop.create_task(self._recheck_bad_after(30))
 
+    def _probe_cache_valid(self, cache):
+        """A cached probe result applies to the same inverter serial. The firmware is not known before the
+        first poll, so a firmware update is not detected here; the cached bad registers and known good
+        blocks are re-verified after polling has started."""
+        if not isinstance(cache, dict) or not isinstance(cache.get("bad_regs"), dict):
+            return False
+        return cache.get("serial") == self.seriesnumber
+
+    def _store_probe_result(self):
+        """Remember the verified probe result for the next start."""
+        self.probe_cache = {
+            "serial": self.seriesnumber,
+            "bad_regs": {typ: sorted(regs) for typ, regs in self.bad_regs.items()},
+            "blocks": sorted(self.probe_ok_blocks),
+        }
+        self.request_local_save()
+
     async def _initial_bisect_block(self, block_obj, typ):
         """Bisect a block once at startup. Operates on *entity bases* only, so multi-register
         entities (U32/STR/WORDS) are never split apart. No value decoding happens here."""
@@ -1902,6 +2681,8 @@ class SolaXModbusHub:
         list into halves and probe recursively until single-entity blocks are found.
         Single-entity failures are added to bad_recheck (not yet definitive)."""
         if await self._probe_block(block_obj, typ):
+            if depth == 0:
+                self.probe_ok_blocks.add((typ, block_obj.start, block_obj.end))
             return True
 
         # Avoid false positives when transport is down / slowed
@@ -1973,6 +2754,9 @@ class SolaXModbusHub:
 
                 if ok:
                     self.bad_recheck[typ].discard(addr)
+                    if addr in self.bad_regs[typ]:  # from the probe cache
+                        self.bad_regs[typ].discard(addr)
+                        self.blocks_changed = True
                     _LOGGER.info(f"{self._name}: entity base 0x{addr:x} ({typ}) recovered on recheck")
                 else:
                     self.bad_regs[typ].add(addr)
@@ -1985,6 +2769,7 @@ class SolaXModbusHub:
             self.blocks_changed = True
         else:
             _LOGGER.info(f"{self._name}: no bad registers confirmed on recheck.")
+        self._store_probe_result()
 
     def _entity_span_end(self, desc_map, base_reg):
         """Compute end address (exclusive) for a single entity starting at base_reg based on its unit.
@@ -2172,9 +2957,12 @@ class SolaXCoreModbusHub(SolaXModbusHub, CoreModbusHub):
                 return None
             async with hub._lock:
                 try:
+                    t0 = _mtime.monotonic()
                     resp = await self._track_task(
                         hub._client.read_holding_registers(address=address, count=count, **kwargs)
                     )
+                    if resp is not None and not resp.isError():
+                        self._record_read_cost(count, _mtime.monotonic() - t0)
                 except (ConnectionException, ModbusIOException) as e:
                     original_message = str(e)
                     raise HomeAssistantError(f"Error reading Modbus holding registers: {original_message}") from e
@@ -2194,9 +2982,12 @@ class SolaXCoreModbusHub(SolaXModbusHub, CoreModbusHub):
                 return None
             async with hub._lock:
                 try:
+                    t0 = _mtime.monotonic()
                     resp = await self._track_task(
                         hub._client.read_input_registers(address=address, count=count, **kwargs)
                     )
+                    if resp is not None and not resp.isError():
+                        self._record_read_cost(count, _mtime.monotonic() - t0)
                 except (ConnectionException, ModbusIOException) as e:
                     original_message = str(e)
                     raise HomeAssistantError(f"Error reading Modbus input registers: {original_message}") from e
@@ -2208,6 +2999,7 @@ class SolaXCoreModbusHub(SolaXModbusHub, CoreModbusHub):
         """
         Write a single register using the Core hub's client.
         """
+        self.write_generation += 1  # adaptive polling: read holding blocks back at full speed
         regs = convert_to_registers(int(payload), DataType.INT16, self.plugin.order32)
         kwargs = {ADDR_KW: unit} if unit is not None else {}
         if getattr(self, "_stopping", False):
@@ -2237,6 +3029,7 @@ class SolaXCoreModbusHub(SolaXModbusHub, CoreModbusHub):
 
     async def async_write_registers_single(self, unit, address, payload):  # Needs adapting for register queue
         """Write registers multi, but write only one register of type 16bit"""
+        self.write_generation += 1  # adaptive polling: read holding blocks back at full speed
         regs = convert_to_registers(int(payload), DataType.INT16, self.plugin.order32)
         kwargs = {ADDR_KW: unit} if unit is not None else {}
         async with self._lock:
@@ -2267,6 +3060,7 @@ class SolaXCoreModbusHub(SolaXModbusHub, CoreModbusHub):
         All register descriptions referenced in the payload must be consecutive (without leaving holes)
         32bit integers will be converted to 2 modbus register values according to the endian strategy of the plugin
         """
+        self.write_generation += 1  # adaptive polling: read holding blocks back at full speed
         kwargs = {ADDR_KW: unit} if unit is not None else {}
         if isinstance(payload, list):
             regs_out = []
@@ -0,0 +1,49 @@
+"""Exponential backoff of the polling of a device that stopped answering (e.g. an inverter asleep at night).
+
+While a hub backs off, its scan groups skip their cycles until the next attempt is due. An attempt is
+a liveness probe of a single register instead of the full block reads of a cycle; as soon as the probe
+is answered, the hub resumes normal polling in the same cycle.
+"""
+
+import random
+
+BACKOFF_FACTOR = 2
+BACKOFF_JITTER = 0.2  # +-20%, so that hubs on a shared bus do not probe in lockstep
+BACKOFF_MAX = 300  # seconds between attempts at most
+
+
+class Backoff:
+    """Attempt schedule of one hub: the first retry after one scan interval, then doubling up to BACKOFF_MAX."""
+
+    __slots__ = ("failures", "delay", "next_attempt", "failed_at")
+
+    def __init__(self):
+        self.failures = 0
+        self.delay = 0.0
+        self.next_attempt = 0.0  # monotonic time
+        self.failed_at = None  # monotonic time of the last counted failure
+
+    @property
+    def offline(self):
+        return self.failures > 0
+
+    def due(self, now):
+        return now >= self.next_attempt
+
+    def failed(self, base, now, started=None):
+        """Record a failed attempt; base is the shortest scan interval of the hub in seconds. Scan groups
+        polled at the same time fail together: with started (the monotonic start of the attempt), a failure
+        that was already counted since then is not counted again."""
+        if started is not None and self.failed_at is not None and self.failed_at >= started:
+            return
+        self.failed_at = now
+        self.failures += 1
+        delay = min(BACKOFF_MAX, max(1, base) * BACKOFF_FACTOR ** min(self.failures - 1, 16))
+        self.delay = delay * random.uniform(1 - BACKOFF_JITTER, 1 + BACKOFF_JITTER)
+        self.next_attempt = now + self.delay
+
+    def succeeded(self):
+        self.failed_at = None
+        self.failures = 0
+        self.delay = 0.0
+        self.next_attempt = 0.0
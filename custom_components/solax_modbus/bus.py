@@ -0,0 +1,208 @@
+"""Shared Modbus transport for hubs on the same serial port or TCP gateway.
+
+Hubs whose configuration points at the same serial port or the same host:port (e.g. an inverter and an
+EV charger on one RS485 bus, or parallel inverters behind one RTU-over-TCP gateway) share one pymodbus
+client. Each hub gets a BusLane that it uses as its lock (async with hub._lock), so requests of all hubs
+on the bus are serialized by one arbiter instead of colliding on the wire.
+
+When the bus is busy, waiting requests are served by priority: writes first, then the read cycles of the
+scan groups, shortest interval first, then background work such as probing. Among requests of the same
+priority the hub that used the bus for the shortest time so far goes first. A long burst of requests
+(pipelined block reads) checks preempted() between its requests and gives the bus up when a request of
+higher priority is waiting. Waiting and holding times are counted per priority class (see as_dict).
+"""
+
+import asyncio
+import contextvars
+import heapq
+import itertools
+import logging
+import time
+
+from .connection import IDLE_TIMEOUT, ConnectionHealth
+
+_LOGGER = logging.getLogger(__name__)
+
+PRIO_WRITE = 0.0
+PRIO_BACKGROUND = 1e6  # initial probing, rechecks and anything else that did not set a priority
+# Lower values are served first; the polling cycle of a scan group sets its interval in seconds.
+bus_priority = contextvars.ContextVar("solax_modbus_bus_priority", default=PRIO_BACKGROUND)
+
+_buses = {}  # bus key -> SharedBus
+
+
+def bus_key(interface, host=None, port=None, tcp_type=None, serial_port=None):
+    """Return the key of the physical bus of a hub configuration, None if it cannot be shared."""
+    if interface == "serial":
+        return ("serial", serial_port)
+    if interface == "tcp":
+        return ("tcp", str(host).lower(), int(port), tcp_type or "tcp")
+    return None
+
+
+def priority_name(priority):
+    if priority == PRIO_WRITE:
+        return "write"
+    if priority >= PRIO_BACKGROUND:
+        return "background"
+    return f"{priority:g}s"
+
+
+class PriorityStats:
+    """Requests, waiting and holding time of one priority class on a bus."""
+
+    __slots__ = ("requests", "waited", "max_wait", "busy")
+
+    def __init__(self):
+        self.requests = 0
+        self.waited = 0.0
+        self.max_wait = 0.0
+        self.busy = 0.0
+
+    def as_dict(self):
+        return {
+            "requests": self.requests,
+            "waited_s": round(self.waited, 3),
+            "max_wait_s": round(self.max_wait, 3),
+            "busy_s": round(self.busy, 3),
+        }
+
+
+class BusLane:
+    """The view of one hub on a shared bus, used like an asyncio.Lock. Counts the requests of the hub,
+    the time it held the bus and the time it waited for it."""
+
+    def __init__(self, bus, name):
+        self.bus = bus
+        self.name = name
+        self.requests = 0
+        self.busy = 0.0  # seconds holding the bus
+        self.waited = 0.0  # seconds waiting for the bus
+
+    def locked(self):
+        return self.bus.holder is not None
+
+    async def acquire(self):
+        await self.bus.acquire(self, bus_priority.get())
+        return True
+
+    def release(self):
+        self.bus.release(self)
+
+    def preempted(self):
+        """True if a request of higher priority than the current holder's is waiting for the bus."""
+        return self.bus.preempted()
+
+    async def __aenter__(self):
+        await self.acquire()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.release()
+
+    def as_dict(self):
+        return {"requests": self.requests, "busy_s": round(self.busy, 3), "waited_s": round(self.waited, 3)}
+
+
+class SharedBus:
+    """One client and the priority arbiter of the hubs using it."""
+
+    def __init__(self, key, client, params):
+        self.key = key
+        self.client = client
+        self.params = params  # connection parameters of the hub that opened the bus
+        self.health = ConnectionHealth(client, IDLE_TIMEOUT if key[0] == "tcp" else None)
+        self.lanes = []
+        self.holder = None
+        self._held_since = 0.0
+        self._holder_priority = PRIO_BACKGROUND
+        self._waiters = []  # heap of (priority, busy, seq, future, lane, enqueued)
+        self._seq = itertools.count()
+        self.priorities = {}  # priority -> PriorityStats
+
+    async def acquire(self, lane, priority):
+        if self.holder is None and not self._waiters:
+            self._grant(lane, priority, 0.0)
+            return
+        enqueued = time.monotonic()
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, lane.busy, next(self._seq), future, lane, enqueued))
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():  # granted while being cancelled: pass it on
+                self.release(lane)
+            raise
+
+    def _grant(self, lane, priority, waited):
+        self.holder = lane
+        self._held_since = time.monotonic()
+        self._holder_priority = priority
+        lane.requests += 1
+        lane.waited += waited
+        stats = self.priorities.get(priority)
+        if stats is None:
+            stats = self.priorities[priority] = PriorityStats()
+        stats.requests += 1
+        stats.waited += waited
+        if waited > stats.max_wait:
+            stats.max_wait = waited
+
+    def release(self, lane):
+        now = time.monotonic()
+        if self.holder is not None:
+            held = now - self._held_since
+            self.holder.busy += held
+            self.priorities[self._holder_priority].busy += held
+        self.holder = None
+        while self._waiters:
+            prio, _busy, _seq, future, waiter, enqueued = heapq.heappop(self._waiters)
+            if future.done():  # waiter was cancelled
+                continue
+            self._grant(waiter, prio, now - enqueued)
+            future.set_result(True)
+            return
+
+    def preempted(self):
+        for prio, _busy, _seq, future, _lane, _enqueued in self._waiters:  # short list, cancelled ones skipped
+            if not future.done() and prio < self._holder_priority:
+                return True
+        return False
+
+    def as_dict(self):
+        """Statistics per priority class, highest priority first."""
+        return {priority_name(prio): self.priorities[prio].as_dict() for prio in sorted(self.priorities)}
+
+    def sole_user(self, lane):
+        return self.lanes == [lane]
+
+
+def attach(key, name, params, client_factory):
+    """Return the lane of hub name on the bus key, opening the bus with client_factory() if it is new."""
+    bus = _buses.get(key)
+    if bus is None:
+        bus = _buses[key] = SharedBus(key, client_factory(), params)
+    else:
+        if params != bus.params:
+            _LOGGER.warning(
+                f"{name}: shares the bus {key} with {[lane.name for lane in bus.lanes]}, "
+                f"using their connection parameters {bus.params} instead of {params}"
+            )
+        else:
+            _LOGGER.info(f"{name}: sharing the bus {key} with {[lane.name for lane in bus.lanes]}")
+    lane = BusLane(bus, name)
+    bus.lanes.append(lane)
+    return lane
+
+
+def detach(lane):
+    """Remove a lane from its bus; returns True if it was the last one and the client should be closed."""
+    bus = lane.bus
+    if lane in bus.lanes:
+        bus.lanes.remove(lane)
+    bus.health.gaps.pop(lane.name, None)
+    if bus.lanes:
+        return False
+    if _buses.get(bus.key) is bus:
+        del _buses[bus.key]
+    bus.health.close()
+    return True
@@ -33,6 +33,8 @@ from homeassistant.helpers.schema_config_entry_flow import (
 )
 
 from .const import (
+    CONF_ADAPTIVE_MAX_INTERVAL,
+    CONF_BATTERY_PACKS_PER_CYCLE,
     CONF_BAUDRATE,
     CONF_CORE_HUB,
     CONF_ENERGY_DASHBOARD_DEVICE,
@@ -40,6 +42,7 @@ from .const import (
     CONF_INVERTER_NAME_SUFFIX,
     CONF_INVERTER_POWER_KW,
     CONF_MODBUS_ADDR,
+    CONF_PIPELINE_WINDOW,
     CONF_PLUGIN,
     CONF_READ_BATTERY,
     CONF_READ_DCB,
@@ -47,17 +50,22 @@ from .const import (
     CONF_READ_PM,
     CONF_SCAN_INTERVAL_FAST,
     CONF_SCAN_INTERVAL_MEDIUM,
+    CONF_RIEMANN_WRITE_INTERVAL,
     CONF_SERIAL_PORT,
     CONF_TCP_TYPE,
     CONF_TIME_OUT,
+    DEFAULT_ADAPTIVE_MAX_INTERVAL,
+    DEFAULT_BATTERY_PACKS_PER_CYCLE,
     DEFAULT_BAUDRATE,
     DEFAULT_ENERGY_DASHBOARD_DEVICE,
+    DEFAULT_RIEMANN_WRITE_INTERVAL,
     # PLUGIN_PATH_OLDSTYLE,
     DEFAULT_INTERFACE,
     DEFAULT_INVERTER_NAME_SUFFIX,
     DEFAULT_INVERTER_POWER_KW,
     DEFAULT_MODBUS_ADDR,
     DEFAULT_NAME,
+    DEFAULT_PIPELINE_WINDOW,
     DEFAULT_PLUGIN,
     DEFAULT_PORT,
     DEFAULT_READ_BATTERY,
@@ -133,6 +141,8 @@ CONFIG_SCHEMA = vol.Schema(
         vol.Required(CONF_SCAN_INTERVAL, default=DEFAULT_SCAN_INTERVAL): int,
         vol.Optional(CONF_SCAN_INTERVAL_MEDIUM, default=DEFAULT_SCAN_INTERVAL): int,
         vol.Optional(CONF_SCAN_INTERVAL_FAST, default=DEFAULT_SCAN_INTERVAL): int,
+        vol.Optional(CONF_ADAPTIVE_MAX_INTERVAL, default=DEFAULT_ADAPTIVE_MAX_INTERVAL): cv.positive_int,
+        vol.Optional(CONF_RIEMANN_WRITE_INTERVAL, default=DEFAULT_RIEMANN_WRITE_INTERVAL): cv.positive_int,
         vol.Optional(CONF_INVERTER_NAME_SUFFIX, description={"suggested_value": DEFAULT_INVERTER_NAME_SUFFIX}): str,
         vol.Optional(CONF_INVERTER_POWER_KW, default=DEFAULT_INVERTER_POWER_KW): cv.positive_int,
         vol.Optional(CONF_ENERGY_DASHBOARD_DEVICE, default=DEFAULT_ENERGY_DASHBOARD_DEVICE): bool,
@@ -155,6 +165,8 @@ OPTION_SCHEMA = vol.Schema(
         vol.Required(CONF_SCAN_INTERVAL, default=DEFAULT_SCAN_INTERVAL): int,
         vol.Optional(CONF_SCAN_INTERVAL_MEDIUM, default=DEFAULT_SCAN_INTERVAL): int,
         vol.Optional(CONF_SCAN_INTERVAL_FAST, default=DEFAULT_SCAN_INTERVAL): int,
+        vol.Optional(CONF_ADAPTIVE_MAX_INTERVAL, default=DEFAULT_ADAPTIVE_MAX_INTERVAL): cv.positive_int,
+        vol.Optional(CONF_RIEMANN_WRITE_INTERVAL, default=DEFAULT_RIEMANN_WRITE_INTERVAL): cv.positive_int,
         vol.Optional(CONF_INVERTER_NAME_SUFFIX): str,
         vol.Optional(CONF_INVERTER_POWER_KW, default=DEFAULT_INVERTER_POWER_KW): cv.positive_int,
         vol.Optional(CONF_ENERGY_DASHBOARD_DEVICE, default=DEFAULT_ENERGY_DASHBOARD_DEVICE): bool,
@@ -181,6 +193,7 @@ TCP_SCHEMA = vol.Schema(
         vol.Required(CONF_TCP_TYPE, default=DEFAULT_TCP_TYPE): selector.SelectSelector(
             selector.SelectSelectorConfig(options=TCP_TYPES),
         ),
+        vol.Optional(CONF_PIPELINE_WINDOW, default=DEFAULT_PIPELINE_WINDOW): vol.All(int, vol.Range(min=1, max=8)),
     }
 )
 
@@ -195,6 +208,7 @@ CORE_SCHEMA = vol.Schema(
 BATTERY_SCHEMA = vol.Schema(
     {
         vol.Optional(CONF_READ_BATTERY, default=DEFAULT_READ_BATTERY): bool,
+        vol.Optional(CONF_BATTERY_PACKS_PER_CYCLE, default=DEFAULT_BATTERY_PACKS_PER_CYCLE): cv.positive_int,
     }
 )
 
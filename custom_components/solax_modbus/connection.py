@@ -0,0 +1,132 @@
+"""Health of a Modbus client connection and its reconnection in the background.
+
+WiFi dongles and RS485-to-Ethernet gateways (e.g. Waveshare) close idle sockets without notice; the next
+request on such a half-open socket only fails after the full timeout. Every client therefore gets:
+- TCP keepalive on its socket, so the kernel detects a dead peer between polls
+- idle tracking where keepalive is not available: a TCP socket without a successful exchange for
+  IDLE_TIMEOUT seconds more than the longest expected gap between polls (slowest scan group or backoff
+  delay of the hubs using it) is reconnected before the next request instead of being used
+- reconnection in a background task, outside the request lock. Requests wait for it with ready()
+  before they take the lock; a request that failed with a transport error is retried once afterwards.
+"""
+
+import asyncio
+import logging
+import socket
+import time
+
+from .pymodbus_compat import transport_socket
+
+_LOGGER = logging.getLogger(__name__)
+
+IDLE_TIMEOUT = 60  # seconds of silence beyond the expected poll gap before a TCP socket is no longer trusted
+RECONNECT_PAUSE = 0.2  # seconds between close and connect, late frames of the old socket are dropped with it
+KEEPALIVE_IDLE = 20  # seconds of silence before the first keepalive probe
+KEEPALIVE_INTERVAL = 5  # seconds between keepalive probes
+KEEPALIVE_COUNT = 3  # unanswered probes before the kernel drops the connection
+
+
+def enable_keepalive(client):
+    """Switch on TCP keepalive for the socket of a connected client; False if there is no TCP socket."""
+    sock = transport_socket(client)
+    if sock is None or sock.family not in (socket.AF_INET, socket.AF_INET6):
+        return False
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        for option, value in (
+            ("TCP_KEEPIDLE", KEEPALIVE_IDLE),
+            ("TCP_KEEPINTVL", KEEPALIVE_INTERVAL),
+            ("TCP_KEEPCNT", KEEPALIVE_COUNT),
+        ):
+            if hasattr(socket, option):  # not available on every platform
+                sock.setsockopt(socket.IPPROTO_TCP, getattr(socket, option), value)
+    except OSError as ex:
+        _LOGGER.debug(f"cannot enable keepalive: {ex}")
+        return False
+    return True
+
+
+class ConnectionHealth:
+    """Liveness of one pymodbus client, shared by all hubs using the client (see bus.py)."""
+
+    def __init__(self, client, idle_timeout=None):
+        self.client = client
+        self.idle_timeout = idle_timeout  # None: no idle tracking (serial)
+        self.gaps = {}  # hub name -> longest expected time between its requests in seconds
+        self.last_ok = 0.0  # monotonic time of the last successful exchange, 0: none yet
+        self.reconnects = 0
+        self.keepalive = False
+        self._task = None
+
+    @property
+    def reconnecting(self):
+        return self._task is not None and not self._task.done()
+
+    def ok(self):
+        """Record a successful exchange."""
+        self.last_ok = time.monotonic()
+
+    def expect_gap(self, name, seconds):
+        """Declare the longest time hub name may leave the client unused, e.g. its slowest scan interval."""
+        self.gaps[name] = seconds
+
+    def idle(self, now):
+        """True if the socket has been silent for longer than polling explains. Not checked with keepalive:
+        the kernel detects a dead peer then, and reconnecting before every slow poll only churns the dongle."""
+        if self.idle_timeout is None or self.keepalive or self.last_ok <= 0:
+            return False
+        return now - self.last_ok > self.idle_timeout + max(self.gaps.values(), default=0)
+
+    def lost(self, name, reason):
+        """Start reconnecting in the background; False if a reconnection is already running."""
+        if self.reconnecting:
+            return False
+        _LOGGER.debug(f"{name}: reconnecting in the background ({reason})")
+        self._task = asyncio.create_task(self._reconnect(name))
+        return True
+
+    async def ready(self, name, busy=False):
+        """Wait until the client can be used; returns False if it is still not connected.
+        Called before taking the request lock. An idle socket is only replaced when nobody is using
+        the client (busy is False), as closing it would break the request in flight."""
+        if not self.reconnecting:
+            if not self.client.connected:
+                self.lost(name, "not connected")
+            elif not busy and self.idle(time.monotonic()):
+                self.lost(name, f"idle for more than {self.idle_timeout}s")
+        if self._task is not None:
+            try:
+                await asyncio.shield(self._task)
+            except Exception:
+                pass  # logged by _reconnect
+        return self.client.connected
+
+    async def _reconnect(self, name):
+        self.reconnects += 1
+        try:
+            self.client.close()
+        except Exception:
+            pass
+        await asyncio.sleep(RECONNECT_PAUSE)
+        try:
+            await self.client.connect()
+        except Exception as ex:
+            _LOGGER.debug(f"{name}: reconnect failed: {ex}")
+        if self.client.connected:
+            self.keepalive = enable_keepalive(self.client)
+            self.last_ok = time.monotonic()  # a fresh socket starts its idle time now
+        else:
+            _LOGGER.debug(f"{name}: reconnect failed, the device is not reachable")
+
+    def close(self):
+        if self.reconnecting:
+            self._task.cancel()
+        self._task = None
+
+    def as_dict(self):
+        return {
+            "connected": bool(self.client.connected),
+            "reconnects": self.reconnects,
+            "keepalive": self.keepalive,
+            "idle_s": round(time.monotonic() - self.last_ok, 1) if self.last_ok else None,
+        }
@@ -61,6 +61,7 @@ DEFAULT_MODBUS_ADDR = 1
 DEFAULT_TCP_TYPE = "tcp"
 CONF_TCP_TYPE = "tcp_type"
 TMPDATA_EXPIRY = 120  # seconds before temp entities return to modbus value
+STATE_HEARTBEAT = 300  # max. seconds without a state write for a sensor whose value did not change
 CONF_INVERTER_NAME_SUFFIX = "inverter_name_suffix"
 CONF_INVERTER_POWER_KW = "inverter_power_kw"
 CONF_READ_EPS = "read_eps"
@@ -103,6 +104,14 @@ SCAN_GROUP_FAST = CONF_SCAN_INTERVAL_FAST  # fast scanning (power,...)
 SCAN_GROUP_AUTO = "auto"  # _MEDIUM for temperatures, frequency and energy (kWh), otherwise _DEFAULT
 CONF_TIME_OUT = "time_out"
 DEFAULT_TIME_OUT = 5
+CONF_PIPELINE_WINDOW = "pipeline_window"  # max. concurrent block requests, plain Modbus TCP only
+DEFAULT_PIPELINE_WINDOW = 1  # 1: strictly one request at a time (no pipelining)
+CONF_ADAPTIVE_MAX_INTERVAL = "adaptive_max_interval"  # upper bound (s) for the poll period of unchanging blocks
+DEFAULT_ADAPTIVE_MAX_INTERVAL = 0  # 0: adaptive polling off, every block is read at its scan interval
+CONF_RIEMANN_WRITE_INTERVAL = "riemann_write_interval"  # min. seconds between state writes of Riemann sum sensors
+DEFAULT_RIEMANN_WRITE_INTERVAL = 0  # 0: write the state on every poll
+CONF_BATTERY_PACKS_PER_CYCLE = "battery_packs_per_cycle"  # multiplexed battery packs read per polling cycle
+DEFAULT_BATTERY_PACKS_PER_CYCLE = 1  # 0: all packs in every cycle
 
 # ================================= Button autorepeat initval codes for button value_functions ==========================
 BUTTONREPEAT_FIRST = 0  # first manual trigger click
@@ -143,6 +152,17 @@ class base_battery_config:
         self.battery_sensor_key_prefix: str | None = None
 
 
+@dataclass
+class DetectionProbe:
+    """One candidate read for the type detection of a plugin, see SolaXModbusHub.async_run_detection_probes."""
+
+    name: str  # stable identifier, persisted as the probe that answered at the last start
+    register: int
+    count: int = 7
+    register_type: int = REG_HOLDING
+    decode: callable = None  # value = decode(registers); a falsy value or an exception means no match
+
+
 @dataclass
 class plugin_base:
     plugin_name: str
@@ -153,6 +173,7 @@ class plugin_base:
     SELECT_TYPES: list[SelectEntityDescription]
     SWITCH_TYPES: list[SwitchEntityDescription]
     BATTERY_CONFIG: base_battery_config | None = None
+    DETECTION_PROBES: list[DetectionProbe] | None = None  # candidate reads for async_determineInverterType
     block_size: int = 100
     auto_block_ignore_readerror: bool | None = (
         None  # if True or False, inserts a ignore_readerror statement for each block
@@ -230,6 +251,10 @@ class BaseModbusSensorEntityDescription(SensorEntityDescription):
     min_value: int = None
     max_value: int = None
     depends_on: list = None  # list of modbus register keys that must be read
+    # computed sensors: True if value_function reads nothing but the hub.data keys in depends_on, so that the hub
+    # evaluates it only when one of them changed; otherwise it is evaluated in every cycle
+    depends_on_complete: bool = False
+    deadband: float = None  # numeric values: only write a new state when it moved more than this since the last write
 
 
 @dataclass
@@ -0,0 +1,49 @@
+"""Diagnostics download for a SolaX Modbus hub: configuration, block layout and hub.metrics."""
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.const import CONF_HOST, CONF_NAME
+
+from .const import DOMAIN
+
+TO_REDACT = {CONF_HOST}
+
+
+def _blocks(group):
+    return {
+        typ: [
+            {"start": f"0x{blk.start:x}", "end": f"0x{blk.end:x}", "stride": blk.stride}
+            for blk in getattr(group, f"{typ}Blocks", [])
+        ]
+        for typ in ("holding", "input")
+    }
+
+
+async def async_get_config_entry_diagnostics(hass, entry):
+    """Return diagnostics for a config entry."""
+    name = entry.options.get(CONF_NAME) or entry.data.get(CONF_NAME)
+    hub = hass.data.get(DOMAIN, {}).get(name, {}).get("hub")
+    diag = {"options": async_redact_data(dict(entry.options), TO_REDACT)}
+    if hub is None:
+        return diag
+    diag["hub"] = {
+        "plugin": hub.plugin.plugin_name,
+        "invertertype": hub.invertertype,
+        "cyclecount": hub.cyclecount,
+        "slowdown": hub.slowdown,
+        "backoff_s": round(hub.backoff.delay, 1),
+        "pipeline_window": hub.pipeline_window,
+        "max_gap": hub.max_gap,
+        "bad_regs": {typ: [f"0x{reg:x}" for reg in sorted(regs)] for typ, regs in hub.bad_regs.items()},
+        "groups": {
+            str(interval): {device: _blocks(group) for device, group in interval_group.device_groups.items()}
+            for interval, interval_group in hub.groups.items()
+        },
+    }
+    diag["metrics"] = hub.metrics.as_dict()
+    if hub.pack_scheduler.refreshed:
+        diag["battery_packs"] = hub.pack_scheduler.as_dict()
+    if hub._lane is not None:
+        diag["bus"] = {lane.name: lane.as_dict() for lane in hub._lane.bus.lanes}
+        diag["connection"] = hub._lane.bus.health.as_dict()
+        diag["bus_priorities"] = hub._lane.bus.as_dict()
+    return diag
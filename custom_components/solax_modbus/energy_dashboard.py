@@ -13,6 +13,7 @@ handle:
 """
 
 import logging
+import math
 import time
 from dataclasses import dataclass
 from typing import Callable, Optional
@@ -670,43 +671,111 @@ def _needs_aggregation(target_key):
     )
 
 
+class ParallelGroup:
+    """Contributions of the inverters of one parallel system to the aggregated "All" sensors of the Master.
+
+    Every member publishes its own values when it finishes a poll cycle. A total is summed again
+    (math.fsum) when a contribution changed, so reading an aggregated value is a dict lookup and a
+    member that did not report leaves its last contribution in place. When the Master leaves (unload),
+    the group is dropped and the Slaves are detached.
+    """
+
+    def __init__(self, master_name):
+        self.master_name = master_name
+        self.members = {}  # hub name -> hub
+        self.mappings = {}  # target_key -> EnergyDashboardSensorMapping
+        self.contributions = {}  # target_key -> {hub name: value}
+        self.totals = {}  # target_key -> sum of the contributions
+
+    def set_members(self, master_hub, slave_hubs):
+        members = {getattr(master_hub, "_name", self.master_name): master_hub, **dict(slave_hubs)}
+        for name in list(self.members):
+            if members.get(name) is not self.members[name]:
+                self.leave(name)
+        for name, hub in members.items():
+            if name not in self.members:
+                self.members[name] = hub
+                hub.parallel_group = self
+                for mapping in self.mappings.values():
+                    self._update(mapping, name, hub)
+
+    def add_mapping(self, mapping):
+        target = mapping.target_key
+        self.mappings[target] = mapping
+        self.contributions[target] = {}
+        self.totals[target] = 0
+        for name, hub in self.members.items():
+            self._update(mapping, name, hub)
+
+    def _update(self, mapping, name, hub):
+        data = getattr(hub, "data", None) or getattr(hub, "datadict", {})
+        value = 0
+        if data:
+            try:
+                value = mapping.get_value(data)
+            except Exception as e:
+                _LOGGER.debug(f"{self.master_name}: Error getting '{name}' value for aggregation: {e}, using 0")
+            if not isinstance(value, (int, float)):
+                value = 0
+        contributions = self.contributions[mapping.target_key]
+        old = contributions.get(name, 0)
+        if value != old:
+            contributions[name] = value
+            self.totals[mapping.target_key] = math.fsum(contributions.values())
+
+    def publish(self, hub):
+        """Take the current values of a member into the totals."""
+        name = getattr(hub, "_name", None)
+        if self.members.get(name) is not hub:
+            return
+        for mapping in self.mappings.values():
+            self._update(mapping, name, hub)
+
+    def leave(self, name):
+        if name == self.master_name:
+            if _parallel_groups.get(name) is self:
+                del _parallel_groups[name]
+            for member in list(self.members):
+                if member != name:
+                    self.leave(member)
+        hub = self.members.pop(name, None)
+        if hub is not None and getattr(hub, "parallel_group", None) is self:
+            hub.parallel_group = None
+        for target, contributions in self.contributions.items():
+            contributions.pop(name, None)
+            self.totals[target] = math.fsum(contributions.values())
+
+    def total(self, target_key):
+        return self.totals.get(target_key, 0)
+
+
+_parallel_groups = {}  # Master hub name -> ParallelGroup
+
+
+def get_parallel_group(master_hub):
+    master_name = getattr(master_hub, "_name", "Unknown")
+    group = _parallel_groups.get(master_name)
+    if group is None:
+        group = _parallel_groups[master_name] = ParallelGroup(master_name)
+    return group
+
+
 def _create_aggregated_value_function(sensor_mapping: EnergyDashboardSensorMapping, master_hub, slave_hubs):
-    """Create a value function that sums Master + all Slaves for aggregation.
+    """Create a value function that returns the sum of Master + all Slaves for aggregation.
 
+    The sum is kept by the ParallelGroup of the Master, which the Slaves update when they finish a cycle.
     Handles edge cases:
     - No Slaves: Returns Master value only
-    - Slave hub offline: Treats missing values as 0, logs debug message
-    - Missing keys: Treats as 0, continues with other Slaves
+    - Slave hub offline: keeps its last values; a hub without data or with unusable values counts as 0
     """
-    master_name = getattr(master_hub, "_name", "Unknown")
+    group = get_parallel_group(master_hub)
+    group.set_members(master_hub, slave_hubs)
+    group.add_mapping(sensor_mapping)
+    target_key = sensor_mapping.target_key
 
     def value_function(initval, descr, datadict):
-        # Get Master value (individual inverter value)
-        master_data = getattr(master_hub, "data", None) or getattr(master_hub, "datadict", datadict)
-        try:
-            master_value = sensor_mapping.get_value(master_data)
-            total = master_value if master_value is not None else 0
-        except Exception as e:
-            _LOGGER.debug(f"{master_name}: Error getting Master value for aggregation: {e}")
-            total = 0
-
-        # Sum all Slave values
-        for slave_name, slave_hub in slave_hubs:
-            try:
-                slave_data = getattr(slave_hub, "data", None) or getattr(slave_hub, "datadict", {})
-                if not slave_data:
-                    _LOGGER.debug(f"{master_name}: Slave hub '{slave_name}' has no data, using 0 for aggregation")
-                    continue
-
-                slave_value = sensor_mapping.get_value(slave_data)
-                if slave_value is not None:
-                    total += slave_value
-                # If slave_value is None, treat as 0 (already handled by not adding)
-            except Exception as e:
-                _LOGGER.debug(f"{master_name}: Error getting Slave '{slave_name}' value for aggregation: {e}, using 0")
-                # Continue with other Slaves (treat this Slave as 0)
-
-        return total
+        group.publish(master_hub)  # evaluated at the end of a Master cycle: its own values are current
+        return group.total(target_key)
 
     return value_function
 
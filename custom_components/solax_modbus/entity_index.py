@@ -0,0 +1,100 @@
+"""Cached index of the entity descriptions that apply to an inverter.
+
+matchInverterWithMask only depends on the inverter type bitmask, the serial number and the
+description itself. For an unchanged plugin file, the positions of the matching descriptions in
+SENSOR_TYPES (and the other tables) are therefore identical on every start. They are kept in
+memory and in <config>/solax_modbus_entity_index.json, keyed by the sha1 of the plugin file, so
+a restart only copies the matching descriptions instead of filtering the full table again.
+A modified plugin file invalidates all entries of that plugin.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+INDEX_FILE = f"{DOMAIN}_entity_index.json"
+INDEX_VERSION = 1
+MAX_ENTRIES_PER_PLUGIN = 32  # inverter type / serial / table combinations kept per plugin file
+
+_lock = threading.Lock()  # index file access from executor threads of several hubs
+_index = None  # loaded lazily: {"_version": .., plugin_name: {"hash": .., "entries": {key: [positions]}}}
+_plugin_hashes = {}  # module file -> sha1, the file does not change while HA runs
+
+
+def plugin_hash(plugin_module):
+    """Return the sha1 of the plugin source file, or None if the module has no file."""
+    path = getattr(plugin_module, "__file__", None)
+    if not path:
+        return None
+    digest = _plugin_hashes.get(path)
+    if digest is None:
+        with open(path, "rb") as fp:
+            digest = hashlib.sha1(fp.read()).hexdigest()
+        _plugin_hashes[path] = digest
+    return digest
+
+
+def _load(path):
+    global _index
+    if _index is None:
+        try:
+            with open(path) as fp:
+                loaded = json.load(fp)
+        except (OSError, ValueError):
+            loaded = None
+        if not isinstance(loaded, dict) or loaded.get("_version") != INDEX_VERSION:
+            loaded = {"_version": INDEX_VERSION}
+        _index = loaded
+    return _index
+
+
+def _lookup_or_build(path, plugin_module, table_name, descriptions, plugin, invertertype, serial):
+    """Executor job: return the positions of the matching descriptions, from the index if possible."""
+    digest = plugin_hash(plugin_module)
+    plugin_name = plugin_module.__name__.rsplit(".", 1)[-1]
+    key = f"{table_name}|{invertertype}|{serial}"
+    with _lock:
+        index = _load(path)
+        entry = index.get(plugin_name)
+        if entry is None or entry.get("hash") != digest:
+            entry = index[plugin_name] = {"hash": digest, "entries": {}}
+        positions = entry["entries"].get(key)
+        if positions is not None and all(pos < len(descriptions) for pos in positions):
+            return positions
+        positions = [
+            pos
+            for pos, descr in enumerate(descriptions)
+            if plugin.matchInverterWithMask(invertertype, descr.allowedtypes, serial, descr.blacklist)
+        ]
+        entries = entry["entries"]
+        entries.pop(key, None)
+        entries[key] = positions
+        while len(entries) > MAX_ENTRIES_PER_PLUGIN:  # drop the oldest combination
+            entries.pop(next(iter(entries)))
+        if digest is not None:
+            try:
+                with open(path, "w") as fp:
+                    json.dump(index, fp)
+            except OSError as ex:
+                _LOGGER.debug(f"cannot write entity index {path}: {ex}")
+        return positions
+
+
+async def async_matching_descriptions(hass, hub, table_name, descriptions):
+    """Return the descriptions of a plugin table that match the inverter of this hub, in table order."""
+    positions = await hass.async_add_executor_job(
+        _lookup_or_build,
+        hass.config.path(INDEX_FILE),
+        hub.plugin_module,
+        table_name,
+        descriptions,
+        hub.plugin,
+        hub._invertertype,
+        hub.seriesnumber,
+    )
+    return [descriptions[pos] for pos in positions]
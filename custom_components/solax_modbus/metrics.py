@@ -0,0 +1,96 @@
+"""Rolling timing histograms and counters of one hub.
+
+Recording a sample is a list store and two additions, so the hub records unconditionally on the hot path.
+Percentiles are only computed when the diagnostic sensors or the diagnostics download ask for them.
+"""
+
+METRIC_SAMPLES = 512  # samples kept per histogram
+TIMINGS = ("cycle", "block_read", "decode", "fanout")  # seconds
+COUNTERS = (
+    "read_errors",
+    "exceptions",
+    "reconnects",
+    "read_retries",
+    "preemptions",
+    "overruns",
+    "write_retries",
+    "probes",
+)
+
+
+class RollingHistogram:
+    """The last METRIC_SAMPLES values of one timing, plus totals over the lifetime of the hub."""
+
+    __slots__ = ("_samples", "_pos", "count", "total")
+
+    def __init__(self, size=METRIC_SAMPLES):
+        self._samples = [0.0] * size
+        self._pos = 0
+        self.count = 0
+        self.total = 0.0
+
+    def add(self, value):
+        self._samples[self._pos] = value
+        self._pos = (self._pos + 1) % len(self._samples)
+        self.count += 1
+        self.total += value
+
+    def window(self):
+        """Return the kept samples, sorted."""
+        return sorted(self._samples[: min(self.count, len(self._samples))])
+
+    def percentile(self, q):
+        """Return the q-th percentile (0..100) of the kept samples, or None if there are none."""
+        samples = self.window()
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, int(q / 100.0 * len(samples)))]
+
+    def summary(self, scale=1000.0, digits=2):
+        """Count, mean, p50/p90/p99 and max of the kept samples; timings in ms with the default scale."""
+        samples = self.window()
+        if not samples:
+            return {"count": self.count}
+        n = len(samples)
+
+        def pick(q):
+            return round(samples[min(n - 1, int(q / 100.0 * n))] * scale, digits)
+
+        return {
+            "count": self.count,
+            "mean": round(sum(samples) / n * scale, digits),
+            "p50": pick(50),
+            "p90": pick(90),
+            "p99": pick(99),
+            "max": round(samples[-1] * scale, digits),
+        }
+
+
+class HubMetrics:
+    """Timings (in seconds) and event counters of a SolaXModbusHub."""
+
+    def __init__(self):
+        self.timings = {name: RollingHistogram() for name in TIMINGS}
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self.blocks = {}  # block label (e.g. "input 0x0") -> RollingHistogram of its read latency
+
+    def time(self, name, seconds):
+        self.timings[name].add(seconds)
+
+    def count(self, name, n=1):
+        self.counters[name] += n
+
+    def block_read(self, label, seconds):
+        self.timings["block_read"].add(seconds)
+        hist = self.blocks.get(label)
+        if hist is None:
+            hist = self.blocks[label] = RollingHistogram(METRIC_SAMPLES // 8)
+        hist.add(seconds)
+
+    def as_dict(self):
+        """All metrics, timings in ms, for the diagnostics download."""
+        return {
+            "timings_ms": {name: hist.summary() for name, hist in self.timings.items()},
+            "counters": dict(self.counters),
+            "blocks_ms": {label: hist.summary() for label, hist in sorted(self.blocks.items())},
+        }
@@ -0,0 +1,93 @@
+"""Polling of multiplexed device groups, e.g. the battery packs behind one BMS register window.
+
+Some inverters (Sofar battery_config) expose all battery packs through the same registers: a pack is
+selected by a write, and its data can be read once the BMS confirms the selection. Each pack is a
+device group with a readPreparation (select and confirm) and a readFollowUp (verify). Reading every
+pack in every cycle multiplies the cycle time by the number of packs.
+
+PackScheduler reads the groups of the device itself in every cycle and only battery_packs_per_cycle
+of the multiplexed groups, in turn, so every pack is refreshed every n / battery_packs_per_cycle
+cycles. Packs that were not read keep their last values; their sensors carry the time of the last
+refresh as attribute last_refresh, and the age is reported in the diagnostics.
+SettleEstimate replaces fixed sleeps after a selection by polling for readiness, first after the
+settle time observed so far, then in short growing steps.
+"""
+
+import asyncio
+import time
+
+SETTLE_INITIAL = 0.1  # seconds, first guess of the time the BMS needs to switch packs
+SETTLE_MIN = 0.02
+SETTLE_MAX = 1.0
+POLL_STEP = 0.05  # first delay between readiness polls, doubled up to POLL_STEP_MAX
+POLL_STEP_MAX = 0.3
+READY_TIMEOUT = 3.0  # seconds; the fixed scheme waited up to 10 x 0.3 s
+
+
+class SettleEstimate:
+    """Learned switch-over time of a multiplexed device."""
+
+    def __init__(self, initial=SETTLE_INITIAL):
+        self.estimate = initial
+
+    async def wait(self, check, timeout=READY_TIMEOUT):
+        """Poll check() until it returns True. check() returns False while the device is not ready yet
+        and None on a read error, which ends the wait. Returns True if the device became ready."""
+        t0 = time.monotonic()
+        await asyncio.sleep(self.estimate)
+        step = POLL_STEP
+        polls = 0
+        while True:
+            ready = await check()
+            polls += 1
+            if ready:
+                if polls == 1:  # ready at the first look: perhaps earlier, try a little less next time
+                    self.estimate = max(SETTLE_MIN, self.estimate * 0.8)
+                else:
+                    self.estimate = min(SETTLE_MAX, 0.5 * self.estimate + 0.5 * (time.monotonic() - t0))
+                return True
+            if ready is None or time.monotonic() - t0 + step > timeout:
+                return False
+            await asyncio.sleep(step)
+            step = min(step * 2, POLL_STEP_MAX)
+
+
+class PackScheduler:
+    """Chooses the device groups of an interval group to read in a cycle, see module docstring."""
+
+    def __init__(self, packs_per_cycle=1):
+        self.packs_per_cycle = packs_per_cycle  # 0: all multiplexed groups in every cycle
+        self._next = {}  # interval -> rotation position among its multiplexed groups
+        self.refreshed = {}  # device group name -> monotonic time of the last successful read
+        self.refreshed_at = {}  # device group name -> wall clock time of the last successful read
+
+    def due(self, interval, device_groups):
+        """Return [(name, group)] to read in this cycle: all plain groups first, then the multiplexed
+        groups (those with a readPreparation) whose turn it is."""
+        plain = []
+        multiplexed = []
+        for name, group in device_groups.items():
+            (multiplexed if group.readPreparation is not None else plain).append((name, group))
+        if not self.packs_per_cycle or len(multiplexed) <= self.packs_per_cycle:
+            return plain + multiplexed
+        pos = self._next.get(interval, 0) % len(multiplexed)
+        self._next[interval] = pos + self.packs_per_cycle
+        turn = [multiplexed[(pos + i) % len(multiplexed)] for i in range(self.packs_per_cycle)]
+        return plain + turn
+
+    def done(self, name, group):
+        """Record the read of a device group; only complete reads of multiplexed groups count."""
+        if group.readPreparation is not None and group.fresh:
+            self.refreshed[name] = time.monotonic()
+            self.refreshed_at[name] = time.time()
+
+    def last_refresh(self, name):
+        """Wall clock time of the last complete read of a multiplexed group, None for other groups."""
+        return self.refreshed_at.get(name)
+
+    def as_dict(self):
+        now = time.monotonic()
+        return {
+            "packs_per_cycle": self.packs_per_cycle,
+            "age_s": {name: round(now - t, 1) for name, t in self.refreshed.items()},
+        }
@@ -4422,6 +4422,7 @@ SENSOR_TYPES: list[GrowattModbusSensorEntityDescription] = [
             "today_s_pv3_solar_energy",
             "today_s_pv4_solar_energy",
         ),
+        depends_on_complete=True,
         allowedtypes=GEN2 | GEN3,
         icon="mdi:solar-power",
     ),
@@ -4639,6 +4640,7 @@ SENSOR_TYPES: list[GrowattModbusSensorEntityDescription] = [
             "battery_charge_power",
             "battery_discharge_power",
         ),
+        depends_on_complete=True,
         allowedtypes=HYBRID | GEN3 | GEN4,
         icon="mdi:battery",
     ),
@@ -1,4 +1,3 @@
-import asyncio
 import logging
 from dataclasses import dataclass
 
@@ -51,6 +50,7 @@ from custom_components.solax_modbus.const import (
     value_function_rtc_ymd,
 )
 
+from .pack_scheduler import SettleEstimate
 from .pymodbus_compat import DataType, convert_from_registers
 
 _LOGGER = logging.getLogger(__name__)
@@ -3993,6 +3993,9 @@ class battery_config(base_battery_config):
         self.battery_sensor_type = BATTERY_SENSOR_TYPES
         self.battery_sensor_name_prefix = "Battery {batt-nr}/{pack-nr} "
         self.battery_sensor_key_prefix = "battery_{batt-nr}_{pack-nr}_"
+        # hub name -> SettleEstimate, the time the BMS needs to switch to the selected pack;
+        # per hub, as the plugin instance and its battery_config are shared by all Sofar hubs
+        self.settle = {}
 
     bapack_number_address = 0x900D
     bms_inquire_address = 0x9020
@@ -4008,6 +4011,12 @@ class battery_config(base_battery_config):
     selected_batt_nr: int = None
     selected_batt_pack_nr: int = None
 
+    def _settle(self, hub):
+        settle = self.settle.get(hub._name)
+        if settle is None:
+            settle = self.settle[hub._name] = SettleEstimate()
+        return settle
+
     async def init_batt_pack(self, hub, serial_number):
         if not self.batt_pack_serials.__contains__(self.selected_batt_nr):
             self.batt_pack_serials[self.selected_batt_nr] = {}
@@ -4030,11 +4039,22 @@ class battery_config(base_battery_config):
         await hub.async_write_registers_single(
             unit=hub._modbus_addr, address=self.bms_inquire_address, payload=payload
         )
-        await asyncio.sleep(0.3)
+        # wait until the BMS confirms the selection instead of a fixed 0.3s; a failed confirmation is
+        # caught by check_battery_on_start / check_battery_on_end
+        await self._settle(hub).wait(lambda: self._selection_confirmed(hub, payload))
         self.selected_batt_nr = batt_nr
         self.selected_batt_pack_nr = batt_pack_nr
         return True
 
+    async def _selection_confirmed(self, hub, payload):
+        """True if bms_check_address reports the selected pack, False if not yet, None on a read error."""
+        inverter_data = await hub.async_read_holding_registers(
+            unit=hub._modbus_addr, address=self.bms_check_address, count=1
+        )
+        if inverter_data is None or inverter_data.isError():
+            return None
+        return convert_from_registers(inverter_data.registers[:1], DataType.UINT16, "big") == payload
+
     async def get_batt_pack_serial(self, hub, batt_nr: int, batt_pack_nr: int):
         if not self.batt_pack_serials.__contains__(batt_nr):
             return None
@@ -4072,21 +4092,12 @@ class battery_config(base_battery_config):
 
         faulty_nr = 0
         payload = faulty_nr << 12 | batt_pack_nr << 8 | batt_nr
-        for retry in range(0, 10):
-            inverter_data = await hub.async_read_holding_registers(
-                unit=hub._modbus_addr, address=self.bms_check_address, count=1
-            )
-            if inverter_data is not None and not inverter_data.isError():
-                read = convert_from_registers(inverter_data.registers[:1], DataType.UINT16, "big")
-                ok = read == payload
-                if not ok:
-                    await asyncio.sleep(0.3)
-                else:
-                    return True
-
-            else:
-                _LOGGER.error(f"can't read batt check register")
-                return False
+        ready = await self._selection_confirmed(hub, payload)
+        if ready is False:  # select_battery gave up waiting, give the BMS one more settle period
+            ready = await self._settle(hub).wait(lambda: self._selection_confirmed(hub, payload))
+        if ready is None:
+            _LOGGER.error(f"can't read batt check register")
+        return bool(ready)
 
     async def check_battery_on_end(self, hub, old_data, new_data, key_prefix, batt_nr: int, batt_pack_nr: int):
         # inverter_data = await hub.async_read_holding_registers(unit=hub._modbus_addr, address=0x9045, count=2)
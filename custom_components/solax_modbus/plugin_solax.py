@@ -55,6 +55,7 @@ from custom_components.solax_modbus.const import (
     BaseModbusSelectEntityDescription,
     BaseModbusSensorEntityDescription,
     BaseModbusSwitchEntityDescription,
+    DetectionProbe,
     UnitOfReactivePower,
     autorepeat_remaining,
     autorepeat_stop,
@@ -186,35 +187,27 @@ SENSOR_TYPES = []
 # ====================== find inverter type and details ===========================================
 
 
-async def async_read_serialnr(hub, address):
-    res = None
-    inverter_data = None
-    try:
-        inverter_data = await hub.async_read_holding_registers(unit=hub._modbus_addr, address=address, count=7)
-        if inverter_data is not None and not inverter_data.isError():
-            # Decode 7 registers (14 bytes) as string using clientless compat helper
-            raw = convert_from_registers(inverter_data.registers[0:7], DataType.STRING, "big")
-            res = raw.decode("ascii", errors="ignore") if isinstance(raw, (bytes, bytearray)) else str(raw)
-            if address == 0x300:
-                # Some devices report swapped bytes; preserve the existing swap workaround
-                if res and not res.startswith(("M", "X")):
-                    ba = bytearray(res, "ascii")
-                    ba[0::2], ba[1::2] = ba[1::2], ba[0::2]
-                    res = str(ba, "ascii")
-                    hub.seriesnumber = res
-            hub.seriesnumber = res
-    except Exception as ex:
-        _LOGGER.warning(
-            f"{hub.name}: attempt to read serialnumber failed at 0x{address:x} data: {inverter_data}", exc_info=True
-        )
-    if not res:
-        _LOGGER.warning(
-            f"{hub.name}: reading serial number from address 0x{address:x} failed; other address may succeed"
-        )
-    _LOGGER.info(f"Read {hub.name} 0x{address:x} serial number: {res}")
+def _decode_serialnr(registers, swapbytes=False):
+    # Decode 7 registers (14 bytes) as string using clientless compat helper
+    raw = convert_from_registers(registers[0:7], DataType.STRING, "big")
+    res = raw.decode("ascii", errors="ignore") if isinstance(raw, (bytes, bytearray)) else str(raw)
+    if swapbytes and res and not res.startswith(("M", "X")):
+        # Some devices report swapped bytes; preserve the existing swap workaround
+        ba = bytearray(res, "ascii")
+        ba[0::2], ba[1::2] = ba[1::2], ba[0::2]
+        res = str(ba, "ascii")
     return res
 
 
+DETECTION_PROBES = [
+    DetectionProbe("serialnr_0x0", 0x0, 7, decode=_decode_serialnr),
+    DetectionProbe(
+        "serialnr_0x300", 0x300, 7, decode=lambda regs: _decode_serialnr(regs, swapbytes=True)
+    ),  # bug in Endian.LITTLE decoding?
+    DetectionProbe("serialnr_0x1a10", 0x1A10, 7, decode=_decode_serialnr),
+]
+
+
 # =================================================================================================
 
 
@@ -7398,7 +7391,8 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         state_class=SensorStateClass.MEASUREMENT,
         value_function=value_function_pm_total_inverter_power,
         allowedtypes=AC | HYBRID | GEN3 | GEN4 | GEN5 | GEN6 | PM,
-        depends_on=("pm_activepower_l1", "parallel_setting"),
+        depends_on=("pm_activepower_l1", "pm_activepower_l2", "pm_activepower_l3", "parallel_setting"),
+        depends_on_complete=True,
         icon="mdi:home-lightning-bolt",
     ),
     SolaXModbusSensorEntityDescription(
@@ -7409,7 +7403,8 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         state_class=SensorStateClass.MEASUREMENT,
         value_function=value_function_pm_total_pv_power,
         allowedtypes=AC | HYBRID | GEN3 | GEN4 | GEN5 | GEN6 | PM,
-        depends_on=("pm_pv_power_1", "parallel_setting"),
+        depends_on=("pm_pv_power_1", "pm_pv_power_2", "parallel_setting"),
+        depends_on_complete=True,
         icon="mdi:solar-power",
     ),
     SolaXModbusSensorEntityDescription(
@@ -7420,7 +7415,16 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         state_class=SensorStateClass.MEASUREMENT,
         value_function=value_function_pm_total_house_load,
         allowedtypes=AC | HYBRID | GEN3 | GEN4 | GEN5 | GEN6 | PM,
-        depends_on=("pm_activepower_l1", "parallel_setting"),
+        depends_on=(
+            "pm_activepower_l1",
+            "pm_activepower_l2",
+            "pm_activepower_l3",
+            "measured_power",
+            "pm_total_pv_power",
+            "pm_battery_power_charge",
+            "remotecontrol_active_power",
+            "parallel_setting",
+        ),
         icon="mdi:home-lightning-bolt",
     ),
     SolaXModbusSensorEntityDescription(
@@ -7431,7 +7435,13 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         state_class=SensorStateClass.MEASUREMENT,
         value_function=value_function_pm_total_reactive_or_apparentpower,
         allowedtypes=AC | HYBRID | GEN3 | GEN4 | GEN5 | GEN6 | PM,
-        depends_on=("pm_reactive_or_apparentpower_l1", "parallel_setting"),
+        depends_on=(
+            "pm_reactive_or_apparentpower_l1",
+            "pm_reactive_or_apparentpower_l2",
+            "pm_reactive_or_apparentpower_l3",
+            "parallel_setting",
+        ),
+        depends_on_complete=True,
         icon="mdi:flash",
     ),
     SolaXModbusSensorEntityDescription(
@@ -7442,7 +7452,8 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         state_class=SensorStateClass.MEASUREMENT,
         value_function=value_function_pm_total_inverter_current,
         allowedtypes=AC | HYBRID | GEN3 | GEN4 | GEN5 | GEN6 | PM,
-        depends_on=("pm__current_l1", "parallel_setting"),
+        depends_on=("pm__current_l1", "pm__current_l2", "pm__current_l3", "parallel_setting"),
+        depends_on_complete=True,
         icon="mdi:current-ac",
     ),
     SolaXModbusSensorEntityDescription(
@@ -7453,7 +7464,8 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         state_class=SensorStateClass.MEASUREMENT,
         value_function=value_function_pm_total_pv_current,
         allowedtypes=AC | HYBRID | GEN3 | GEN4 | GEN5 | GEN6 | PM,
-        depends_on=("pm_pv_current_1", "parallel_setting"),
+        depends_on=("pm_pv_current_1", "pm_pv_current_2", "parallel_setting"),
+        depends_on_complete=True,
         icon="mdi:current-dc",
     ),
     SolaXModbusSensorEntityDescription(
@@ -8095,7 +8107,11 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
             "pv_power_1",
             "pv_power_2",
             "pv_power_3",
+            "battery_power_charge",
+            "measured_power",
+            "meter_2_measured_power",
         ),
+        depends_on_complete=True,
         icon="mdi:home-lightning-bolt",
     ),
     SolaXModbusSensorEntityDescription(
@@ -8120,7 +8136,10 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
             "pv_power_2",
             "pv_power_3",
             "pv_power_4",
+            "pv_power_5",
+            "pv_power_6",
         ),
+        depends_on_complete=True,
         icon="mdi:solar-power-variant",
     ),
     SolaXModbusSensorEntityDescription(
@@ -9655,12 +9674,10 @@ class solax_plugin(plugin_base):
     async def async_determineInverterType(self, hub, configdict):
         # global SENSOR_TYPES
         _LOGGER.info(f"{hub.name}: trying to determine inverter type")
-        seriesnumber = await async_read_serialnr(hub, 0x0)
-        if not seriesnumber:
-            seriesnumber = await async_read_serialnr(hub, 0x300)  # bug in Endian.LITTLE decoding?
-        if not seriesnumber:
-            seriesnumber = await async_read_serialnr(hub, 0x1A10)
-        if not seriesnumber:
+        seriesnumber = await hub.async_run_detection_probes(self.DETECTION_PROBES)
+        if seriesnumber:
+            hub.seriesnumber = seriesnumber
+        else:
             _LOGGER.error(f"{hub.name}: cannot find any serial number(s)")
             seriesnumber = "unknown"
 
@@ -10335,6 +10352,7 @@ plugin_instance = solax_plugin(
     BUTTON_TYPES=BUTTON_TYPES,
     SELECT_TYPES=SELECT_TYPES,
     SWITCH_TYPES=SWITCH_TYPES,
+    DETECTION_PROBES=DETECTION_PROBES,
     block_size=100,
     # order16=Endian.BIG,
     order32="little",
@@ -1018,6 +1018,7 @@ SENSOR_TYPES: list[SolintegModbusSensorEntityDescription] = [
         # scale = {0: "discharging", 1: "charging"},
         value_function=lambda v, d, dd: ["discharge", "charge"][dd.get("battery_power", 0) <= 0],
         depends_on=("battery_power",),
+        depends_on_complete=True,
         entity_registry_enabled_default=False,
         allowedtypes=HYBRID,
         scan_group=SCAN_GROUP_MEDIUM,
@@ -1353,6 +1354,7 @@ SENSOR_TYPES: list[SolintegModbusSensorEntityDescription] = [
             "inverter_load",
             "measured_power",
         ),
+        depends_on_complete=True,
         scan_group=SCAN_GROUP_FAST,
         native_unit_of_measurement=UnitOfPower.WATT,
         device_class=SensorDeviceClass.POWER,
@@ -1368,6 +1370,7 @@ SENSOR_TYPES: list[SolintegModbusSensorEntityDescription] = [
             "measured_power",
             "backup_power",
         ),
+        depends_on_complete=True,
         scan_group=SCAN_GROUP_FAST,
         native_unit_of_measurement=UnitOfPower.WATT,
         device_class=SensorDeviceClass.POWER,
@@ -1815,6 +1815,7 @@ SENSOR_TYPES: list[SolisModbusSensorEntityDescription] = [
             "battery_power",
             "battery_charge_direction",
         ),
+        depends_on_complete=True,
         icon="mdi:battery-arrow-up",
     ),
     SolisModbusSensorEntityDescription(
@@ -1828,6 +1829,7 @@ SENSOR_TYPES: list[SolisModbusSensorEntityDescription] = [
             "battery_power",
             "battery_charge_direction",
         ),
+        depends_on_complete=True,
         allowedtypes=HYBRID,
         icon="mdi:battery-arrow-down",
     ),
@@ -2904,6 +2904,7 @@ SENSOR_TYPES: list[SolisModbusSensorEntityDescription] = [
             "battery_power",
             "battery_charge_direction",
         ),
+        depends_on_complete=True,
         icon="mdi:battery-arrow-up",
     ),
     SolisModbusSensorEntityDescription(
@@ -2917,6 +2918,7 @@ SENSOR_TYPES: list[SolisModbusSensorEntityDescription] = [
             "battery_power",
             "battery_charge_direction",
         ),
+        depends_on_complete=True,
         allowedtypes=HYBRID,
         icon="mdi:battery-arrow-down",
     ),
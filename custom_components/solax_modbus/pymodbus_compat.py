@@ -3,7 +3,10 @@ from __future__ import annotations
 
 import inspect
 import logging
+import struct
+from contextlib import contextmanager
 from enum import Enum
+from operator import itemgetter
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -320,3 +323,141 @@ else:
             return d.decode_string(len(regs) * 2)
         else:
             raise ValueError(f"Unsupported data_type: {dt}")
+
+
+# ---------------- Bulk block decoding (independent of pymodbus version) ----------------
+# The helpers above decode one value per call and pay the version shims for every call.
+# For polling, a whole register block is converted to bytes once and all fixed width fields
+# of the block are decoded with a single precompiled struct format.
+
+_BULK_CODES = {
+    "UINT16": ("H", 1),
+    "INT16": ("h", 1),
+    "UINT32": ("I", 2),
+    "INT32": ("i", 2),
+    "FLOAT32": ("f", 2),
+}
+
+
+def bulk_supported(dt) -> bool:
+    """Return True if values of datatype dt can be decoded by BlockDecoder."""
+    return getattr(dt, "name", dt) in _BULK_CODES
+
+
+def registers_to_bytes(regs) -> bytes:
+    """Convert a list of 16 bit registers to a big endian byte string."""
+    return struct.pack(f">{len(regs)}H", *regs)
+
+
+class BlockDecoder:
+    """Precompiled decoder for the fixed width fields of one register block.
+
+    fields is a sequence of (word_offset, dt, wordorder) tuples; decode() returns the values in
+    the same order. 32 bit fields with "little" word order are handled by swapping their words
+    before unpacking, so a single big endian struct format covers the whole block.
+    """
+
+    __slots__ = ("wordcount", "_struct", "_gather", "_reorder", "_fields")
+
+    def __init__(self, fields, wordcount: int):
+        self.wordcount = wordcount
+        self._gather = None  # word permutation, only needed when little word order fields exist
+        self._reorder = None  # maps sorted decode order back to the caller's field order
+        self._struct = None
+        self._fields = None  # per-field fallback for overlapping declarations
+        compiled = []
+        for pos, (offset, dt, wordorder) in enumerate(fields):
+            code, words = _BULK_CODES[getattr(dt, "name", dt)]
+            swap = words == 2 and _word_order_str(wordorder) == "little"
+            compiled.append((offset, code, words, swap, pos))
+        ordered = sorted(compiled)
+        order = list(range(wordcount))
+        fmt = [">"]
+        end = 0
+        for offset, code, words, swap, _pos in ordered:
+            if offset < end or offset + words > wordcount:  # overlapping or out of range: no single format
+                self._fields = [
+                    (offset * 2, struct.Struct(">" + code), swap) for offset, code, words, swap, _pos in compiled
+                ]
+                return
+            if offset > end:
+                fmt.append(f"{(offset - end) * 2}x")
+            fmt.append(code)
+            if swap:
+                order[offset], order[offset + 1] = offset + 1, offset
+            end = offset + words
+        self._struct = struct.Struct("".join(fmt))
+        if order != list(range(wordcount)):
+            self._gather = (itemgetter(*order), struct.Struct(f">{wordcount}H"))
+        positions = [pos for *_, pos in ordered]
+        if positions != list(range(len(positions))):
+            self._reorder = sorted(range(len(positions)), key=positions.__getitem__)
+
+    def decode(self, regs, raw: bytes | None = None) -> tuple:
+        """Decode all fields from regs; raw may pass the already converted registers_to_bytes(regs)."""
+        if self._fields is not None:
+            if raw is None:
+                raw = registers_to_bytes(regs)
+            values = []
+            for offset, codec, swap in self._fields:
+                if swap:
+                    values.append(codec.unpack(raw[offset + 2 : offset + 4] + raw[offset : offset + 2])[0])
+                else:
+                    values.append(codec.unpack_from(raw, offset)[0])
+            return tuple(values)
+        if len(regs) < self.wordcount:
+            raise ValueError(f"block decoder expects {self.wordcount} registers, got {len(regs)}")
+        if self._gather is not None:
+            gather, words = self._gather
+            values = self._struct.unpack_from(words.pack(*gather(regs)))
+        else:
+            if raw is None:
+                raw = registers_to_bytes(regs)
+            values = self._struct.unpack_from(raw)
+        if self._reorder is not None:
+            return tuple(values[i] for i in self._reorder)
+        return values
+
+
+def compile_block_decoder(fields, wordcount: int) -> BlockDecoder | None:
+    """Return a BlockDecoder for fields, or None when there is nothing to decode in bulk."""
+    if not fields:
+        return None
+    return BlockDecoder(fields, wordcount)
+
+
+def transport_socket(client):
+    """Return the socket of a connected pymodbus client, or None.
+    Depending on the pymodbus version, the asyncio transport sits on client.ctx, on the client itself
+    or on client.protocol."""
+    for holder in (getattr(client, "ctx", None), client, getattr(client, "protocol", None)):
+        transport = getattr(holder, "transport", None)
+        if transport is not None and hasattr(transport, "get_extra_info"):
+            try:
+                return transport.get_extra_info("socket")
+            except Exception:
+                return None
+    return None
+
+
+@contextmanager
+def request_timeout(client, seconds):
+    """Shorten the response timeout of the requests sent within the block and send them without retries.
+    The timeout is applied by the transaction handling of pymodbus itself, so a request that times out is
+    finished there instead of being cancelled from outside. Use it while holding the request lock only, it
+    changes the client for every user. Clients without comm_params (e.g. a replay client) are left as is."""
+    params = getattr(client, "comm_params", None)
+    ctx = getattr(client, "ctx", None)
+    saved_timeout = getattr(params, "timeout_connect", None)
+    saved_retries = getattr(ctx, "retries", None)
+    if saved_timeout is not None:
+        params.timeout_connect = min(saved_timeout, seconds)
+    if saved_retries is not None:
+        ctx.retries = 0
+    try:
+        yield
+    finally:
+        if saved_timeout is not None:
+            params.timeout_connect = saved_timeout
+        if saved_retries is not None:
+            ctx.retries = saved_retries
@@ -0,0 +1,76 @@
+"""Snapshot of the entity registry entries of one hub, for should_register_be_loaded.
+
+splitInBlocks asks for every register whether its entity is enabled. Asking the entity registry means
+up to 10 lookups (five platforms, two unique_id spellings) per description on every rebuild_blocks.
+The index is built once from the registry and follows its update events, so each question is a dict lookup.
+"""
+
+import logging
+
+from homeassistant.const import Platform
+from homeassistant.core import callback
+from homeassistant.helpers import entity_registry as er
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+PLATFORMS = frozenset((Platform.SENSOR, Platform.SELECT, Platform.NUMBER, Platform.SWITCH, Platform.BUTTON))
+
+
+class EntityEnablementIndex:
+    """unique_id -> {entity_id: enabled} for the registry entries of one hub."""
+
+    def __init__(self, hass, hub_name):
+        self._hass = hass
+        self._prefixes = (f"{hub_name}_", f"{hub_name}.")
+        self._entries = {}  # unique_id -> {entity_id: enabled}
+        self._unique_ids = {}  # entity_id -> unique_id
+        for entry in er.async_get(hass).entities.values():
+            self._add(entry)
+        self._unsub = hass.bus.async_listen(er.EVENT_ENTITY_REGISTRY_UPDATED, self._registry_updated)
+        _LOGGER.debug(f"{hub_name}: entity enablement index built with {len(self._unique_ids)} registry entries")
+
+    def _add(self, entry):
+        unique_id = entry.unique_id
+        if entry.platform != DOMAIN or entry.domain not in PLATFORMS or not str(unique_id).startswith(self._prefixes):
+            return
+        self._entries.setdefault(unique_id, {})[entry.entity_id] = not entry.disabled
+        self._unique_ids[entry.entity_id] = unique_id
+
+    def _discard(self, entity_id):
+        unique_id = self._unique_ids.pop(entity_id, None)
+        if unique_id is None:
+            return
+        entity_ids = self._entries[unique_id]
+        entity_ids.pop(entity_id, None)
+        if not entity_ids:
+            del self._entries[unique_id]
+
+    @callback
+    def _registry_updated(self, event):
+        data = event.data
+        if "old_entity_id" in data:  # entity_id renamed
+            self._discard(data["old_entity_id"])
+        self._discard(data["entity_id"])
+        if data["action"] != "remove":
+            entry = er.async_get(self._hass).async_get(data["entity_id"])
+            if entry is not None:
+                self._add(entry)
+
+    def enabled(self, *unique_ids):
+        """True if an enabled entity has one of the unique_ids, False if only disabled ones exist,
+        None if the registry has no entity with these unique_ids."""
+        found = False
+        for unique_id in unique_ids:
+            entity_ids = self._entries.get(unique_id)
+            if entity_ids:
+                if any(entity_ids.values()):
+                    return True
+                found = True
+        return False if found else None
+
+    def close(self):
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
@@ -0,0 +1,106 @@
+"""Hub level integrator for the Riemann sum energy sensors of the Energy Dashboard.
+
+The sensors only mark themselves as due when the hub hands them new data. After the fan-out of a device
+group the hub advances every due sum in one step, with one timestamp and one local date for all of them.
+The sums live in array("d") state vectors indexed by a slot per sensor. The attribute dict of a sensor
+is only rebuilt on day rollover or when its description or resolved source changed. Its state is written
+at most every riemann_write_interval seconds, while the integration keeps the full poll resolution.
+"""
+
+import time
+from array import array
+
+from homeassistant.util import dt as dt_util
+
+from .energy_dashboard import RIEMANN_ROUND_DIGITS
+
+
+class RiemannIntegrator:
+    """Trapezoidal energy integration (kWh from W) of all RiemannSumEnergySensor entities of one hub."""
+
+    def __init__(self, hub, write_interval=0):
+        self._hub = hub
+        self.write_interval = write_interval  # seconds between state writes, 0: every step
+        self.sensors = []  # slot -> sensor, None for a free slot
+        self.total = array("d")  # kWh
+        self.last_power = array("d")  # W, valid if has_last
+        self.last_time = array("d")  # s, valid if has_last
+        self.last_write = array("d")
+        self.has_last = bytearray()
+        self._free = []
+        self._due = {}  # slot -> None, ordered set of sensors with new data
+
+    def register(self, sensor, total):
+        """Add a sensor with its restored total; returns its slot."""
+        if self._free:
+            slot = self._free.pop()
+            self.sensors[slot] = sensor
+            self.total[slot] = total
+            self.last_power[slot] = 0.0
+            self.last_time[slot] = 0.0
+            self.last_write[slot] = 0.0
+            self.has_last[slot] = 0
+        else:
+            slot = len(self.sensors)
+            self.sensors.append(sensor)
+            self.total.append(total)
+            self.last_power.append(0.0)
+            self.last_time.append(0.0)
+            self.last_write.append(0.0)
+            self.has_last.append(0)
+        return slot
+
+    def unregister(self, slot):
+        if slot is None or self.sensors[slot] is None:
+            return
+        self.sensors[slot] = None
+        self._due.pop(slot, None)
+        self._free.append(slot)
+
+    def mark_due(self, slot):
+        self._due[slot] = None
+
+    def advance(self):
+        """Integrate all due sensors up to now."""
+        if not self._due:
+            return
+        due, self._due = self._due, {}
+        now = time.time()
+        today = dt_util.now().date()
+        data = self._hub.data
+        total, last_power, last_time, has_last = self.total, self.last_power, self.last_time, self.has_last
+        for slot in due:
+            sensor = self.sensors[slot]
+            if sensor is None:
+                continue
+            power = sensor.current_power()
+            if power is None:  # Source sensor not available, keep current total
+                continue
+            key = sensor.entity_description.key
+            # Reset daily totals at midnight (local time)
+            if sensor._last_reset_date != today:
+                total[slot] = 0.0
+                sensor._last_reset_date = today
+                last_power[slot] = power
+                last_time[slot] = now
+                has_last[slot] = 1
+                data[key] = 0.0
+                self._write(sensor, slot, now, attrs=True)
+                continue
+            if has_last[slot]:
+                # Trapezoidal integration: ΔE = (P_prev + P_curr) / 2 * Δt / 3600 / 1000, P in W, Δt in s
+                delta_time = now - last_time[slot]
+                if delta_time > 0:
+                    total[slot] += (last_power[slot] + power) * delta_time / 7200000.0
+            last_power[slot] = power
+            last_time[slot] = now
+            has_last[slot] = 1
+            data[key] = round(total[slot], RIEMANN_ROUND_DIGITS)
+            if now - self.last_write[slot] >= self.write_interval:
+                self._write(sensor, slot, now, attrs=sensor.attrs_stale())
+
+    def _write(self, sensor, slot, now, attrs=False):
+        if attrs:
+            sensor._attr_extra_state_attributes = sensor._riemann_extra_attrs()
+        self.last_write[slot] = now
+        sensor.async_write_ha_state()
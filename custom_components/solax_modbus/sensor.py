@@ -7,8 +7,8 @@ from types import SimpleNamespace
 from typing import Any, Dict, List, Optional
 
 import homeassistant.util.dt as dt_util
-from homeassistant.components.sensor import RestoreEntity, SensorEntity, SensorEntityDescription
-from homeassistant.const import CONF_NAME, STATE_UNAVAILABLE, STATE_UNKNOWN
+from homeassistant.components.sensor import RestoreEntity, SensorEntity, SensorEntityDescription, SensorStateClass
+from homeassistant.const import CONF_NAME, STATE_UNAVAILABLE, STATE_UNKNOWN, EntityCategory, UnitOfTime
 from homeassistant.core import callback
 from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers import entity_registry as er
@@ -33,6 +33,7 @@ from .const import (
     BaseModbusSensorEntityDescription,
 )
 from .debug import get_debug_setting
+from .entity_index import async_matching_descriptions
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -128,7 +129,7 @@ async def async_setup_entry(hass, entry, async_add_entities):
         initial_groups,
         computedRegs,
         hub.device_info,
-        plugin.SENSOR_TYPES,
+        await async_matching_descriptions(hass, hub, "SENSOR_TYPES", plugin.SENSOR_TYPES),
         inverter_name_suffix,
         "",
         None,
@@ -144,6 +145,9 @@ async def async_setup_entry(hass, entry, async_add_entities):
         batt_quantity = await battery_config.get_batt_quantity(hub)
         _LOGGER.info(f"batt_pack_quantity: {batt_pack_quantity}, batt_quantity: {batt_quantity}")
 
+        battery_sensors = await async_matching_descriptions(
+            hass, hub, "battery_sensor_type", battery_config.battery_sensor_type
+        )
         batt_nr = 0
         for batt_pack_nr in range(0, batt_pack_quantity, 1):
             if not await battery_config.select_battery(hub, batt_nr, batt_pack_nr):
@@ -210,13 +214,17 @@ async def async_setup_entry(hass, entry, async_add_entities):
                 initial_groups,
                 computedRegs,
                 device_info_battery,
-                battery_config.battery_sensor_type,
+                battery_sensors,
                 name_prefix,
                 key_prefix,
                 readPreparation,
                 readFollowUp,
             )
 
+    entities.extend(
+        SolaXModbusMetricSensor(hub_name, hub, hub.device_info, key, name, metric, arg)
+        for key, name, metric, arg in METRIC_SENSORS
+    )
     async_add_entities(entities)
     # now the groups are available
     hub.computedSensors = computedRegs
@@ -354,7 +362,13 @@ async def async_setup_entry(hass, entry, async_add_entities):
                                 initial_groups,
                                 computedRegs,
                                 hub.device_info,
-                                energy_dashboard_sensors,
+                                [
+                                    descr
+                                    for descr in energy_dashboard_sensors
+                                    if plugin.matchInverterWithMask(
+                                        hub._invertertype, descr.allowedtypes, hub.seriesnumber, descr.blacklist
+                                    )
+                                ],
                                 inverter_name_suffix,
                                 "",
                                 None,
@@ -519,6 +533,8 @@ async def async_setup_entry(hass, entry, async_add_entities):
 class SolaXModbusSensor(SensorEntity):
     """Representation of an SolaX Modbus sensor."""
 
+    skip_unchanged_updates = True  # hub only writes the state when the value changed, see hub.should_publish
+
     def __init__(
         self,
         platform_name,
@@ -532,7 +548,7 @@ class SolaXModbusSensor(SensorEntity):
         self._hub = hub
         # self.entity_id = "sensor." + platform_name + "_" + description.key
         self.entity_description: BaseModbusSensorEntityDescription = description
-        self._attr_extra_state_attributes = _energy_dashboard_mapping_attrs(self.entity_description, self._hub)
+        self._attr_extra_state_attributes = self._state_attrs()
 
     async def async_added_to_hass(self):
         """Register callbacks."""
@@ -541,9 +557,17 @@ class SolaXModbusSensor(SensorEntity):
     async def async_will_remove_from_hass(self) -> None:
         await self._hub.async_remove_solax_modbus_sensor(self)
 
+    def _state_attrs(self):
+        attrs = _energy_dashboard_mapping_attrs(self.entity_description, self._hub)
+        # battery packs are read in turn (see pack_scheduler): tell how old the values of this pack are
+        refreshed = self._hub.pack_scheduler.last_refresh(self._hub.device_group_key(self._attr_device_info))
+        if refreshed is not None:
+            attrs["last_refresh"] = dt_util.utc_from_timestamp(refreshed).isoformat()
+        return attrs
+
     @callback
     def modbus_data_updated(self):
-        self._attr_extra_state_attributes = _energy_dashboard_mapping_attrs(self.entity_description, self._hub)
+        self._attr_extra_state_attributes = self._state_attrs()
         self.async_write_ha_state()
 
     @callback
@@ -578,9 +602,56 @@ class SolaXModbusSensor(SensorEntity):
         return self._attr_extra_state_attributes
 
 
+# diagnostic sensors on hub.metrics: (key, name, timing name or "counter", percentile or counter name)
+METRIC_SENSORS = (
+    ("metrics_cycle_time_p50", "Poll Cycle Time p50", "cycle", 50),
+    ("metrics_cycle_time_p95", "Poll Cycle Time p95", "cycle", 95),
+    ("metrics_block_read_p95", "Block Read Time p95", "block_read", 95),
+    ("metrics_decode_p95", "Block Decode Time p95", "decode", 95),
+    ("metrics_fanout_p95", "State Update Time p95", "fanout", 95),
+    ("metrics_read_errors", "Block Read Errors", "counter", "read_errors"),
+    ("metrics_exceptions", "Modbus Exceptions", "counter", "exceptions"),
+    ("metrics_reconnects", "Modbus Reconnects", "counter", "reconnects"),
+    ("metrics_overruns", "Poll Cycle Overruns", "counter", "overruns"),
+)
+
+
+class SolaXModbusMetricSensor(SensorEntity):
+    """Diagnostic sensor showing a percentile or counter of hub.metrics. Polled by HA (every 30s),
+    so the polling hot path only records samples. Disabled by default."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_should_poll = True
+
+    def __init__(self, platform_name, hub, device_info, key, name, metric, arg):
+        self._hub = hub
+        self._metric = metric
+        self._arg = arg
+        self._attr_device_info = device_info
+        self._attr_name = f"{platform_name} {name}"
+        self._attr_unique_id = f"{platform_name}_{key}"
+        if metric == "counter":
+            self._attr_state_class = SensorStateClass.TOTAL_INCREASING
+        else:
+            self._attr_state_class = SensorStateClass.MEASUREMENT
+            self._attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+            self._attr_suggested_display_precision = 1
+
+    @property
+    def native_value(self):
+        metrics = self._hub.metrics
+        if self._metric == "counter":
+            return metrics.counters[self._arg]
+        value = metrics.timings[self._metric].percentile(self._arg)
+        return None if value is None else round(value * 1000.0, 2)
+
+
 class RiemannSumEnergySensor(SolaXModbusSensor, RestoreEntity):
     """Energy sensor that calculates cumulative energy using Riemann sum integration."""
 
+    skip_unchanged_updates = False  # integrates over time, needs every poll
+
     def __init__(
         self,
         platform_name,
@@ -598,13 +669,15 @@ class RiemannSumEnergySensor(SolaXModbusSensor, RestoreEntity):
 
         self._riemann_mapping = riemann_mapping
         self._filter_function = (riemann_mapping.filter_function if riemann_mapping else None) or (lambda v: v)
-        self._last_power_value = None
-        self._last_update_time = None
-        self._total_energy = 0.0  # kWh
+        self._total_energy = 0.0  # kWh, restored value; hub.riemann integrates from here on
         self._last_reset_date = dt_util.now().date()
+        self._slot = None  # state slot in hub.riemann
+        self._attrs_description = None  # description the attributes were built from
+        self._source_key = None  # source key of the last integration step
         self._attr_extra_state_attributes = self._riemann_extra_attrs()
 
     def _riemann_extra_attrs(self) -> dict:
+        self._attrs_description = self.entity_description
         attrs = _energy_dashboard_mapping_attrs(self.entity_description, self._hub)
         if self._last_reset_date:
             attrs["last_reset_date"] = self._last_reset_date.isoformat()
@@ -617,8 +690,6 @@ class RiemannSumEnergySensor(SolaXModbusSensor, RestoreEntity):
             if last_state.state not in (STATE_UNKNOWN, STATE_UNAVAILABLE):
                 try:
                     self._total_energy = float(last_state.state)
-                    if last_state.last_updated:
-                        self._last_update_time = last_state.last_updated.timestamp()
                     _LOGGER.debug(
                         f"{self._platform_name}: Restored Riemann sum state for {self.entity_description.key}: {self._total_energy} kWh"
                     )
@@ -632,6 +703,7 @@ class RiemannSumEnergySensor(SolaXModbusSensor, RestoreEntity):
                     self._last_reset_date = date.fromisoformat(reset_date)
                 except (TypeError, ValueError):
                     self._last_reset_date = dt_util.now().date()
+                self._attr_extra_state_attributes = self._riemann_extra_attrs()
 
         hub_name = getattr(self._hub, "_name", None)
         if hub_name and get_debug_setting(
@@ -646,28 +718,34 @@ class RiemannSumEnergySensor(SolaXModbusSensor, RestoreEntity):
             )
             self._total_energy = 0.0
             self._last_reset_date = dt_util.now().date()
-            self._last_power_value = None
-            self._last_update_time = None
             from .energy_dashboard import RIEMANN_ROUND_DIGITS
 
             self._hub.data[self.entity_description.key] = round(self._total_energy, RIEMANN_ROUND_DIGITS)
             self._attr_extra_state_attributes = self._riemann_extra_attrs()
             self.async_write_ha_state()
 
+        self._slot = self._hub.riemann.register(self, self._total_energy)
         # Register with hub
         await self._hub.async_add_solax_modbus_sensor(self)
 
+    async def async_will_remove_from_hass(self) -> None:
+        self._hub.riemann.unregister(self._slot)
+        self._slot = None
+        await super().async_will_remove_from_hass()
+
     @callback
     def modbus_data_updated(self):
-        """Calculate energy when data is updated."""
-        if self._riemann_mapping is None:
+        """New data: integrate with the next step of hub.riemann, together with the other Riemann sums."""
+        if self._riemann_mapping is None or self._slot is None:
             return
-        from .energy_dashboard import RIEMANN_ROUND_DIGITS
+        self._hub.riemann.mark_due(self._slot)
 
+    def current_power(self):
+        """Filtered source power for the integration step, None while the source is not available."""
         # Get current power value from source sensor
         data_hub = getattr(self.entity_description, "_riemann_data_hub", None) or self._hub
         hub_data = getattr(data_hub, "data", None) or getattr(data_hub, "datadict", {})
-        source_key = self._riemann_mapping.get_source_key(hub_data)
+        source_key = self._source_key = self._riemann_mapping.get_source_key(hub_data)
 
         # PV variant energy should track the matching Energy Dashboard PV power entity
         # to stay aligned in parallel mode. The Master inverter uses its own raw
@@ -683,54 +761,26 @@ class RiemannSumEnergySensor(SolaXModbusSensor, RestoreEntity):
             current_power = hub_data.get(source_key)
 
         if current_power is None:
-            # Source sensor not available, keep current total
-            return
+            return None
 
         # Apply filter function (e.g., only > 0 for import, only < 0 for export)
-        filtered_power = self._filter_function(current_power)
-
-        # Get current time
-        current_time = time.time()
-        current_date = dt_util.now().date()
-
-        # Reset daily totals at midnight (local time)
-        if self._last_reset_date is None or current_date != self._last_reset_date:
-            self._total_energy = 0.0
-            self._last_reset_date = current_date
-            self._last_power_value = filtered_power
-            self._last_update_time = current_time
-            self._hub.data[self.entity_description.key] = round(self._total_energy, RIEMANN_ROUND_DIGITS)
-            self._attr_extra_state_attributes = self._riemann_extra_attrs()
-            self.async_write_ha_state()
-            return
-
-        # Calculate energy increment if we have previous value
-        if self._last_power_value is not None and self._last_update_time is not None:
-            # Trapezoidal integration: ΔE = (P_prev + P_curr) / 2 * Δt / 3600 / 1000
-            # P in W, Δt in seconds, result in kWh
-            delta_time = current_time - self._last_update_time
-            if delta_time > 0:
-                avg_power = (self._last_power_value + filtered_power) / 2.0
-                energy_increment = (avg_power * delta_time) / 3600.0 / 1000.0  # Convert to kWh
-                self._total_energy += energy_increment
-
-        # Update stored values
-        self._last_power_value = filtered_power
-        self._last_update_time = current_time
-
-        # Round result and store in hub.data (so native_value property works)
-        self._hub.data[self.entity_description.key] = round(self._total_energy, RIEMANN_ROUND_DIGITS)
-        self._attr_extra_state_attributes = self._riemann_extra_attrs()
+        return self._filter_function(current_power)
 
-        # Update state
-        self.async_write_ha_state()
+    def attrs_stale(self):
+        """True if the attributes no longer describe the description or the source in use (parallel mode)."""
+        attrs = self._attr_extra_state_attributes
+        return self._attrs_description is not self.entity_description or (
+            attrs.get("ed_mapping_present") and attrs.get("ed_resolved_source_key") != self._source_key
+        )
 
     @property
     def native_value(self):
         """Return the calculated energy value."""
-        # Value is stored in hub.data by modbus_data_updated
+        # Value is stored in hub.data by hub.riemann
         if self.entity_description.key in self._hub.data:
             return self._hub.data[self.entity_description.key]
+        if self._slot is not None:
+            return self._hub.riemann.total[self._slot]
         return self._total_energy
 
     @property
@@ -751,39 +801,36 @@ def entityToList(
     readPreparation,
     readFollowUp,
 ):  # noqa: D103
-    for sensor_description in sensor_types:
-        if hub.plugin.matchInverterWithMask(
-            hub._invertertype, sensor_description.allowedtypes, hub.seriesnumber, sensor_description.blacklist
-        ):
-            # apply scale exceptions early
-            if sensor_description.value_series is not None:
-                for serie_value in range(sensor_description.value_series):
-                    newdescr = copy(sensor_description)
-                    newdescr.name = name_prefix + newdescr.name.replace("{}", str(serie_value + 1))
-                    newdescr.key = key_prefix + newdescr.key.replace("{}", str(serie_value + 1))
-                    newdescr.register = sensor_description.register + serie_value
-                    entityToListSingle(
-                        hub,
-                        hub_name,
-                        entities,
-                        groups,
-                        computedRegs,
-                        device_info,
-                        newdescr,
-                        readPreparation,
-                        readFollowUp,
-                    )
-            else:
+    for sensor_description in sensor_types:  # already filtered for this inverter, see entity_index
+        # apply scale exceptions early
+        if sensor_description.value_series is not None:
+            for serie_value in range(sensor_description.value_series):
                 newdescr = copy(sensor_description)
-                try:
-                    newdescr.name = name_prefix + newdescr.name
-                except:
-                    newdescr.name = newdescr.name
-
-                newdescr.key = key_prefix + newdescr.key
+                newdescr.name = name_prefix + newdescr.name.replace("{}", str(serie_value + 1))
+                newdescr.key = key_prefix + newdescr.key.replace("{}", str(serie_value + 1))
+                newdescr.register = sensor_description.register + serie_value
                 entityToListSingle(
-                    hub, hub_name, entities, groups, computedRegs, device_info, newdescr, readPreparation, readFollowUp
+                    hub,
+                    hub_name,
+                    entities,
+                    groups,
+                    computedRegs,
+                    device_info,
+                    newdescr,
+                    readPreparation,
+                    readFollowUp,
                 )
+        else:
+            newdescr = copy(sensor_description)
+            try:
+                newdescr.name = name_prefix + newdescr.name
+            except:
+                newdescr.name = newdescr.name
+
+            newdescr.key = key_prefix + newdescr.key
+            entityToListSingle(
+                hub, hub_name, entities, groups, computedRegs, device_info, newdescr, readPreparation, readFollowUp
+            )
 
 
 def entityToListSingle(
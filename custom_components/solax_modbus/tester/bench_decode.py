@@ -0,0 +1,117 @@
+"""Micro-benchmark: per-call convert_from_registers versus the bulk BlockDecoder.
+
+Run from the Home Assistant config directory (homeassistant and pymodbus must be importable):
+
+    python -m custom_components.solax_modbus.tester.bench_decode [plugin ...] [--cycles N]
+
+For every plugin, the U16/S16/U32/S32/F32 sensor declarations of SENSOR_TYPES are grouped into
+register blocks the same way the hub does (block_size, newblock), filled with random register
+values and decoded with both paths. Both paths must return identical values.
+"""
+
+import argparse
+import random
+import time
+from importlib import import_module
+
+from custom_components.solax_modbus.const import (
+    REG_HOLDING,
+    REGISTER_F32,
+    REGISTER_S16,
+    REGISTER_S32,
+    REGISTER_U16,
+    REGISTER_U32,
+)
+from custom_components.solax_modbus.pymodbus_compat import (
+    DataType,
+    compile_block_decoder,
+    convert_from_registers,
+    registers_to_bytes,
+)
+
+UNIT_INFO = {
+    REGISTER_U16: (DataType.UINT16, 1),
+    REGISTER_S16: (DataType.INT16, 1),
+    REGISTER_U32: (DataType.UINT32, 2),
+    REGISTER_S32: (DataType.INT32, 2),
+    REGISTER_F32: (DataType.FLOAT32, 2),
+}
+
+
+def build_blocks(plugin):
+    """Return a list of (wordcount, fields) per block; fields are (offset, dt, wordorder, words)."""
+    regs = {REG_HOLDING: {}, "input": {}}
+    for descr in plugin.SENSOR_TYPES:
+        if descr.unit not in UNIT_INFO or descr.register is None or descr.register < 0:
+            continue
+        target = regs[REG_HOLDING] if descr.register_type == REG_HOLDING else regs["input"]
+        target.setdefault(descr.register, descr)  # first declaration wins, like the hub
+    blocks = []
+    for table in regs.values():
+        start, end, fields = None, 0, []
+        for reg, descr in sorted(table.items()):
+            if start is not None and (descr.newblock or reg - start > plugin.block_size or reg < end):
+                blocks.append((end - start, fields))
+                start, fields = None, []
+            if start is None:
+                start = reg
+            dt, words = UNIT_INFO[descr.unit]
+            fields.append((reg - start, dt, getattr(descr, "order32", None) or plugin.order32, words))
+            end = reg + words
+        if fields:
+            blocks.append((end - start, fields))
+    return blocks
+
+
+def random_registers(wordcount):
+    return [random.randrange(0, 0x10000) for _ in range(wordcount)]
+
+
+def per_call(fields, regs):
+    return tuple(convert_from_registers(regs[o : o + w], dt, order) for o, dt, order, w in fields)
+
+
+def bench(plugin_name, cycles):
+    plugin = import_module(f"custom_components.solax_modbus.plugin_{plugin_name}").plugin_instance
+    blocks = build_blocks(plugin)
+    prepared = []
+    for wordcount, fields in blocks:
+        decoder = compile_block_decoder([(o, dt, order) for o, dt, order, _w in fields], wordcount)
+        regs = random_registers(wordcount)
+        expected = per_call(fields, regs)
+        got = decoder.decode(regs)
+        for a, b in zip(expected, got):
+            assert a == b or (a != a and b != b), f"{plugin_name}: mismatch {a} != {b}"  # NaN safe
+        prepared.append((fields, decoder, regs))
+    nfields = sum(len(f) for f, _d, _r in prepared)
+
+    t0 = time.perf_counter()
+    for _ in range(cycles):
+        for fields, _decoder, regs in prepared:
+            per_call(fields, regs)
+    t_call = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for _ in range(cycles):
+        for _fields, decoder, regs in prepared:
+            decoder.decode(regs, registers_to_bytes(regs))
+    t_bulk = time.perf_counter() - t0
+
+    print(
+        f"{plugin_name:>10}: {len(prepared)} blocks, {nfields} fields, {cycles} cycles | "
+        f"per-call {t_call * 1e6 / cycles:8.1f} us/cycle | bulk {t_bulk * 1e6 / cycles:8.1f} us/cycle | "
+        f"speedup x{t_call / t_bulk:.1f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("plugins", nargs="*", default=["solax", "growatt"])
+    parser.add_argument("--cycles", type=int, default=2000)
+    args = parser.parse_args()
+    for plugin_name in args.plugins:
+        bench(plugin_name, args.cycles)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Latency benchmark: serialized versus pipelined block reads over plain Modbus TCP.
+
+Run from the Home Assistant config directory (pymodbus must be importable):
+
+    python -m custom_components.solax_modbus.tester.bench_pipeline [--blocks N] [--latency MS] [--window W]
+
+A minimal asyncio Modbus TCP server answers function codes 3 and 4 after a fixed per-request delay,
+emulating a slow inverter or gateway. The same set of blocks is then read once strictly one after the
+other and once with up to --window requests in flight. Both reads must return identical registers.
+Whether the pipelined read gains anything depends on the installed pymodbus version: some versions
+serialize transactions on one connection internally.
+"""
+
+import argparse
+import asyncio
+import struct
+import time
+
+from pymodbus.client import AsyncModbusTcpClient
+
+from custom_components.solax_modbus.pymodbus_compat import ADDR_KW
+
+BLOCK_SIZE = 100
+
+
+async def _serve(reader, writer, latency):
+    """Answer read requests (FC 3/4) with register value == address, each after latency seconds."""
+    lock = asyncio.Lock()  # one writer per connection; responses may leave out of order
+
+    async def _answer(tid, unit, fc, address, count):
+        await asyncio.sleep(latency)
+        values = [(address + i) & 0xFFFF for i in range(count)]
+        pdu = struct.pack(">BB", fc, 2 * count) + struct.pack(f">{count}H", *values)
+        async with lock:
+            writer.write(struct.pack(">HHHB", tid, 0, len(pdu) + 1, unit) + pdu)
+            await writer.drain()
+
+    pending = set()
+    try:
+        while True:
+            header = await reader.readexactly(7)
+            tid, _proto, length, unit = struct.unpack(">HHHB", header)
+            pdu = await reader.readexactly(length - 1)
+            fc, address, count = struct.unpack(">BHH", pdu[:5])
+            task = asyncio.create_task(_answer(tid, unit, fc, address, count))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        for task in pending:
+            task.cancel()
+        writer.close()
+
+
+async def _read(client, block, unit):
+    start, typ = block
+    kwargs = {ADDR_KW: unit}
+    if typ == "input":
+        resp = await client.read_input_registers(address=start, count=BLOCK_SIZE, **kwargs)
+    else:
+        resp = await client.read_holding_registers(address=start, count=BLOCK_SIZE, **kwargs)
+    return list(resp.registers)
+
+
+async def read_serial(client, blocks, unit):
+    return [await _read(client, block, unit) for block in blocks]
+
+
+async def read_pipelined(client, blocks, unit, window):
+    sem = asyncio.Semaphore(window)
+
+    async def _one(block):
+        async with sem:
+            return await _read(client, block, unit)
+
+    tasks = [asyncio.create_task(_one(block)) for block in blocks]
+    return [await task for task in tasks]  # applied in block order, like the hub does
+
+
+async def main(args):
+    latency = args.latency / 1000.0
+    server = await asyncio.start_server(lambda r, w: _serve(r, w, latency), "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    blocks = [(i * BLOCK_SIZE, "holding" if i % 2 else "input") for i in range(args.blocks)]
+    client = AsyncModbusTcpClient(host="127.0.0.1", port=port, timeout=5)
+    await client.connect()
+    try:
+        t0 = time.perf_counter()
+        ref = await read_serial(client, blocks, args.unit)
+        t_serial = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        got = await read_pipelined(client, blocks, args.unit, args.window)
+        t_pipe = time.perf_counter() - t0
+    finally:
+        client.close()
+        server.close()
+        await server.wait_closed()
+    assert got == ref, "pipelined read returned different registers"
+    print(f"{args.blocks} blocks, {args.latency} ms latency per request")
+    print(f"  serialized      : {t_serial * 1000.0:8.1f} ms")
+    print(f"  window {args.window:<2}       : {t_pipe * 1000.0:8.1f} ms  (x{t_serial / t_pipe:.2f})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--blocks", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=50.0, help="per request delay in ms")
+    parser.add_argument("--window", type=int, default=4)
+    parser.add_argument("--unit", type=int, default=1)
+    asyncio.run(main(parser.parse_args()))
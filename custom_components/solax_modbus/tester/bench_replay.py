@@ -0,0 +1,177 @@
+"""Replay benchmark: full poll cycles of a plugin from a recorded trace or from synthetic registers.
+
+Run from the Home Assistant config directory (homeassistant and pymodbus must be importable):
+
+    python -m custom_components.solax_modbus.tester.bench_replay [plugin ...] [--trace FILE] [--cycles N]
+
+The benchmark runs an offline hub (SolaXModbusHub.offline) whose client is a ReplayClient. The register
+blocks of a plugin are laid out by the hub itself (splitInBlocks, all entities enabled as on a fresh
+install) into one device group, and every cycle is a hub.async_read_modbus_data() of that group: the
+block reads, bad register handling, adaptive polling and read cost model of the hub, the decode plans and
+the value functions of the computed sensors. A trace recorded with the debug setting record_trace (see
+trace.py) replays the responses of a real inverter; without --trace the blocks are filled with seeded
+random registers, and the plausibility bounds (min_value / max_value) are switched off so that random
+values are not dropped.
+
+Reported are cycles per second, the block reads and decode times taken from the hub metrics, the median
+and worst read time per block and the memory still held after a cycle (tracemalloc, measured in a
+separate pass so that it does not slow down the timing).
+"""
+
+import argparse
+import asyncio
+import glob
+import logging
+import os
+import random
+import statistics
+import time
+import tracemalloc
+from importlib import import_module
+
+from custom_components.solax_modbus import VERBOSE_CYCLES, SolaXModbusHub, empty_hub_device_group_lambda
+from custom_components.solax_modbus.const import (
+    CONF_INVERTER_POWER_KW,
+    REG_HOLDING,
+    REG_INPUT,
+    REGISTER_U8H,
+    REGISTER_U8L,
+)
+from custom_components.solax_modbus.trace import FC_HOLDING, FC_INPUT, ReplayClient, read_trace
+
+
+class _AllEnabled:
+    """Stands in for the entity enablement index: no registry entries, defaults decide."""
+
+    def enabled(self, *unique_ids):
+        return None
+
+    def close(self):
+        pass
+
+
+def build_hub(module, name, power_kw, client):
+    """An offline hub of the plugin module reading through client."""
+    hub = SolaXModbusHub.offline(module, client, name, {CONF_INVERTER_POWER_KW: power_kw})
+    hub.cyclecount = VERBOSE_CYCLES  # no per-register debug logging
+    hub.enablement_index = _AllEnabled()
+    return hub
+
+
+def build_group(hub):
+    """Return a device group with the registers of all sensors laid out as the hub does; the computed
+    sensors are registered with the hub."""
+    tables = {REG_HOLDING: {}, REG_INPUT: {}}
+    for descr in hub.plugin.SENSOR_TYPES:
+        if descr.register is None or descr.register < 0:
+            if getattr(descr, "value_function", None) is not None:
+                hub.computedSensors[descr.key] = descr
+                hub.sensorEntities[descr.key] = None  # no entity to publish to
+            continue
+        table = tables.get(descr.register_type)
+        if table is None:
+            continue
+        first = table.get(descr.register)
+        if first is None:
+            table[descr.register] = descr
+        elif isinstance(first, dict):
+            first.setdefault(descr.unit, descr)
+        elif first.unit != descr.unit and {first.unit, descr.unit} <= {REGISTER_U8L, REGISTER_U8H}:
+            table[descr.register] = {first.unit: first, descr.unit: descr}
+    group = empty_hub_device_group_lambda()
+    group.holdingBlocks = hub.splitInBlocks(dict(sorted(tables[REG_HOLDING].items())))
+    group.inputBlocks = hub.splitInBlocks(dict(sorted(tables[REG_INPUT].items())))
+    for blk in group.holdingBlocks + group.inputBlocks:
+        hub._compile_block_plan(blk)
+    return group
+
+
+def group_blocks(group):
+    return [(FC_HOLDING, blk) for blk in group.holdingBlocks] + [(FC_INPUT, blk) for blk in group.inputBlocks]
+
+
+def synthetic_records(group, seed):
+    rnd = random.Random(seed)
+    records = []
+    for fc, blk in group_blocks(group):
+        count = blk.end - blk.start
+        records.append((0.0, fc, 1, blk.start, count, [rnd.randrange(0, 0x10000) for _ in range(count)]))
+    return records
+
+
+async def bench(plugin_name, args):
+    module = import_module(f"custom_components.solax_modbus.plugin_{plugin_name}")
+    client = ReplayClient([])
+    hub = build_hub(module, f"bench_{plugin_name}", args.power_kw, client)
+    group = build_group(hub)
+    blocks = group_blocks(group)
+    if args.trace:
+        client.load(read_trace(args.trace))
+    else:
+        client.load(synthetic_records(group, args.seed))
+        for _fc, blk in blocks:
+            for rec in blk.plan:
+                rec.min_val = rec.max_val = None
+    await client.connect()
+    failed = 0
+
+    t0 = time.perf_counter()
+    for _ in range(args.cycles):
+        failed += not await hub.async_read_modbus_data(group)
+    elapsed = time.perf_counter() - t0
+    metrics = hub.metrics
+    reads = metrics.timings["block_read"].count
+    decode = metrics.timings["decode"]
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for _ in range(args.alloc_cycles):
+        await hub.async_read_modbus_data(group)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, "filename") if stat.size_diff > 0)
+    allocations = sum(stat.count_diff for stat in after.compare_to(before, "filename") if stat.count_diff > 0)
+
+    nrecs = sum(len(blk.plan) for _fc, blk in blocks)
+    print(
+        f"{plugin_name:>10}: {len(blocks)} blocks, {nrecs} registers, {len(hub.computedSensors)} computed | "
+        f"{args.cycles / elapsed:8.1f} cycles/s, {failed} failed | {reads / args.cycles:.1f} block reads/cycle, "
+        f"decode p50 {(decode.percentile(50) or 0) * 1e6:.1f} us | "
+        f"{allocations / args.alloc_cycles:.0f} objects, {allocated / args.alloc_cycles / 1024:.1f} KiB retained/cycle"
+    )
+    if args.blocks:
+        for fc, blk in blocks:
+            typ = "input" if fc == FC_INPUT else "holding"
+            hist = metrics.blocks.get(f"{typ} 0x{blk.start:x}")
+            if hist is not None and hist.count:
+                samples = hist.window()
+                print(
+                    f"{'':>12}{typ:>8} 0x{blk.start:04x} "
+                    f"len {blk.end - blk.start:3}: p50 {statistics.median(samples) * 1e6:7.1f} us "
+                    f"max {max(samples) * 1e6:7.1f} us ({hist.count} reads)"
+                )
+    await hub.async_stop()
+
+
+def main():
+    here = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    available = sorted(os.path.basename(p)[len("plugin_") : -3] for p in glob.glob(os.path.join(here, "plugin_*.py")))
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("plugins", nargs="*", default=available)
+    parser.add_argument("--trace", help="trace file written with the debug setting record_trace")
+    parser.add_argument("--cycles", type=int, default=500)
+    parser.add_argument("--alloc-cycles", type=int, default=20)
+    parser.add_argument(
+        "--power-kw", type=float, default=10.0, help="inverter power for the default plausibility bounds"
+    )
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--blocks", action="store_true", help="print the read time per block")
+    args = parser.parse_args()
+    # random registers are no valid strings or versions: keep the per-register read warnings out of the timing
+    logging.getLogger("custom_components.solax_modbus").setLevel(logging.ERROR)
+    for plugin_name in args.plugins:
+        asyncio.run(bench(plugin_name, args))
+
+
+if __name__ == "__main__":
+    main()
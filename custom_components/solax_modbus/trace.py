@@ -0,0 +1,172 @@
+"""Recording of raw block responses and their replay without an inverter.
+
+A hub with the debug setting record_trace (configuration.yaml, see debug.py) appends every block response
+to <config>/solax_modbus_<name>_trace.bin. The file starts with TRACE_MAGIC; each record is
+
+    timestamp (f64) | function code (u8, 3 holding / 4 input, +0x80 for a failed read) | unit (u8)
+    | start (u16) | count (u16) | count register words (u16), words only for successful reads
+
+all big endian. ReplayClient answers read requests from such a trace in place of AsyncModbusTcpClient,
+so decoding, block layout and value functions can be run and benchmarked offline (see tester/bench_replay.py).
+"""
+
+import asyncio
+import struct
+import threading
+from collections import deque
+
+TRACE_MAGIC = b"SXTRACE1"
+TRACE_FLUSH_BYTES = 65536  # buffered bytes before the hub writes them out
+FC_HOLDING = 3
+FC_INPUT = 4
+FC_ERROR = 0x80
+
+_RECORD = struct.Struct(">dBBHH")
+
+
+class TraceRecorder:
+    """In-memory buffer of trace records. record() and take() are called on the event loop, write() in an
+    executor. take() queues the buffered records; write() empties that queue under a lock, so writes started
+    close together do not interleave and the records keep their order in the file."""
+
+    def __init__(self, path):
+        self.path = path
+        self._buffer = bytearray()
+        self._queue = deque()
+        self._lock = threading.Lock()
+        self._started = False
+
+    def record(self, timestamp, typ, unit, start, count, registers=None):
+        """Append one block response; returns True when the buffer should be written out."""
+        fc = FC_INPUT if typ == "input" else FC_HOLDING
+        if registers is None:
+            self._buffer += _RECORD.pack(timestamp, fc | FC_ERROR, unit or 0, start, count)
+        else:
+            count = len(registers)
+            self._buffer += _RECORD.pack(timestamp, fc, unit or 0, start, count)
+            self._buffer += struct.pack(f">{count}H", *registers)
+        return len(self._buffer) >= TRACE_FLUSH_BYTES
+
+    def take(self):
+        """Queue the buffered records for the next write()."""
+        if self._buffer:
+            self._queue.append(bytes(self._buffer))
+            self._buffer = bytearray()
+
+    def write(self):
+        with self._lock:
+            if not self._queue and self._started:
+                return
+            with open(self.path, "ab" if self._started else "wb") as fp:
+                if not self._started:
+                    fp.write(TRACE_MAGIC)
+                    self._started = True
+                while self._queue:
+                    fp.write(self._queue[0])
+                    self._queue.popleft()  # only after it was written; kept for the next write() on errors
+
+
+def read_trace(path):
+    """Return the records of a trace file as (timestamp, fc, unit, start, count, registers or None)."""
+    with open(path, "rb") as fp:
+        raw = fp.read()
+    if not raw.startswith(TRACE_MAGIC):
+        raise ValueError(f"{path} is not a trace file")
+    records = []
+    pos = len(TRACE_MAGIC)
+    while pos + _RECORD.size <= len(raw):
+        timestamp, fc, unit, start, count = _RECORD.unpack_from(raw, pos)
+        pos += _RECORD.size
+        registers = None
+        if not fc & FC_ERROR:
+            if pos + 2 * count > len(raw):
+                break  # truncated last record
+            registers = list(struct.unpack_from(f">{count}H", raw, pos))
+            pos += 2 * count
+        records.append((timestamp, fc & ~FC_ERROR, unit, start, count, registers))
+    return records
+
+
+class ReplayResponse:
+    """Minimal stand-in for a pymodbus read response."""
+
+    __slots__ = ("registers", "_error")
+
+    def __init__(self, registers=None):
+        self.registers = registers or []
+        self._error = registers is None
+
+    def isError(self):
+        return self._error
+
+
+class ReplayClient:
+    """Answers read requests from a trace, in place of AsyncModbusTcpClient.
+
+    Requests are matched by function code, start and count; repeated requests walk through the recorded
+    responses in order and start over at the end. A request without exact match is cut out of a recorded
+    response that covers it. With speed > 0 the recorded time between responses is replayed, divided by
+    speed; speed 0 answers immediately. Writes are accepted and counted.
+    """
+
+    def __init__(self, records, speed=0.0):
+        self.speed = speed
+        self.connected = False
+        self.comm_params = type("comm_params", (), {"host": "replay", "port": 0})()
+        self.writes = 0
+        self._responses = {}  # (fc, start, count) -> [(timestamp, registers)]
+        self._positions = {}
+        self._last_timestamp = None
+        self.load(records)
+
+    def load(self, records):
+        """Add recorded responses, e.g. once the block layout they answer is known."""
+        for timestamp, fc, _unit, start, count, registers in records:
+            self._responses.setdefault((fc, start, count), []).append((timestamp, registers))
+
+    @classmethod
+    def from_file(cls, path, speed=0.0):
+        return cls(read_trace(path), speed)
+
+    async def connect(self):
+        self.connected = True
+        return True
+
+    def close(self):
+        self.connected = False
+
+    def _next(self, fc, start, count):
+        key = (fc, start, count)
+        responses = self._responses.get(key)
+        if responses is None:
+            for (rfc, rstart, rcount), candidates in self._responses.items():
+                if rfc == fc and rstart <= start and start + count <= rstart + rcount:
+                    timestamp, registers = candidates[0]
+                    if registers is not None:
+                        return timestamp, registers[start - rstart : start - rstart + count]
+            return None, None
+        pos = self._positions.get(key, 0)
+        self._positions[key] = (pos + 1) % len(responses)
+        return responses[pos]
+
+    async def _read(self, fc, address, count):
+        timestamp, registers = self._next(fc, address, count)
+        if self.speed > 0 and timestamp is not None:
+            if self._last_timestamp is not None and timestamp > self._last_timestamp:
+                await asyncio.sleep((timestamp - self._last_timestamp) / self.speed)
+            self._last_timestamp = timestamp
+        return ReplayResponse(None if registers is None else list(registers))
+
+    async def read_holding_registers(self, address, count=1, **kwargs):
+        return await self._read(FC_HOLDING, address, count)
+
+    async def read_input_registers(self, address, count=1, **kwargs):
+        return await self._read(FC_INPUT, address, count)
+
+    async def write_register(self, address, value, **kwargs):
+        self.writes += 1
+        return ReplayResponse([value])
+
+    async def write_registers(self, address, values, **kwargs):
+        self.writes += 1
+        return ReplayResponse(list(values))
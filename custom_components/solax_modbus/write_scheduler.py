@@ -0,0 +1,179 @@
+"""Write scheduler for SolaXModbusHub.
+
+Register writes are queued and sent by one flush task that takes the hub lock once per batch, so a batch
+waits for at most one block read of the polling cycle:
+- consecutive writes with function code 16 (write_registers) to the same unit whose registers are adjacent
+  or overlap are merged into one write_registers request of at most MAX_WRITE_WORDS registers
+- a register that is written again within such a run is only written with its last value
+- single register writes (function code 6) are only collapsed, never merged, as some devices accept them
+  for registers that reject function code 16
+- merging and collapsing only happen within a run of consecutive writes with the same unit and function
+  code; the runs are sent in submit order
+If a merged request fails, its parts are retried one by one in submit order, so a device that rejects the
+combined range still receives every write.
+"""
+
+import asyncio
+import logging
+
+from homeassistant.exceptions import HomeAssistantError
+from pymodbus.exceptions import ConnectionException, ModbusIOException
+
+from .bus import PRIO_WRITE, bus_priority
+from .pymodbus_compat import ADDR_KW
+
+_LOGGER = logging.getLogger(__name__)
+
+WRITE_COALESCE_WINDOW = 0.02  # seconds to wait for concurrent writes (e.g. one service call for several entities)
+MAX_WRITE_WORDS = 120  # function code 16 allows at most 123 registers per request
+
+
+class _PendingWrite:
+    __slots__ = ("unit", "address", "words", "fc16", "payload", "what", "future")
+
+    def __init__(self, unit, address, words, fc16, payload, what, future):
+        self.unit = unit
+        self.address = address
+        self.words = words
+        self.fc16 = fc16
+        self.payload = payload  # original value, for the plugin write log hook
+        self.what = what  # for error messages
+        self.future = future
+
+    @property
+    def end(self):
+        return self.address + len(self.words)
+
+
+class WriteScheduler:
+    """Coalescing write queue of one hub, see module docstring."""
+
+    def __init__(self, hub):
+        self._hub = hub
+        self._queue = []  # _PendingWrite in submit order
+        self._flush_task = None
+
+    async def submit(self, unit, address, words, fc16=True, payload=None, what="Modbus registers"):
+        """Queue a write and wait until it has been sent. Returns the modbus response of the request that
+        carried it; raises HomeAssistantError on transport errors like the direct write methods did."""
+        future = asyncio.get_running_loop().create_future()
+        self._queue.append(_PendingWrite(unit, address, list(words), fc16, payload, what, future))
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = self._hub._track_task(self._flush_soon())
+        return await future
+
+    async def _flush_soon(self):
+        bus_priority.set(PRIO_WRITE)  # writes go first on a shared bus; this task has its own context
+        batch = []
+        try:
+            await asyncio.sleep(WRITE_COALESCE_WINDOW)
+            while self._queue:
+                batch, self._queue = self._queue, []
+                await self._flush(batch)
+        finally:  # hub stopped or unexpected error: never leave a caller waiting
+            for w in batch + self._queue:
+                if not w.future.done():
+                    w.future.set_exception(HomeAssistantError(f"Error writing {w.what}: write not sent"))
+            self._queue = []
+
+    async def _flush(self, batch):
+        hub = self._hub
+        await hub._check_connection()  # before the lock: a reconnect runs in the background, see connection.py
+        async with hub._lock:
+            # only adjacent writes of the same kind are combined: e.g. a mode write (fc 6) queued between two
+            # fc 16 writes must still reach the device between them
+            groups = []
+            for w in batch:
+                if groups and groups[-1][0] == (w.unit, w.fc16):
+                    groups[-1][1].append(w)
+                else:
+                    groups.append(((w.unit, w.fc16), [w]))
+            for (unit, fc16), entries in groups:
+                if fc16:
+                    await self._write_multi(unit, entries)
+                else:
+                    await self._write_single(unit, entries)
+
+    async def _write_multi(self, unit, entries):
+        for run in self._runs(entries):
+            start = min(w.address for w in run)
+            words = {}
+            for w in run:  # submit order: later writes win
+                for i, word in enumerate(w.words):
+                    words[w.address + i] = word
+            values = [words[addr] for addr in range(start, start + len(words))]
+            if len(run) > 1:
+                _LOGGER.debug(f"{self._hub._name}: coalesced {len(run)} writes into 0x{start:x} cnt={len(values)}")
+            try:
+                resp = await self._send(unit, start, values)
+            except (ConnectionException, ModbusIOException) as e:
+                if len(run) == 1:
+                    self._fail(run, e)
+                    continue
+                resp = None
+            if len(run) > 1 and (resp is None or resp.isError()):
+                _LOGGER.info(f"{self._hub._name}: combined write at 0x{start:x} failed - writing parts separately")
+                self._hub.metrics.count("write_retries", len(run))
+                for w in run:
+                    try:
+                        self._resolve([w], await self._send(unit, w.address, w.words))
+                    except (ConnectionException, ModbusIOException) as e:
+                        self._fail([w], e)
+            else:
+                self._resolve(run, resp)
+
+    async def _write_single(self, unit, entries):
+        last = {}  # address -> last entry; a rewrite moves the register to the end of the write order
+        for w in entries:
+            last.pop(w.address, None)
+            last[w.address] = w
+        hub = self._hub
+        kwargs = {ADDR_KW: unit} if unit is not None else {}
+        for address, w in last.items():
+            same = [e for e in entries if e.address == address]
+            try:
+                resp = await hub._track_task(hub._client.write_register(address=address, value=w.words[0], **kwargs))
+                # Plugin-level logging hook
+                if hasattr(hub.plugin, "log_register_write"):
+                    hub.plugin.log_register_write(hub, address, unit, w.payload, result=resp)
+            except (ConnectionException, ModbusIOException) as e:
+                # Plugin-level logging hook
+                if hasattr(hub.plugin, "log_register_write"):
+                    hub.plugin.log_register_write(hub, address, unit, w.payload, error=(type(e).__name__, str(e)))
+                self._fail(same, e)
+                continue
+            self._resolve(same, resp)
+
+    async def _send(self, unit, address, values):
+        hub = self._hub
+        kwargs = {ADDR_KW: unit} if unit is not None else {}
+        return await hub._track_task(hub._client.write_registers(address=address, values=values, **kwargs))
+
+    @staticmethod
+    def _runs(entries):
+        """Split the writes, in submit order, into runs of consecutive writes whose register ranges touch or
+        overlap, of at most MAX_WRITE_WORDS registers. Runs are sent in submit order, so a trigger register
+        written after its parameters never goes out before them."""
+        runs = []
+        for w in entries:
+            if runs:
+                run, run_start, run_end = runs[-1]
+                start, end = min(run_start, w.address), max(run_end, w.end)
+                if w.address <= run_end and w.end >= run_start and end - start <= MAX_WRITE_WORDS:
+                    run.append(w)
+                    runs[-1] = (run, start, end)
+                    continue
+            runs.append(([w], w.address, w.end))
+        return [run for run, _, _ in runs]
+
+    @staticmethod
+    def _resolve(writes, resp):
+        for w in writes:
+            if not w.future.done():
+                w.future.set_result(resp)
+
+    @staticmethod
+    def _fail(writes, exc):
+        for w in writes:
+            if not w.future.done():
+                w.future.set_exception(HomeAssistantError(f"Error writing {w.what}: {exc!s}"))